@@ -0,0 +1,306 @@
+"""
+Компьютерный соперник для крестиков-ноликов
+
+Уровни сложности:
+    random  - случайный ход;
+    greedy  - выигрывает за один ход, если может, иначе блокирует
+              выигрыш соперника, иначе занимает центр, угол или сторону;
+    perfect - безошибочная игра: перебор negamax с альфа-бета отсечением
+              и таблицей транспозиций (только поле 3 x 3);
+    mcts    - поиск Монте-Карло по дереву с ограничением времени на ход
+              (для больших полей, см. mcts.py).
+
+Ключ таблицы транспозиций - хеш Зобриста, приведенный по восьми симметриям
+поля (повороты и отражения): симметричные позиции имеют одинаковую оценку
+и хранятся одной записью.
+"""
+import random
+
+from engine import BOARD_SIZE, CELL_COUNT, PLAYERS, cell_index, is_win
+from mcts import MCTSPlayer, default_workers
+
+LEVELS = ("random", "greedy", "perfect", "mcts")
+
+# Время на ход для уровня "mcts", секунды
+MCTS_TIME_LIMIT = 1.0
+
+# Вид оценки в таблице транспозиций: точная, нижняя или верхняя граница
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def _symmetries():
+    """Возвращает 8 перестановок клеток поля: повороты и отражения"""
+    last = BOARD_SIZE - 1
+    transforms = [
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    ]
+    return tuple(
+        tuple(cell_index(*transform(*divmod(index, BOARD_SIZE))) for index in range(CELL_COUNT))
+        for transform in transforms
+    )
+
+
+SYMMETRIES = _symmetries()
+
+_zobrist_rng = random.Random(20240615)
+ZOBRIST = tuple(
+    tuple(_zobrist_rng.getrandbits(64) for _ in range(CELL_COUNT))
+    for _ in PLAYERS
+)
+ZOBRIST_TURN = _zobrist_rng.getrandbits(64)
+
+# Порядок перебора ходов: центр, углы, стороны - отсечения срабатывают раньше
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+
+def position_hashes(board):
+    """
+    Возвращает хеши Зобриста позиции во всех восьми симметриях
+
+    Args:
+        board (engine.Board): Позиция
+
+    Returns:
+        list: Хеши в порядке SYMMETRIES
+    """
+    hashes = []
+    for permutation in SYMMETRIES:
+        value = ZOBRIST_TURN if board.turn else 0
+        for player in range(len(PLAYERS)):
+            mask = board.masks[player]
+            for index in range(CELL_COUNT):
+                if mask >> index & 1:
+                    value ^= ZOBRIST[player][permutation[index]]
+        hashes.append(value)
+    return hashes
+
+
+class NegamaxSearch:
+    """
+    Полный перебор позиции negamax с альфа-бета отсечением
+
+    Таблица транспозиций сохраняется между вызовами, поэтому повторные
+    поиски в той же партии почти не перебирают узлы.
+    """
+
+    def __init__(self, use_table=True, use_symmetry=True):
+        """
+        Инициализирует поиск
+
+        Args:
+            use_table (bool, optional): Использовать таблицу транспозиций
+            use_symmetry (bool, optional): Приводить ключи таблицы по симметриям поля
+        """
+        self.use_table = use_table
+        self.use_symmetry = use_symmetry
+        self.table = {}
+        self.nodes = 0
+        self.table_hits = 0
+
+    def reset_stats(self):
+        """Обнуляет счетчики узлов и попаданий в таблицу"""
+        self.nodes = 0
+        self.table_hits = 0
+
+    def evaluate_moves(self, board):
+        """
+        Оценивает все допустимые ходы в позиции
+
+        Args:
+            board (engine.Board): Позиция (после поиска возвращается в исходное состояние)
+
+        Returns:
+            dict: Номер клетки -> оценка с точки зрения игрока, который ходит
+        """
+        hashes = self._root_hashes(board)
+        scores = {}
+        for index in board.legal_moves():
+            child = self._play(board, hashes, index)
+            scores[index] = -self._negamax(board, child, -CELL_COUNT - 1, CELL_COUNT + 1)
+            board.unmake_move()
+        return scores
+
+    def best_moves(self, board):
+        """Возвращает все ходы с наилучшей оценкой"""
+        scores = self.evaluate_moves(board)
+        best = max(scores.values())
+        return [index for index, score in scores.items() if score == best]
+
+    def value(self, board):
+        """Возвращает теоретическую оценку позиции для игрока, который ходит"""
+        return self._negamax(board, self._root_hashes(board), -CELL_COUNT - 1, CELL_COUNT + 1)
+
+    def _root_hashes(self, board):
+        """Хеши корневой позиции: все симметрии или только исходная"""
+        hashes = position_hashes(board)
+        return hashes if self.use_symmetry else hashes[:1]
+
+    def _play(self, board, hashes, index):
+        """Делает ход и возвращает обновленные хеши"""
+        player = board.turn
+        keys = ZOBRIST[player]
+        board.make_move(index)
+        return [value ^ keys[permutation[index]] ^ ZOBRIST_TURN
+                for value, permutation in zip(hashes, SYMMETRIES)]
+
+    def _negamax(self, board, hashes, alpha, beta):
+        self.nodes += 1
+
+        # Выигранная позиция оценивается в 1 + количество свободных клеток: быстрая
+        # победа ценится выше медленной, а поражение откладывается как можно дольше.
+        # Последний ходивший игрок мог выиграть - для текущего это поражение
+        occupied = board.masks[0] | board.masks[1]
+        empty = CELL_COUNT - bin(occupied).count("1")
+        if is_win(board.masks[board.turn ^ 1]):
+            return -(1 + empty)
+        if empty == 0:
+            return 0
+
+        key = min(hashes)
+        original_alpha = alpha
+        if self.use_table:
+            entry = self.table.get(key)
+            if entry is not None:
+                self.table_hits += 1
+                score, flag = entry
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        best = -CELL_COUNT - 1
+        for index in MOVE_ORDER:
+            if occupied >> index & 1:
+                continue
+            child = self._play(board, hashes, index)
+            score = -self._negamax(board, child, -beta, -alpha)
+            board.unmake_move()
+
+            if score > best:
+                best = score
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+
+        if self.use_table:
+            if best <= original_alpha:
+                flag = UPPER
+            elif best >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            self.table[key] = (best, flag)
+        return best
+
+
+class ComputerPlayer:
+    """Компьютерный игрок выбранного уровня сложности"""
+
+    def __init__(self, level="perfect", rng=None, search=None, table=None, mcts=None):
+        """
+        Инициализирует игрока
+
+        Args:
+            level (str, optional): Уровень сложности из LEVELS. По умолчанию "perfect".
+            rng (random.Random, optional): Генератор случайных чисел (для воспроизводимости)
+            search (NegamaxSearch, optional): Поиск для уровня "perfect"
+            table (solution_table.SolutionTable, optional): Таблица решений; если задана,
+                уровень "perfect" выбирает ход по ней, а поиск нужен только для позиций вне таблицы
+            mcts (mcts.MCTSPlayer, optional): Поиск для уровня "mcts"; по умолчанию
+                MCTS_TIME_LIMIT секунд на ход в default_workers() процессах
+        """
+        if level not in LEVELS:
+            raise ValueError(f"Неизвестный уровень сложности: {level}")
+        self.level = level
+        self.rng = rng or random.Random()
+        self.search = search or NegamaxSearch()
+        self.table = table
+        self.mcts = mcts
+        if level == "mcts" and mcts is None:
+            self.mcts = MCTSPlayer(time_limit=MCTS_TIME_LIMIT, workers=default_workers(), rng=self.rng)
+
+    def choose_move(self, board):
+        """
+        Выбирает ход в позиции
+
+        Args:
+            board (engine.Board): Позиция, в которой ходит компьютер
+
+        Returns:
+            int: Номер клетки
+        """
+        moves = board.legal_moves()
+        if not moves:
+            raise ValueError("В позиции нет допустимых ходов")
+
+        if self.level == "random":
+            return self.rng.choice(moves)
+        if self.level == "greedy":
+            return self._greedy_move(board, moves)
+        if self.level == "mcts":
+            return self.mcts.choose_move(board)
+
+        # Полный перебор и таблица решений рассчитаны на классическое поле
+        if board.cell_count != CELL_COUNT or board.win_length != BOARD_SIZE:
+            raise ValueError("Идеальная игра доступна только на поле 3x3")
+        best = self.table.best_moves(board) if self.table is not None else None
+        return self.rng.choice(best or self.search.best_moves(board))
+
+    def close(self):
+        """Освобождает ресурсы поиска (процессы параллельного MCTS)"""
+        if self.mcts is not None:
+            self.mcts.close()
+
+    def _greedy_move(self, board, moves):
+        # Выигрыш за один ход, затем блокировка выигрыша соперника
+        for check in (board.wins_with, board.blocks):
+            for index in moves:
+                if check(index):
+                    return index
+
+        if board.cell_count == CELL_COUNT:
+            preferences = ((4,), (0, 2, 6, 8), (1, 3, 5, 7))
+        else:
+            preferences = (self._nearest_to_center(board, moves),)
+        for preferred in preferences:
+            candidates = [index for index in preferred if index in moves]
+            if candidates:
+                return self.rng.choice(candidates)
+        return self.rng.choice(moves)
+
+    def _nearest_to_center(self, board, moves):
+        """Свободные клетки рядом с уже занятыми, ближайшие к центру большого поля"""
+        occupied = board.occupied
+        if occupied:
+            neighbours = [index for index in moves if self._has_neighbour(board, occupied, index)]
+            moves = neighbours or moves
+
+        center = (board.size - 1) / 2
+
+        def distance(index):
+            row, col = board.position(index)
+            return max(abs(row - center), abs(col - center))
+
+        nearest = min(distance(index) for index in moves)
+        return [index for index in moves if distance(index) == nearest]
+
+    @staticmethod
+    def _has_neighbour(board, occupied, index):
+        row, col = board.position(index)
+        for r in range(max(row - 1, 0), min(row + 2, board.size)):
+            for c in range(max(col - 1, 0), min(col + 2, board.size)):
+                if occupied >> board.index(r, c) & 1:
+                    return True
+        return False
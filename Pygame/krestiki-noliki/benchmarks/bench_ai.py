@@ -0,0 +1,87 @@
+"""
+Бенчмарк компьютерного соперника: количество перебранных узлов и время
+выбора хода для уровней сложности и вариантов поиска negamax
+(без таблицы транспозиций, с таблицей, с таблицей и симметриями),
+а также при выборе хода по готовой таблице решений
+
+Запуск из каталога krestiki-noliki:
+    python benchmarks/bench_ai.py [--games 200]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import LEVELS, ComputerPlayer, NegamaxSearch  # noqa: E402
+from engine import Board  # noqa: E402
+from solution_table import load_table  # noqa: E402
+
+SEARCH_VARIANTS = {
+    "без таблицы": dict(use_table=False),
+    "таблица": dict(use_table=True, use_symmetry=False),
+    "таблица + симметрии": dict(use_table=True, use_symmetry=True),
+}
+
+
+def play_games(make_player, games, seed=0):
+    """
+    Играет партии игрока против случайного соперника
+
+    Returns:
+        tuple: (список количества узлов на ход, список времени хода в мс)
+    """
+    rng = random.Random(seed)
+    nodes, latencies = [], []
+    for game in range(games):
+        player = make_player()
+        opponent = ComputerPlayer("random", rng)
+        board = Board()
+        player_turn = game % 2
+        while not board.is_over():
+            if board.turn == player_turn:
+                search = player.search
+                search.reset_stats()
+                start = time.perf_counter()
+                move = player.choose_move(board)
+                latencies.append((time.perf_counter() - start) * 1000)
+                nodes.append(search.nodes)
+            else:
+                move = opponent.choose_move(board)
+            board.make_move(move)
+    return nodes, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=200, help='Количество партий для каждого варианта')
+    args = parser.parse_args()
+
+    print("Первый ход на пустом поле (пустая таблица):")
+    for name, options in SEARCH_VARIANTS.items():
+        search = NegamaxSearch(**options)
+        start = time.perf_counter()
+        search.best_moves(Board())
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"  {name:<22}{search.nodes:>8} узлов{elapsed:>10.1f} мс  записей в таблице: {len(search.table)}")
+
+    print(f"\nПартии против случайного соперника ({args.games} партий, новая таблица в каждой партии):")
+    print(f"  {'вариант':<30}{'узлов/ход':>10}{'макс. узлов':>12}{'мс/ход':>9}{'макс. мс':>10}")
+    rows = [(f"perfect, {name}", lambda options=options: ComputerPlayer("perfect", search=NegamaxSearch(**options)))
+            for name, options in SEARCH_VARIANTS.items()]
+    table = load_table()
+    if table is not None:
+        rows.append(("perfect, таблица решений", lambda: ComputerPlayer("perfect", table=table)))
+    # MCTS ограничен временем, а не узлами; его скорость измеряет bench_mcts.py
+    rows += [(level, lambda level=level: ComputerPlayer(level)) for level in LEVELS if level not in ("perfect", "mcts")]
+    for name, make_player in rows:
+        nodes, latencies = play_games(make_player, args.games)
+        print(f"  {name:<30}{statistics.mean(nodes):>10.0f}{max(nodes):>12}"
+              f"{statistics.mean(latencies):>9.3f}{max(latencies):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Бенчмарк поиска Монте-Карло по дереву: количество доигрываний в секунду
+при поиске в 1, 2, 4 и 8 процессах (параллелизм на уровне корня), а также
+количество посещений, сохраненных в дереве после ответа соперника
+
+Позиция - середина партии на поле 15 x 15 (пять в ряд), соперник - жадный
+игрок. Первый ход каждого варианта выполняется для запуска процессов и в
+замер не входит, как и ходы без поиска (немедленный выигрыш или блокировка).
+
+Запуск из каталога krestiki-noliki:
+    python benchmarks/bench_mcts.py [--time 1.0] [--moves 3] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import ComputerPlayer  # noqa: E402
+from engine import Board  # noqa: E402
+from mcts import MCTSPlayer  # noqa: E402
+
+# Ходы середины партии на поле 15 x 15: без немедленных выигрышей и блокировок
+OPENING = ((7, 7), (7, 8), (8, 8), (6, 6), (8, 7), (9, 9), (6, 8), (8, 6))
+
+
+def middle_game_board():
+    """Возвращает позицию середины партии гомоку"""
+    board = Board(size=15, win_length=5)
+    for row, col in OPENING:
+        board.make_move(board.index(row, col))
+    return board
+
+
+def measure(workers, time_limit, moves, seed=0):
+    """
+    Делает несколько ходов поиском из одной позиции
+
+    Returns:
+        tuple: (список доигрываний в секунду по ходам, список сохраненных посещений корня)
+    """
+    opponent = ComputerPlayer("greedy", random.Random(seed))
+    player = MCTSPlayer(time_limit=time_limit, workers=workers, rng=random.Random(seed))
+    board = middle_game_board()
+    rates, reused = [], []
+    try:
+        # Прогрев: запуск процессов и первое дерево
+        board.make_move(player.choose_move(board))
+        board.make_move(opponent.choose_move(board))
+
+        for _ in range(moves):
+            board.make_move(player.choose_move(board))
+            if player.last_playouts:
+                rates.append(player.last_playouts / player.last_elapsed)
+                reused.append(player.last_reused)
+            if board.is_over():
+                break
+            board.make_move(opponent.choose_move(board))
+            if board.is_over():
+                break
+    finally:
+        player.close()
+    return rates, reused
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--time', type=float, default=1.0, help='Время на ход в секундах')
+    parser.add_argument('--moves', type=int, default=3, help='Количество измеряемых ходов')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='Количество процессов')
+    args = parser.parse_args()
+
+    print(f"Поле 15x15, пять в ряд; {args.time:.2f} с на ход, ядер процессора: {os.cpu_count()}")
+    print(f"  {'процессов':<11}{'доигр./с':>10}{'ускорение':>11}{'сохранено посещений':>22}")
+    baseline = None
+    for workers in args.workers:
+        rates, reused = measure(workers, args.time, args.moves)
+        if not rates:
+            print(f"  {workers:<11}нет ходов с поиском")
+            continue
+        rate = statistics.mean(rates)
+        baseline = baseline or rate
+        print(f"  {workers:<11}{rate:>10.0f}{rate / baseline:>10.2f}x{statistics.mean(reused):>22.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import tkinter as tk
+
+# Цвета символов и подсветки выигрышной линии
+SYMBOL_COLORS = {"X": "#3366ff", "O": "#ff3333"}  # Синий для X, красный для O
+HIGHLIGHT_COLOR = "#c8e6c9"  # Светло-зеленый
+
+
+class BoardCanvas(tk.Canvas):
+    """
+    Игровое поле, нарисованное на одном холсте
+
+    Вместо отдельной кнопки на каждую клетку рисуются линии сетки и символы,
+    а клетка определяется по координатам щелчка. Поэтому поле 15 x 15
+    (225 клеток) создается так же быстро, как 3 x 3, и при ходе
+    перерисовывается только одна клетка.
+    """
+
+    def __init__(self, master, size, on_cell_click, pixels=300, **options):
+        """
+        Инициализирует холст
+
+        Args:
+            master: Родительский виджет
+            size (int): Размер стороны поля в клетках
+            on_cell_click (callable): Вызывается с номером клетки при щелчке
+            pixels (int, optional): Размер холста в пикселях. По умолчанию 300.
+            **options: Параметры tk.Canvas
+        """
+        options.setdefault("bg", "#ffffff")
+        options.setdefault("highlightthickness", 0)
+        super().__init__(master, width=pixels, height=pixels, **options)
+        self.pixels = pixels
+        self.on_cell_click = on_cell_click
+        self.size = 0
+        self.cell_size = 0
+
+        self.bind("<Button-1>", self._on_click)
+        self.set_size(size)
+
+    def set_size(self, size):
+        """Меняет размер поля и рисует пустую сетку"""
+        self.size = size
+        self.cell_size = self.pixels / size
+        self.delete("all")
+
+        for i in range(1, size):
+            offset = i * self.cell_size
+            self.create_line(offset, 0, offset, self.pixels, fill="#bdbdbd", tags="grid")
+            self.create_line(0, offset, self.pixels, offset, fill="#bdbdbd", tags="grid")
+
+    def clear(self):
+        """Убирает все символы и подсветку"""
+        self.delete("symbol", "highlight")
+
+    def draw_symbol(self, index, symbol):
+        """
+        Рисует символ в клетке
+
+        Args:
+            index (int): Номер клетки (row * size + col)
+            symbol (str): "X" или "O"
+        """
+        x0, y0, x1, y1 = self._cell_bounds(index)
+        pad = self.cell_size * 0.2
+        width = max(2, self.cell_size / 12)
+        color = SYMBOL_COLORS[symbol]
+
+        if symbol == "X":
+            self.create_line(x0 + pad, y0 + pad, x1 - pad, y1 - pad, fill=color, width=width, tags="symbol")
+            self.create_line(x0 + pad, y1 - pad, x1 - pad, y0 + pad, fill=color, width=width, tags="symbol")
+        else:
+            self.create_oval(x0 + pad, y0 + pad, x1 - pad, y1 - pad, outline=color, width=width, tags="symbol")
+
+    def highlight(self, cells):
+        """Подсвечивает клетки (например, выигрышную линию) под символами"""
+        for index in cells:
+            self.create_rectangle(*self._cell_bounds(index), fill=HIGHLIGHT_COLOR, width=0, tags="highlight")
+        self.tag_lower("highlight")
+
+    def render(self, board):
+        """Перерисовывает поле целиком по состоянию движка"""
+        if board.size != self.size:
+            self.set_size(board.size)
+        self.clear()
+        for index in board.history:
+            self.draw_symbol(index, board.cell(index))
+        self.highlight(board.winning_cells())
+
+    def _cell_bounds(self, index):
+        row, col = divmod(index, self.size)
+        return (col * self.cell_size, row * self.cell_size,
+                (col + 1) * self.cell_size, (row + 1) * self.cell_size)
+
+    def _on_click(self, event):
+        col = int(event.x // self.cell_size)
+        row = int(event.y // self.cell_size)
+        if 0 <= row < self.size and 0 <= col < self.size:
+            self.on_cell_click(row * self.size + col)
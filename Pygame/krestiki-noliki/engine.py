@@ -0,0 +1,214 @@
+"""
+Логика игры в крестики-нолики без графического интерфейса
+
+Позиция хранится в двух битовых масках (клетки крестиков и ноликов),
+бит с номером row * size + col соответствует клетке поля. Проверка хода,
+победы и ничьей сводится к нескольким целочисленным операциям, поэтому
+движок можно использовать для симуляций и перебора без окна Tkinter.
+
+Поле может быть любого размера N x N с победой при K символах в ряд
+(например, 15 x 15 и пять в ряд - гомоку). Победа проверяется только по
+четырем линиям через последний ход: O(K) операций вместо просмотра всего поля.
+Константы и функции уровня модуля описывают классическое поле 3 x 3.
+"""
+
+BOARD_SIZE = 3
+CELL_COUNT = BOARD_SIZE * BOARD_SIZE
+FULL_MASK = (1 << CELL_COUNT) - 1
+
+PLAYERS = ("X", "O")
+
+
+def _line_mask(cells):
+    mask = 0
+    for row, col in cells:
+        mask |= 1 << (row * BOARD_SIZE + col)
+    return mask
+
+
+# Маски всех выигрышных линий: строки, столбцы и две диагонали
+WIN_MASKS = tuple(
+    [_line_mask((row, col) for col in range(BOARD_SIZE)) for row in range(BOARD_SIZE)]
+    + [_line_mask((row, col) for row in range(BOARD_SIZE)) for col in range(BOARD_SIZE)]
+    + [_line_mask((i, i) for i in range(BOARD_SIZE)),
+       _line_mask((i, BOARD_SIZE - 1 - i) for i in range(BOARD_SIZE))]
+)
+
+
+def cell_index(row, col):
+    """Возвращает номер клетки (бита) по строке и столбцу"""
+    return row * BOARD_SIZE + col
+
+
+def cell_position(index):
+    """Возвращает строку и столбец клетки по ее номеру"""
+    return divmod(index, BOARD_SIZE)
+
+
+def is_win(mask):
+    """Проверяет, содержит ли маска клеток одного игрока выигрышную линию"""
+    for line in WIN_MASKS:
+        if mask & line == line:
+            return True
+    return False
+
+
+# Направления линий: горизонталь, вертикаль и две диагонали
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class Board:
+    """Позиция на поле N x N (по умолчанию 3 x 3) с ходами и их отменой"""
+
+    __slots__ = ('size', 'win_length', 'cell_count', 'full_mask', 'masks', 'turn', 'history')
+
+    def __init__(self, first_player="X", size=BOARD_SIZE, win_length=BOARD_SIZE):
+        """
+        Создает пустое поле
+
+        Args:
+            first_player (str): Символ игрока, который ходит первым ("X" или "O")
+            size (int, optional): Размер стороны поля. По умолчанию 3.
+            win_length (int, optional): Сколько символов в ряд нужно для победы. По умолчанию 3.
+
+        Raises:
+            ValueError: Длина выигрышной линии больше размера поля
+        """
+        if not 1 <= win_length <= size:
+            raise ValueError(f"Нельзя собрать {win_length} в ряд на поле {size}x{size}")
+
+        self.size = size
+        self.win_length = win_length
+        self.cell_count = size * size
+        self.full_mask = (1 << self.cell_count) - 1
+
+        # masks[0] - клетки крестиков, masks[1] - клетки ноликов
+        self.masks = [0, 0]
+        self.turn = PLAYERS.index(first_player)
+        self.history = []
+
+    @property
+    def current_player(self):
+        """Символ игрока, который сейчас ходит"""
+        return PLAYERS[self.turn]
+
+    @property
+    def occupied(self):
+        """Маска занятых клеток"""
+        return self.masks[0] | self.masks[1]
+
+    def index(self, row, col):
+        """Возвращает номер клетки по строке и столбцу"""
+        return row * self.size + col
+
+    def position(self, index):
+        """Возвращает строку и столбец клетки по ее номеру"""
+        return divmod(index, self.size)
+
+    def cell(self, index):
+        """Возвращает символ в клетке или пустую строку"""
+        bit = 1 << index
+        if self.masks[0] & bit:
+            return PLAYERS[0]
+        if self.masks[1] & bit:
+            return PLAYERS[1]
+        return ""
+
+    def is_empty(self, index):
+        """Проверяет, свободна ли клетка"""
+        return not self.occupied >> index & 1
+
+    def legal_moves(self):
+        """Возвращает номера свободных клеток (пустой список, если игра окончена)"""
+        if self.winner() is not None:
+            return []
+        occupied = self.occupied
+        return [index for index in range(self.cell_count) if not occupied >> index & 1]
+
+    def make_move(self, index):
+        """
+        Ставит символ текущего игрока в клетку и передает ход
+
+        Проверка допустимости хода не выполняется (см. is_empty и legal_moves).
+
+        Args:
+            index (int): Номер клетки
+        """
+        self.masks[self.turn] |= 1 << index
+        self.history.append(index)
+        self.turn ^= 1
+
+    def unmake_move(self):
+        """Отменяет последний ход"""
+        index = self.history.pop()
+        self.turn ^= 1
+        self.masks[self.turn] &= ~(1 << index)
+
+    def line_through(self, mask, index):
+        """
+        Ищет непрерывную линию не короче win_length, проходящую через клетку
+
+        Args:
+            mask (int): Клетки одного игрока (клетка index должна входить в маску)
+            index (int): Номер клетки
+
+        Returns:
+            list: Номера клеток линии или None, если линии нет
+        """
+        size = self.size
+        row, col = divmod(index, size)
+        for d_row, d_col in DIRECTIONS:
+            cells = [index]
+            for sign in (1, -1):
+                r, c = row + sign * d_row, col + sign * d_col
+                while 0 <= r < size and 0 <= c < size and mask >> (r * size + c) & 1:
+                    cells.append(r * size + c)
+                    r += sign * d_row
+                    c += sign * d_col
+            if len(cells) >= self.win_length:
+                return sorted(cells)
+        return None
+
+    def wins_with(self, index):
+        """Проверяет, выигрывает ли текущий игрок ходом в клетку"""
+        return self.line_through(self.masks[self.turn] | 1 << index, index) is not None
+
+    def blocks(self, index):
+        """Проверяет, выиграл бы соперник ходом в эту клетку"""
+        return self.line_through(self.masks[self.turn ^ 1] | 1 << index, index) is not None
+
+    def winner(self):
+        """Возвращает символ победителя или None"""
+        # Выиграть мог только игрок, сделавший последний ход, и только линией через этот ход
+        if not self.history:
+            return None
+        last = self.turn ^ 1
+        if self.line_through(self.masks[last], self.history[-1]) is not None:
+            return PLAYERS[last]
+        return None
+
+    def winning_cells(self):
+        """Возвращает номера клеток выигрышной линии или пустой список"""
+        if self.winner() is None:
+            return []
+        return self.line_through(self.masks[self.turn ^ 1], self.history[-1])
+
+    def is_full(self):
+        """Проверяет, заполнено ли поле"""
+        return self.occupied == self.full_mask
+
+    def is_over(self):
+        """Проверяет, окончена ли игра (победа или ничья)"""
+        return self.winner() is not None or self.is_full()
+
+    def copy(self):
+        """Возвращает независимую копию позиции"""
+        board = Board.__new__(Board)
+        board.size = self.size
+        board.win_length = self.win_length
+        board.cell_count = self.cell_count
+        board.full_mask = self.full_mask
+        board.masks = list(self.masks)
+        board.turn = self.turn
+        board.history = list(self.history)
+        return board
@@ -1,20 +1,56 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
 import random
+from concurrent.futures import ThreadPoolExecutor
+
+from ai import ComputerPlayer
+from board_canvas import BoardCanvas
+from engine import BOARD_SIZE, Board
+from solution_table import load_table
+
+# Варианты поля: подпись -> (размер стороны, сколько символов в ряд нужно для победы)
+BOARD_VARIANTS = {
+    "3×3, три в ряд": (3, 3),
+    "5×5, четыре в ряд": (5, 4),
+    "10×10, пять в ряд": (10, 5),
+    "15×15, пять в ряд (гомоку)": (15, 5),
+}
+
+# Варианты соперника: подпись -> уровень сложности компьютера (None - второй игрок-человек)
+OPPONENTS = {
+    "Человек": None,
+    "Компьютер (случайный)": "random",
+    "Компьютер (жадный)": "greedy",
+    "Компьютер (идеальный)": "perfect",
+    "Компьютер (MCTS)": "mcts",
+}
 
 
 class TicTacToeGame:
     def __init__(self, root):
         self.root = root
         self.root.title("Крестики-нолики")
-        self.root.geometry("400x500")
+        self.root.geometry("400x600")
         self.root.resizable(False, False)
         self.root.configure(bg="#f0f0f0")
 
         # Переменные для хранения состояния игры
-        self.current_player = "X"
         self.player_choice = "X"
-        self.buttons = []
+        self.board_size, self.win_length = BOARD_SIZE, BOARD_SIZE
+        self.board = self.new_board()
+        self.computer = None
+        self.computer_move_id = None
+
+        # Поиск хода компьютера идет в отдельном потоке, чтобы окно не замирало
+        # (MCTS думает над ходом около секунды); результат опрашивается через after()
+        self.search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="computer")
+        self.computer_future = None
+        self.poll_interval = 20
+
+        # Таблица решений отображается в память один раз; без нее идеальный
+        # соперник выбирает ход перебором
+        self.solution_table = load_table()
+
         self.game_active = True
         self.score_x = 0
         self.score_o = 0
@@ -23,10 +59,13 @@ class TicTacToeGame:
 
         # Создание интерфейса
         self.create_choice_frame()
+        self.create_opponent_frame()
         self.create_score_frame()
         self.create_game_frame()
         self.create_control_frame()
 
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def create_choice_frame(self):
         """Создает фрейм для выбора символа игрока"""
         choice_frame = tk.Frame(self.root, bg="#f0f0f0", pady=10)
@@ -64,6 +103,54 @@ class TicTacToeGame:
         )
         o_button.pack(side="left", padx=10)
 
+    def create_opponent_frame(self):
+        """Создает фреймы для выбора соперника и варианта поля"""
+        opponent_frame = tk.Frame(self.root, bg="#f0f0f0")
+        opponent_frame.pack(fill="x")
+
+        opponent_label = tk.Label(
+            opponent_frame,
+            text="Соперник:",
+            font=("Arial", 12),
+            bg="#f0f0f0"
+        )
+        opponent_label.pack(side="left", padx=10)
+
+        self.opponent_var = tk.StringVar(value="Человек")
+        self.opponent_box = ttk.Combobox(
+            opponent_frame,
+            textvariable=self.opponent_var,
+            values=list(OPPONENTS),
+            state="readonly",
+            font=("Arial", 11),
+            width=22
+        )
+        self.opponent_box.pack(side="left", padx=10)
+        self.opponent_box.bind("<<ComboboxSelected>>", lambda event: self.update_opponent())
+
+        variant_frame = tk.Frame(self.root, bg="#f0f0f0", pady=5)
+        variant_frame.pack(fill="x")
+
+        variant_label = tk.Label(
+            variant_frame,
+            text="Поле:",
+            font=("Arial", 12),
+            bg="#f0f0f0"
+        )
+        variant_label.pack(side="left", padx=10)
+
+        self.variant_var = tk.StringVar(value=next(iter(BOARD_VARIANTS)))
+        variant_box = ttk.Combobox(
+            variant_frame,
+            textvariable=self.variant_var,
+            values=list(BOARD_VARIANTS),
+            state="readonly",
+            font=("Arial", 11),
+            width=26
+        )
+        variant_box.pack(side="left", padx=10)
+        variant_box.bind("<<ComboboxSelected>>", lambda event: self.update_variant())
+
     def create_score_frame(self):
         """Создает фрейм для отображения счета"""
         score_frame = tk.Frame(self.root, bg="#f0f0f0", pady=5)
@@ -119,22 +206,8 @@ class TicTacToeGame:
         game_frame = tk.Frame(self.root, bg="#d9d9d9", padx=10, pady=10)
         game_frame.pack(pady=10)
 
-        for i in range(3):
-            row = []
-            for j in range(3):
-                btn = tk.Button(
-                    game_frame,
-                    text="",
-                    font=("Arial", 24, "bold"),
-                    width=3,
-                    height=1,
-                    bd=2,
-                    relief="raised",
-                    command=lambda r=i, c=j: self.on_click(r, c)
-                )
-                btn.grid(row=i, column=j, padx=3, pady=3)
-                row.append(btn)
-            self.buttons.append(row)
+        self.board_canvas = BoardCanvas(game_frame, self.board_size, on_cell_click=self.on_click)
+        self.board_canvas.pack()
 
     def create_control_frame(self):
         """Создает фрейм с кнопками управления"""
@@ -170,27 +243,116 @@ class TicTacToeGame:
         self.player_choice = self.player_var.get()
         self.reset_game()
 
-    def on_click(self, row, col):
+    def update_opponent(self):
+        """Включает или выключает компьютерного соперника"""
+        level = OPPONENTS[self.opponent_var.get()]
+        self.close_computer()
+        self.computer = ComputerPlayer(level, table=self.solution_table) if level else None
+        self.new_match()
+
+    def update_variant(self):
+        """Меняет размер поля и условие победы"""
+        self.board_size, self.win_length = BOARD_VARIANTS[self.variant_var.get()]
+
+        # Идеальная игра (перебор и таблица решений) возможна только на поле 3x3
+        opponents = [name for name, level in OPPONENTS.items()
+                     if level != "perfect" or self.board_size == BOARD_SIZE]
+        self.opponent_box.config(values=opponents)
+        if self.opponent_var.get() not in opponents:
+            self.opponent_var.set(opponents[-1])
+
+        self.update_opponent()
+
+    def on_close(self):
+        """Закрывает окно, предварительно остановив процессы поиска компьютера"""
+        self.close_computer()
+        self.search_executor.shutdown(wait=False)
+        self.root.destroy()
+
+    def close_computer(self):
+        """Отменяет ход компьютера и освобождает ресурсы его поиска"""
+        self.cancel_computer_move()
+        if self.computer is not None:
+            # Закрываем в потоке поиска: после уже идущего поиска, не останавливая окно
+            self.search_executor.submit(self.computer.close)
+            self.computer = None
+
+    def new_board(self):
+        """Создает пустое поле выбранного варианта; первым ходит выбранный игроком символ"""
+        return Board(first_player=self.player_choice, size=self.board_size, win_length=self.win_length)
+
+    def is_computer_turn(self):
+        """Проверяет, должен ли сейчас ходить компьютер (он играет символом, не выбранным игроком)"""
+        return (self.computer is not None and self.game_active
+                and self.current_player != self.player_choice)
+
+    def computer_move(self):
+        """Запускает поиск хода компьютера в фоновом потоке"""
+        self.computer_move_id = None
+        if not self.is_computer_turn():
+            return
+
+        # Поиск получает копию позиции: поле в окне он не меняет
+        self.player_label['text'] = "Компьютер думает..."
+        self.computer_future = self.search_executor.submit(self.computer.choose_move, self.board.copy())
+        self.computer_move_id = self.root.after(self.poll_interval, self.poll_computer_move)
+
+    def poll_computer_move(self):
+        """Делает ход компьютера, когда поиск завершен"""
+        future = self.computer_future
+        if not future.done():
+            self.computer_move_id = self.root.after(self.poll_interval, self.poll_computer_move)
+            return
+
+        self.computer_move_id = None
+        self.computer_future = None
+        try:
+            move = future.result()
+        except Exception as e:
+            print(f"Ошибка при выборе хода компьютера: {e}")
+            return
+        if self.is_computer_turn():
+            self.play_move(move)
+
+    def cancel_computer_move(self):
+        """Отменяет запланированный ход компьютера; результат уже идущего поиска отбрасывается"""
+        if self.computer_move_id:
+            self.root.after_cancel(self.computer_move_id)
+            self.computer_move_id = None
+        self.computer_future = None
+
+    @property
+    def current_player(self):
+        """Символ игрока, который сейчас ходит"""
+        return self.board.current_player
+
+    def on_click(self, index):
         """Обрабатывает клик по ячейке игрового поля"""
-        # Проверяем, активна ли игра и пуста ли ячейка
-        if not self.game_active or self.buttons[row][col]['text'] != "":
+        # Проверяем, активна ли игра, пуста ли ячейка и не очередь ли компьютера
+        # (пока идет поиск хода, щелчки игнорируются)
+        if (not self.game_active or not self.board.is_empty(index) or self.is_computer_turn()
+                or self.computer_future is not None):
             return
 
-        # Устанавливаем символ текущего игрока
-        self.buttons[row][col]['text'] = self.current_player
+        self.play_move(index)
 
-        # Устанавливаем цвет символа
-        if self.current_player == "X":
-            self.buttons[row][col]['fg'] = "#3366ff"  # Синий для X
-        else:
-            self.buttons[row][col]['fg'] = "#ff3333"  # Красный для O
+        # Компьютер отвечает с небольшой паузой, чтобы ход игрока успел отобразиться
+        if self.is_computer_turn():
+            self.computer_move_id = self.root.after(300, self.computer_move)
+
+    def play_move(self, index):
+        """Делает ход в клетку и обрабатывает окончание игры"""
+        # Ставим символ текущего игрока и отображаем его
+        player = self.current_player
+        self.board.make_move(index)
+        self.board_canvas.draw_symbol(index, player)
 
         # Проверяем, выиграл ли кто-то
         if self.check_winner():
             self.game_active = False
 
             # Обновляем счет
-            if self.current_player == "X":
+            if player == "X":
                 self.score_x += 1
                 self.x_score_label['text'] = f"X: {self.score_x}"
             else:
@@ -205,7 +367,7 @@ class TicTacToeGame:
                 messagebox.showinfo("Матч окончен", f"Игрок {winner} выиграл матч!")
                 self.new_match()
             else:
-                messagebox.showinfo("Игра окончена", f"Игрок {self.current_player} победил!")
+                messagebox.showinfo("Игра окончена", f"Игрок {player} победил!")
 
         # Проверяем на ничью
         elif self.check_draw():
@@ -213,69 +375,31 @@ class TicTacToeGame:
             messagebox.showinfo("Игра окончена", "Ничья!")
             self.games_played += 1
         else:
-            # Меняем игрока
-            self.current_player = "O" if self.current_player == "X" else "X"
+            # Ход уже передан движком - обновляем надпись
             self.player_label['text'] = f"Сейчас ходит: {self.current_player}"
 
     def check_winner(self):
-        """Проверяет, выиграл ли кто-то"""
-        # Проверка по горизонтали
-        for i in range(3):
-            if (self.buttons[i][0]['text'] == self.buttons[i][1]['text'] ==
-                    self.buttons[i][2]['text'] != ""):
-                # Подсвечиваем выигрышную линию
-                for j in range(3):
-                    self.buttons[i][j]['bg'] = "#c8e6c9"  # Светло-зеленый
-                return True
-
-        # Проверка по вертикали
-        for i in range(3):
-            if (self.buttons[0][i]['text'] == self.buttons[1][i]['text'] ==
-                    self.buttons[2][i]['text'] != ""):
-                # Подсвечиваем выигрышную линию
-                for j in range(3):
-                    self.buttons[j][i]['bg'] = "#c8e6c9"
-                return True
-
-        # Проверка по диагонали (сверху слева - вниз справа)
-        if (self.buttons[0][0]['text'] == self.buttons[1][1]['text'] ==
-                self.buttons[2][2]['text'] != ""):
-            # Подсвечиваем выигрышную линию
-            self.buttons[0][0]['bg'] = "#c8e6c9"
-            self.buttons[1][1]['bg'] = "#c8e6c9"
-            self.buttons[2][2]['bg'] = "#c8e6c9"
-            return True
-
-        # Проверка по диагонали (сверху справа - вниз слева)
-        if (self.buttons[0][2]['text'] == self.buttons[1][1]['text'] ==
-                self.buttons[2][0]['text'] != ""):
-            # Подсвечиваем выигрышную линию
-            self.buttons[0][2]['bg'] = "#c8e6c9"
-            self.buttons[1][1]['bg'] = "#c8e6c9"
-            self.buttons[2][0]['bg'] = "#c8e6c9"
-            return True
-
-        return False
+        """Проверяет, выиграл ли кто-то, и подсвечивает выигрышную линию"""
+        if self.board.winner() is None:
+            return False
+
+        self.board_canvas.highlight(self.board.winning_cells())
+        return True
 
     def check_draw(self):
         """Проверяет, наступила ли ничья"""
-        for row in self.buttons:
-            for button in row:
-                if button['text'] == "":
-                    return False
-        return True
+        return self.board.is_full()
 
     def reset_game(self):
         """Сбрасывает текущую игру"""
-        # Возвращаем игрока в начальное состояние
-        self.current_player = self.player_choice
+        self.cancel_computer_move()
+
+        # Новая позиция: первым ходит выбранный игроком символ
+        self.board = self.new_board()
         self.player_label['text'] = f"Сейчас ходит: {self.current_player}"
 
         # Очищаем игровое поле
-        for i in range(3):
-            for j in range(3):
-                self.buttons[i][j]['text'] = ""
-                self.buttons[i][j]['bg'] = "SystemButtonFace"
+        self.board_canvas.render(self.board)
 
         # Активируем игру
         self.game_active = True
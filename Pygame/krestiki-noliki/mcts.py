@@ -0,0 +1,421 @@
+"""
+Поиск Монте-Карло по дереву (MCTS, UCT) для больших полей
+
+Полный перебор возможен только на поле 3 x 3, поэтому на больших полях
+компьютер оценивает ходы случайными доигрываниями. Доигрывания идут по
+компактному представлению поля - bytearray (0 - пусто, 1 и 2 - игроки),
+победа проверяется только по четырем линиям через сделанный ход.
+
+Дерево сохраняется между ходами: после ответа соперника поиск продолжается
+с соответствующего поддерева. Поиск ограничивается временем и/или числом
+итераций; при workers > 1 дополнительные независимые деревья строятся в
+процессах ProcessPoolExecutor, а посещения корневых ходов суммируются
+(параллелизм на уровне корня).
+"""
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from engine import DIRECTIONS
+
+EXPLORATION = math.sqrt(2)
+
+# На полях больше этого размера ходы в дереве рассматриваются только рядом с занятыми клетками
+NEIGHBOURHOOD_MIN_SIZE = 6
+NEIGHBOURHOOD_RADIUS = 2
+
+
+def board_state(board):
+    """
+    Возвращает позицию в виде, пригодном для передачи в другой процесс
+
+    Args:
+        board (engine.Board): Позиция
+
+    Returns:
+        tuple: (size, win_length, cells, to_move), где cells - bytes,
+            to_move - 1 или 2 (номер игрока, который ходит)
+    """
+    cells = bytearray(board.cell_count)
+    for player in (0, 1):
+        mask = board.masks[player]
+        for index in range(board.cell_count):
+            if mask >> index & 1:
+                cells[index] = player + 1
+    return board.size, board.win_length, bytes(cells), board.turn + 1
+
+
+@lru_cache(maxsize=None)
+def line_rays(size, win_length):
+    """
+    Возвращает для каждой клетки лучи в четырех направлениях
+
+    Луч - кортеж номеров соседних клеток (не больше win_length - 1) в одну
+    сторону от клетки; для каждого направления хранятся оба луча. Так проверка
+    победы обходится без вычисления координат и проверок границ.
+
+    Returns:
+        tuple: rays[index] - кортеж пар (луч вперед, луч назад) по направлениям
+    """
+    rays = []
+    for index in range(size * size):
+        row, col = divmod(index, size)
+        pairs = []
+        for d_row, d_col in DIRECTIONS:
+            pair = []
+            for sign in (1, -1):
+                ray = []
+                r, c = row + sign * d_row, col + sign * d_col
+                while 0 <= r < size and 0 <= c < size and len(ray) < win_length - 1:
+                    ray.append(r * size + c)
+                    r += sign * d_row
+                    c += sign * d_col
+                pair.append(tuple(ray))
+            pairs.append(tuple(pair))
+        rays.append(tuple(pairs))
+    return tuple(rays)
+
+
+@lru_cache(maxsize=None)
+def neighbourhoods(size):
+    """Возвращает для каждой клетки номера клеток на расстоянии не больше NEIGHBOURHOOD_RADIUS"""
+    result = []
+    for index in range(size * size):
+        row, col = divmod(index, size)
+        result.append(tuple(
+            r * size + c
+            for r in range(max(row - NEIGHBOURHOOD_RADIUS, 0), min(row + NEIGHBOURHOOD_RADIUS + 1, size))
+            for c in range(max(col - NEIGHBOURHOOD_RADIUS, 0), min(col + NEIGHBOURHOOD_RADIUS + 1, size))
+        ))
+    return tuple(result)
+
+
+def wins_at(cells, rays, win_length, index, player):
+    """Проверяет, образует ли символ игрока в клетке index линию длиной win_length"""
+    for forward, backward in rays[index]:
+        count = 1
+        for neighbour in forward:
+            if cells[neighbour] != player:
+                break
+            count += 1
+        for neighbour in backward:
+            if cells[neighbour] != player:
+                break
+            count += 1
+        if count >= win_length:
+            return True
+    return False
+
+
+def candidate_moves(cells, size):
+    """Ходы, добавляемые в дерево: все свободные клетки или, на больших полях, клетки рядом с занятыми"""
+    if size < NEIGHBOURHOOD_MIN_SIZE:
+        return [index for index, value in enumerate(cells) if not value]
+
+    occupied = [index for index, value in enumerate(cells) if value]
+    if not occupied:
+        # Пустое большое поле: начинаем с центра
+        return [(size // 2) * size + size // 2]
+
+    near = set()
+    areas = neighbourhoods(size)
+    for index in occupied:
+        near.update(areas[index])
+    return sorted(index for index in near if not cells[index])
+
+
+def playout(cells, rays, win_length, to_move, rng):
+    """
+    Доигрывает позицию случайными ходами
+
+    Args:
+        cells (bytearray): Поле (изменяется)
+        rays (tuple): Лучи клеток (см. line_rays)
+        win_length (int): Длина выигрышной линии
+        to_move (int): Игрок, который ходит (1 или 2)
+        rng (random.Random): Генератор случайных чисел
+
+    Returns:
+        int: Победитель (1 или 2) или 0 при ничьей
+    """
+    empty = [index for index, value in enumerate(cells) if not value]
+    rng.shuffle(empty)
+    player = to_move
+    for index in empty:
+        cells[index] = player
+        if wins_at(cells, rays, win_length, index, player):
+            return player
+        player = 3 - player
+    return 0
+
+
+class Node:
+    """Узел дерева поиска: позиция после хода move игрока player"""
+
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'visits', 'wins', 'winner')
+
+    def __init__(self, move, player, parent, untried, winner):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+        # Победитель, если партия окончена этим ходом (0 - ничья, None - партия продолжается)
+        self.winner = winner
+
+    def select_child(self):
+        """Выбирает потомка по формуле UCT"""
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.wins / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+        )
+
+
+class SearchTree:
+    """Дерево поиска из одной позиции"""
+
+    def __init__(self, size, win_length, cells, to_move, rng=None):
+        """
+        Создает дерево
+
+        Args:
+            size (int): Размер стороны поля
+            win_length (int): Длина выигрышной линии
+            cells (bytes): Поле (см. board_state)
+            to_move (int): Игрок, который ходит (1 или 2)
+            rng (random.Random, optional): Генератор случайных чисел
+        """
+        self.size = size
+        self.win_length = win_length
+        self.cells = bytearray(cells)
+        self.rays = line_rays(size, win_length)
+        self.rng = rng or random.Random()
+        self.root = Node(None, 3 - to_move, None, candidate_moves(self.cells, size), None)
+        self.playouts = 0
+
+    @property
+    def to_move(self):
+        return 3 - self.root.player
+
+    def run(self, time_limit=None, iterations=None):
+        """
+        Выполняет итерации поиска
+
+        Args:
+            time_limit (float, optional): Ограничение по времени в секундах
+            iterations (int, optional): Ограничение числа итераций
+
+        Returns:
+            int: Количество выполненных итераций
+        """
+        if time_limit is None and iterations is None:
+            raise ValueError("Нужно задать ограничение по времени или по числу итераций")
+
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        done = 0
+        while iterations is None or done < iterations:
+            # Проверка времени раз в 16 итераций - perf_counter не бесплатен
+            if deadline is not None and done % 16 == 0 and time.perf_counter() >= deadline:
+                break
+            self._iterate()
+            done += 1
+        self.playouts += done
+        return done
+
+    def _iterate(self):
+        size, win_length, rays, rng = self.size, self.win_length, self.rays, self.rng
+        cells = bytearray(self.cells)
+        node = self.root
+
+        # Выбор: спускаемся по полностью раскрытым узлам
+        while not node.untried and node.children:
+            node = node.select_child()
+            cells[node.move] = node.player
+
+        # Раскрытие: добавляем один еще не опробованный ход
+        if node.winner is None and node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            player = 3 - node.player
+            cells[move] = player
+            if wins_at(cells, rays, win_length, move, player):
+                winner, untried = player, []
+            else:
+                untried = candidate_moves(cells, size)
+                winner = None if untried else 0
+            child = Node(move, player, node, untried, winner)
+            node.children.append(child)
+            node = child
+
+        # Доигрывание
+        if node.winner is not None:
+            result = node.winner
+        else:
+            result = playout(cells, rays, win_length, 3 - node.player, rng)
+
+        # Обратное распространение: победа - 1, ничья - 0.5 для игрока, сделавшего ход в узел
+        while node is not None:
+            node.visits += 1
+            if result == node.player:
+                node.wins += 1
+            elif result == 0:
+                node.wins += 0.5
+            node = node.parent
+
+    def root_stats(self):
+        """Возвращает {ход: (посещения, выигрыши)} для ходов из корня"""
+        return {child.move: (child.visits, child.wins) for child in self.root.children}
+
+    def advance(self, move):
+        """
+        Переносит корень в поддерево после хода
+
+        Returns:
+            bool: True, если поддерево найдено; иначе дерево начинается заново
+        """
+        player = self.to_move
+        self.cells[move] = player
+        for child in self.root.children:
+            if child.move == move:
+                child.parent = None
+                self.root = child
+                return True
+
+        self.root = Node(None, player, None, candidate_moves(self.cells, self.size), None)
+        return False
+
+
+def _search_worker(state, time_limit, iterations, seed):
+    """Поиск в отдельном процессе: возвращает статистику корневых ходов и число итераций"""
+    size, win_length, cells, to_move = state
+    tree = SearchTree(size, win_length, cells, to_move, random.Random(seed))
+    tree.run(time_limit, iterations)
+    return tree.root_stats(), tree.playouts
+
+
+class MCTSPlayer:
+    """Компьютерный игрок на основе MCTS с повторным использованием дерева"""
+
+    def __init__(self, time_limit=1.0, iterations=None, workers=1, rng=None):
+        """
+        Инициализирует игрока
+
+        Args:
+            time_limit (float, optional): Время на ход в секундах. По умолчанию 1.0.
+            iterations (int, optional): Ограничение числа итераций на ход (в каждом процессе)
+            workers (int, optional): Количество параллельных деревьев (процессов). По умолчанию 1.
+            rng (random.Random, optional): Генератор случайных чисел
+        """
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.workers = max(1, workers)
+        self.rng = rng or random.Random()
+
+        self.tree = None
+        self.history = []
+        self._executor = None
+
+        # Статистика последнего хода
+        self.last_playouts = 0
+        self.last_elapsed = 0.0
+        self.last_reused = 0
+
+    def choose_move(self, board):
+        """
+        Выбирает ход в позиции
+
+        Args:
+            board (engine.Board): Позиция, в которой ходит компьютер
+
+        Returns:
+            int: Номер клетки
+        """
+        moves = board.legal_moves()
+        if not moves:
+            raise ValueError("В позиции нет допустимых ходов")
+
+        # Немедленный выигрыш и защита от немедленного проигрыша не требуют поиска
+        for check in (board.wins_with, board.blocks):
+            for index in moves:
+                if check(index):
+                    self._forget()
+                    self.last_playouts, self.last_elapsed, self.last_reused = 0, 0.0, 0
+                    return index
+
+        start = time.perf_counter()
+        tree = self._tree_for(board)
+        self.last_reused = tree.root.visits
+
+        futures = []
+        if self.workers > 1:
+            state = (tree.size, tree.win_length, bytes(tree.cells), tree.to_move)
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_search_worker, state, self.time_limit, self.iterations, self.rng.getrandbits(32))
+                for _ in range(self.workers - 1)
+            ]
+
+        tree.playouts = 0
+        tree.run(self.time_limit, self.iterations)
+        visits = {move: stats[0] for move, stats in tree.root_stats().items()}
+        playouts = tree.playouts
+
+        for future in futures:
+            stats, worker_playouts = future.result()
+            playouts += worker_playouts
+            for move, (move_visits, _) in stats.items():
+                visits[move] = visits.get(move, 0) + move_visits
+
+        move = max(visits, key=visits.get) if visits else self.rng.choice(moves)
+        self.last_playouts = playouts
+        self.last_elapsed = time.perf_counter() - start
+
+        tree.advance(move)
+        self.history = list(board.history) + [move]
+        return move
+
+    def close(self):
+        """Останавливает процессы параллельного поиска"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _tree_for(self, board):
+        """Возвращает дерево для позиции, по возможности продолжая прежнее"""
+        tree = self.tree
+        played = board.history[len(self.history):]
+        if (tree is not None and tree.size == board.size and tree.win_length == board.win_length
+                and board.history[:len(self.history)] == self.history):
+            for move in played:
+                tree.advance(move)
+            self.history = list(board.history)
+            return tree
+
+        size, win_length, cells, to_move = board_state(board)
+        self.tree = SearchTree(size, win_length, cells, to_move, self.rng)
+        self.history = list(board.history)
+        return self.tree
+
+    def _forget(self):
+        self.tree = None
+        self.history = []
+
+    def _get_executor(self):
+        if self._executor is None:
+            # spawn: дочерние процессы не наследуют состояние Tk родительского процесса
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers - 1,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+
+def default_workers():
+    """Количество процессов по умолчанию: ядра процессора, но не больше 4"""
+    return min(os.cpu_count() or 1, 4)
@@ -0,0 +1,279 @@
+"""
+Таблица решений крестиков-ноликов: оценка и лучшие ходы для каждой позиции
+
+Позиция кодируется числом в троичной системе: цифра клетки i (вес 3**i)
+равна 0 для пустой клетки, 1 для символа начавшего партию игрока и 2 для
+символа второго игрока. Так таблица подходит для партий, начатых и
+крестиками, и ноликами. Для каждого из 3**9 кодов хранится 16-битная запись:
+
+    биты 0-8   - маска лучших ходов (пустая для оконченной партии);
+    биты 9-13  - оценка позиции для игрока, который ходит, плюс SCORE_OFFSET
+                 (см. ai.NegamaxSearch: 1 + число свободных клеток за победу);
+    бит 15     - позиция достижима по правилам игры.
+
+Файл (little-endian): сигнатура MAGIC и записи подряд, около 39 КБ.
+Файл отображается в память (mmap), поэтому выбор хода - чтение одной записи.
+
+Генерация и проверка:
+    python solution_table.py generate [--path solution_table.bin]
+    python solution_table.py verify [--path solution_table.bin]
+"""
+import argparse
+import mmap
+import os
+import sys
+from array import array
+
+from ai import NegamaxSearch
+from engine import CELL_COUNT, Board
+
+MAGIC = b"TTTSOL1\0"
+TABLE_SIZE = 3 ** CELL_COUNT
+SCORE_OFFSET = CELL_COUNT + 1
+
+SCORE_SHIFT = CELL_COUNT
+REACHABLE = 1 << 15
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solution_table.bin")
+
+# Вес клетки в троичном коде
+POWERS = tuple(3 ** index for index in range(CELL_COUNT))
+
+
+def encode(board):
+    """
+    Возвращает троичный код позиции
+
+    Args:
+        board (engine.Board): Позиция
+
+    Returns:
+        int: Код от 0 до 3**9 - 1
+    """
+    # Игрок, начавший партию: при четном числе ходов он же и ходит сейчас
+    first = board.turn ^ (len(board.history) & 1)
+    first_mask = board.masks[first]
+    second_mask = board.masks[first ^ 1]
+
+    code = 0
+    for index in range(CELL_COUNT):
+        if first_mask >> index & 1:
+            code += POWERS[index]
+        elif second_mask >> index & 1:
+            code += 2 * POWERS[index]
+    return code
+
+
+def pack_entry(score, moves):
+    """Упаковывает оценку и список лучших ходов в 16-битную запись"""
+    entry = REACHABLE | (score + SCORE_OFFSET) << SCORE_SHIFT
+    for index in moves:
+        entry |= 1 << index
+    return entry
+
+
+def unpack_entry(entry):
+    """
+    Распаковывает запись таблицы
+
+    Returns:
+        tuple: (оценка, список лучших ходов) или None для недостижимой позиции
+    """
+    if not entry & REACHABLE:
+        return None
+    score = (entry >> SCORE_SHIFT & 0x1F) - SCORE_OFFSET
+    moves = [index for index in range(CELL_COUNT) if entry >> index & 1]
+    return score, moves
+
+
+def terminal_score(board):
+    """Оценка оконченной партии для игрока, который ходит (None, если партия не окончена)"""
+    if board.winner() is not None:
+        return -(1 + CELL_COUNT - len(board.history))
+    if board.is_full():
+        return 0
+    return None
+
+
+def reachable_positions():
+    """
+    Перечисляет все позиции, достижимые по правилам игры из пустого поля
+
+    Yields:
+        engine.Board: Позиция (один и тот же объект, изменяемый между итерациями)
+    """
+    board = Board()
+    seen = set()
+
+    def walk():
+        code = encode(board)
+        if code in seen:
+            return
+        seen.add(code)
+        yield board
+        if board.is_over():
+            return
+        for index in board.legal_moves():
+            board.make_move(index)
+            yield from walk()
+            board.unmake_move()
+
+    yield from walk()
+
+
+def build_table(search=None):
+    """
+    Решает все достижимые позиции
+
+    Args:
+        search (ai.NegamaxSearch, optional): Поиск, используемый для оценки ходов
+
+    Returns:
+        array: Записи таблицы ('H', TABLE_SIZE элементов)
+    """
+    search = search or NegamaxSearch()
+    entries = array('H', bytes(2 * TABLE_SIZE))
+    for board in reachable_positions():
+        score = terminal_score(board)
+        if score is not None:
+            entries[encode(board)] = pack_entry(score, [])
+            continue
+
+        scores = search.evaluate_moves(board)
+        best = max(scores.values())
+        entries[encode(board)] = pack_entry(best, [index for index, value in scores.items() if value == best])
+    return entries
+
+
+def write_table(path, entries):
+    """Сохраняет записи таблицы в файл"""
+    if sys.byteorder != "little":
+        entries = array('H', entries)
+        entries.byteswap()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        entries.tofile(f)
+    os.replace(tmp_path, path)
+
+
+class SolutionTable:
+    """Таблица решений, отображенная в память"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Открывает файл таблицы
+
+        Args:
+            path (str, optional): Путь к файлу
+
+        Raises:
+            OSError: Файл не найден или не читается
+            ValueError: Файл поврежден или имеет другой формат
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) != len(MAGIC) + 2 * TABLE_SIZE or self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Файл {path} не является таблицей решений")
+
+        if sys.byteorder == "little":
+            self._entries = memoryview(self._mmap)[len(MAGIC):].cast('H')
+        else:
+            # На big-endian платформах записи приходится переставлять - читаем копию
+            self._entries = array('H', self._mmap[len(MAGIC):])
+            self._entries.byteswap()
+
+    def lookup(self, board):
+        """
+        Возвращает оценку позиции и лучшие ходы
+
+        Args:
+            board (engine.Board): Позиция
+
+        Returns:
+            tuple: (оценка для игрока, который ходит, список лучших ходов)
+                или None, если позиция недостижима
+        """
+        return unpack_entry(self._entries[encode(board)])
+
+    def best_moves(self, board):
+        """Возвращает лучшие ходы в позиции (пустой список, если позиции нет в таблице)"""
+        result = self.lookup(board)
+        return result[1] if result else []
+
+    def close(self):
+        """Освобождает отображение файла"""
+        if isinstance(self._entries, memoryview):
+            self._entries.release()
+        self._mmap.close()
+
+
+def load_table(path=DEFAULT_PATH):
+    """
+    Открывает таблицу решений, если она есть
+
+    Returns:
+        SolutionTable: Таблица или None, если файл отсутствует или поврежден
+    """
+    try:
+        return SolutionTable(path)
+    except (OSError, ValueError) as e:
+        print(f"Таблица решений недоступна, используется поиск: {e}")
+        return None
+
+
+def verify_table(table):
+    """
+    Сверяет таблицу с поиском negamax по всем достижимым позициям
+
+    Returns:
+        tuple: (количество проверенных позиций, список кодов позиций с расхождениями)
+    """
+    # Независимый от генератора поиск: без приведения по симметриям
+    search = NegamaxSearch(use_symmetry=False)
+    checked = 0
+    mismatches = []
+    for board in reachable_positions():
+        checked += 1
+        score = terminal_score(board)
+        if score is not None:
+            expected = (score, [])
+        else:
+            scores = search.evaluate_moves(board)
+            best = max(scores.values())
+            expected = (best, sorted(index for index, value in scores.items() if value == best))
+
+        if table.lookup(board) != expected:
+            mismatches.append(encode(board))
+    return checked, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Таблица решений крестиков-ноликов")
+    parser.add_argument("command", choices=["generate", "verify"])
+    parser.add_argument("--path", default=DEFAULT_PATH, help="Файл таблицы")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        entries = build_table()
+        write_table(args.path, entries)
+        positions = sum(1 for entry in entries if entry & REACHABLE)
+        print(f"Позиций: {positions}, файл: {args.path} ({os.path.getsize(args.path)} байт)")
+        return
+
+    table = SolutionTable(args.path)
+    try:
+        checked, mismatches = verify_table(table)
+    finally:
+        table.close()
+
+    print(f"Проверено позиций: {checked}, расхождений: {len(mismatches)}")
+    if mismatches:
+        print("Коды позиций с расхождениями:", ", ".join(map(str, mismatches[:20])))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Микробенчмарк: задержка одного вызова db_manager
+с новым соединением на каждый вызов и с долгоживущим соединением из пула
+
+Запуск из каталога Tkinter/Quiz:
+    python benchmarks/bench_connections.py [--calls 5000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db_manager  # noqa: E402
+
+
+def legacy_get_user_info(db_path, user_id):
+    """Прежняя реализация: новое соединение на каждый вызов"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('''
+    SELECT user_id, username, avatar_path, date_created
+    FROM Users
+    WHERE user_id = ?
+    ''', (user_id,))
+    user_info = cursor.fetchone()
+    conn.close()
+    return user_info
+
+
+def legacy_get_answers_for_question(db_path, question_id):
+    """Прежняя реализация: новое соединение на каждый вызов"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('''
+    SELECT answer_id, question_id, answer_text, is_correct
+    FROM Answers
+    WHERE question_id = ?
+    ORDER BY RANDOM()
+    ''', (question_id,))
+    answers = cursor.fetchall()
+    conn.close()
+    return answers
+
+
+def measure(func, calls):
+    """Возвращает среднюю задержку вызова в микросекундах"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=5000, help='Количество вызовов на замер')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'bench.db')
+        db_manager.configure_database(db_path)
+        db_manager.initialize_database()
+        user_id = db_manager.create_user("bench", None)
+        category_id = db_manager.get_all_categories()[0][0]
+        question_id = db_manager.get_questions_for_category(category_id, 1)[0].question_id
+
+        cases = [
+            ("get_user_info",
+             lambda: legacy_get_user_info(db_path, user_id),
+             lambda: db_manager.get_user_info(user_id)),
+            ("get_answers_for_question",
+             lambda: legacy_get_answers_for_question(db_path, question_id),
+             lambda: db_manager.get_answers_for_question(question_id)),
+        ]
+
+        print(f"{'Функция':<28}{'connect/вызов, мкс':>20}{'пул, мкс':>12}{'ускорение':>12}")
+        for name, legacy, pooled in cases:
+            before = measure(legacy, args.calls)
+            after = measure(pooled, args.calls)
+            print(f"{name:<28}{before:>20.1f}{after:>12.1f}{before / after:>11.1f}x")
+
+        db_manager.close_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Бенчмарк кэша запросов: скорость загрузки раундов (load_round) и рубрик
+при разных бюджетах памяти QueryCache и доля попаданий в кэш
+
+Запуск из каталога Tkinter/Quiz:
+    python benchmarks/bench_query_cache.py [--questions 5000] [--rounds 2000]
+                                           [--budgets 0 262144 16777216]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db_manager  # noqa: E402
+
+
+def fill_category(category_id, size):
+    """Заполняет категорию вопросами с четырьмя вариантами ответа"""
+    db_manager.add_questions_batch([
+        (category_id, f"Вопрос {i}", 30, 1.0, [(f"Ответ {j}", j == 0) for j in range(4)])
+        for i in range(size)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=5000, help='Количество вопросов в рубрике')
+    parser.add_argument('--rounds', type=int, default=2000, help='Количество загружаемых раундов')
+    parser.add_argument('--budgets', type=int, nargs='+', default=[0, 256 * 1024, 16 * 1024 * 1024],
+                        help='Бюджеты памяти кэша в байтах')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager.configure_database(os.path.join(tmp_dir, 'bench.db'), profile="fast")
+        db_manager.initialize_database()
+        category_id = db_manager.add_category("Бенчмарк", "")
+        fill_category(category_id, args.questions)
+
+        print(f"{'Бюджет, КиБ':>12}{'раундов/с':>12}{'рубрик/с':>12}{'попадания':>11}"
+              f"{'вытеснено':>11}{'занято, КиБ':>13}")
+        for budget in args.budgets:
+            db_manager.configure_database(cache_max_bytes=budget)
+            db_manager._cache.reset_stats()
+
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                db_manager.load_round(category_id, 10)
+            rounds_rate = args.rounds / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                db_manager.get_all_categories()
+            categories_rate = args.rounds / (time.perf_counter() - start)
+
+            stats = db_manager.get_cache_stats()
+            print(f"{budget // 1024:>12}{rounds_rate:>12.0f}{categories_rate:>12.0f}{stats['hit_rate']:>11.1%}"
+                  f"{stats['evictions']:>11}{stats['size_bytes'] // 1024:>13}")
+
+        db_manager.close_database()
+
+
+if __name__ == "__main__":
+    main()
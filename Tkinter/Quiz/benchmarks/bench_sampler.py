@@ -0,0 +1,79 @@
+"""
+Бенчмарк случайной выборки вопросов: ORDER BY RANDOM() LIMIT k
+против QuestionSampler (кэш ID категории + random.sample) при 1k/100k/1M вопросов
+
+Запуск из каталога Tkinter/Quiz:
+    python benchmarks/bench_sampler.py [--sizes 1000 100000 1000000] [-k 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db_manager  # noqa: E402
+
+
+def fill_category(category_id, size):
+    """Заполняет категорию заданным количеством вопросов (без ответов)"""
+    with db_manager._connections.transaction() as cursor:
+        cursor.executemany('''
+        INSERT INTO Questions (category_id, question_text, time_limit, difficulty_level)
+        VALUES (?, ?, 30, 1.0)
+        ''', ((category_id, f"Вопрос {i}") for i in range(size)))
+
+
+def order_by_random(category_id, k):
+    """Прежний способ выборки"""
+    cursor = db_manager._connections.cursor()
+    cursor.execute('''
+    SELECT question_id
+    FROM Questions
+    WHERE category_id = ?
+    ORDER BY RANDOM()
+    LIMIT ?
+    ''', (category_id, k))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def measure_ms(func, repeats):
+    """Возвращает среднее время вызова в миллисекундах"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000],
+                        help='Размеры категории')
+    parser.add_argument('-k', type=int, default=10, help='Количество вопросов в раунде')
+    args = parser.parse_args()
+
+    print(f"{'Вопросов':>10}{'RANDOM(), мс':>14}{'кэш ID, мс':>14}{'выборка, мс':>14}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_manager.configure_database(os.path.join(tmp_dir, 'bench.db'), profile="fast")
+            db_manager.initialize_database()
+            category_id = db_manager.add_category("Бенчмарк", "")
+            fill_category(category_id, size)
+
+            repeats = max(3, 100000 // size)
+            random_ms = measure_ms(lambda: order_by_random(category_id, args.k), repeats)
+
+            # Холодный старт: построение кэша ID категории (один раз до следующей правки)
+            start = time.perf_counter()
+            db_manager._sampler.get_ids(category_id)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            sample_ms = measure_ms(lambda: db_manager._sampler.sample(category_id, args.k), 1000)
+            print(f"{size:>10}{random_ms:>14.2f}{build_ms:>14.2f}{sample_ms:>14.4f}")
+
+            db_manager.close_database()
+
+
+if __name__ == "__main__":
+    main()
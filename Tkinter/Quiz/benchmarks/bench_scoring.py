@@ -0,0 +1,58 @@
+"""
+Бенчмарк пересчета очков: score_sessions для множества игровых сессий
+(векторизованный расчет при наличии NumPy и поэлементный без него)
+
+Запуск из каталога Tkinter/Quiz:
+    python benchmarks/bench_scoring.py [--sessions 100000] [--questions 10]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_logic  # noqa: E402
+from models import Answer, Question  # noqa: E402
+
+
+def make_sessions(count, questions, seed=0):
+    """Создает сессии со случайными ответами"""
+    rng = random.Random(seed)
+    sessions = []
+    for user_id in range(count):
+        session = game_logic.GameSession(user_id, 1)
+        for question_id in range(questions):
+            question = Question(question_id, 1, "", rng.choice((15, 30, 60)), rng.choice((1.0, 1.5, 2.0)))
+            answer = Answer(question_id, question_id, "", rng.random() < 0.6) if rng.random() < 0.9 else None
+            session.record_answer(question, answer, rng.randint(500, question.time_limit * 1000))
+        sessions.append(session)
+    return sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=100000, help='Количество сессий')
+    parser.add_argument('--questions', type=int, default=10, help='Количество ответов в сессии')
+    args = parser.parse_args()
+
+    sessions = make_sessions(args.sessions, args.questions)
+    events = args.sessions * args.questions
+    print(f"NumPy: {'да' if game_logic.np is not None else 'нет'}, ответов: {events}")
+
+    start = time.perf_counter()
+    totals = game_logic.score_sessions(sessions)
+    elapsed = time.perf_counter() - start
+    print(f"score_sessions: {elapsed:.3f} с ({events / elapsed:,.0f} ответов/с)")
+
+    assert totals == [session.total_points for session in sessions]
+
+    start = time.perf_counter()
+    game_logic.score_sessions(sessions, base_points=120, max_time_bonus=80)
+    elapsed = time.perf_counter() - start
+    print(f"Пересчет по новым правилам: {elapsed:.3f} с")
+
+
+if __name__ == "__main__":
+    main()
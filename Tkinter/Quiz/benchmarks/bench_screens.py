@@ -0,0 +1,66 @@
+"""
+Проверка памяти при навигации: количество виджетов и объем памяти Python
+после тысяч переходов меню -> категории -> игра -> результаты
+
+Требуется графическое окружение (DISPLAY). Запуск из каталога Tkinter/Quiz:
+    python benchmarks/bench_screens.py [--rounds 2000] [--report-every 250]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db_manager  # noqa: E402
+from main import QuizApp  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=2000, help='Количество сыгранных раундов')
+    parser.add_argument('--report-every', type=int, default=250, help='Период вывода счетчиков')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager.configure_database(os.path.join(tmp_dir, 'bench.db'))
+        db_manager.initialize_database()
+        db_manager.create_user("Бенчмарк", "")
+        category_id, category_name, _ = db_manager.get_all_categories()[0]
+
+        app = QuizApp()
+        app.withdraw()
+        while app.screens.current_name == "loading":
+            app.update()
+            time.sleep(0.001)
+        tracemalloc.start()
+
+        print(f"{'Раунд':>8}{'виджетов':>10}{'создано':>10}{'уничтожено':>12}{'память, КиБ':>13}{'мс/раунд':>10}")
+        start = time.perf_counter()
+        for round_number in range(1, args.rounds + 1):
+            app.show_main_menu()
+            app.show_category_select()
+            app.start_game(category_id, category_name)
+            app.update()
+            app.show_results(0, 0, 10, category_name)
+            if round_number % 10 == 0:
+                app.show_profile()
+            app.update()
+
+            if round_number % args.report_every == 0:
+                elapsed = (time.perf_counter() - start) * 1000 / args.report_every
+                stats = app.screens.stats()
+                current, _ = tracemalloc.get_traced_memory()
+                print(f"{round_number:>8}{stats['widgets']:>10}{stats['created']:>10}{stats['destroyed']:>12}"
+                      f"{current // 1024:>13}{elapsed:>10.2f}")
+                start = time.perf_counter()
+
+        app.exit_app()
+        app.destroy()
+        db_manager.close_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Бенчмарк холодного старта приложения: время импорта main
+(python -X importtime), время до первого кадра и до готовности главного экрана
+
+Каждый замер выполняется в отдельном процессе. "Холодный" старт - с пустым
+каталогом (база создается и заполняется миграциями), "теплый" - с уже
+подготовленной базой. Медианы сравниваются с бюджетами; при превышении
+скрипт завершается с кодом 1. С параметром --history результаты дописываются
+в файл (одна строка JSON на запуск), чтобы следить за динамикой.
+
+Требуется графическое окружение (DISPLAY). Запуск из каталога Tkinter/Quiz:
+    python benchmarks/bench_startup.py [--runs 5] [--history startup_history.jsonl]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+QUIZ_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Бюджеты по умолчанию, мс (медиана теплого старта)
+IMPORT_BUDGET_MS = 60
+FIRST_FRAME_BUDGET_MS = 250
+READY_BUDGET_MS = 600
+
+# Выполняется в отдельном процессе; текущий каталог - каталог с базой данных
+PROBE = """
+import json
+import time
+
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+app = main.QuizApp()
+app.update()
+first_frame = time.perf_counter()
+
+deadline = first_frame + 30
+while app.screens.current_name == "loading" and time.perf_counter() < deadline:
+    app.update()
+    time.sleep(0.001)
+ready = time.perf_counter()
+
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'first_frame_ms': (first_frame - start) * 1000,
+    'ready_ms': (ready - start) * 1000,
+    'ready': app.screens.current_name != "loading",
+}))
+app.exit_app()
+app.destroy()
+"""
+
+
+def probe_env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = QUIZ_DIR + os.pathsep + env.get('PYTHONPATH', '')
+    return env
+
+
+def measure_imports(top=10):
+    """
+    Запускает python -X importtime и возвращает общее время импорта main
+    и самые медленные модули (по собственному времени)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=QUIZ_DIR, env=probe_env(), capture_output=True, text=True, check=True
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((int(self_us), int(cumulative_us), name.strip()))
+
+    total_us = next(cumulative for _, cumulative, name in modules if name == 'main')
+    return total_us / 1000, sorted(modules, reverse=True)[:top]
+
+
+def measure_start(db_dir):
+    """Запускает приложение в отдельном процессе и возвращает замеры в мс"""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=db_dir, env=probe_env(), capture_output=True, text=True, check=True
+    )
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    if not sample['ready']:
+        raise RuntimeError("Приложение не дошло до главного экрана за 30 с")
+    return sample
+
+
+def median(samples, key):
+    return statistics.median(sample[key] for sample in samples)
+
+
+def git_revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=QUIZ_DIR,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Количество запусков каждого вида')
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET_MS, help='Бюджет импорта main, мс')
+    parser.add_argument('--first-frame-budget', type=float, default=FIRST_FRAME_BUDGET_MS,
+                        help='Бюджет времени до первого кадра, мс')
+    parser.add_argument('--ready-budget', type=float, default=READY_BUDGET_MS,
+                        help='Бюджет времени до главного экрана, мс')
+    parser.add_argument('--history', help='Файл, в который дописываются результаты (JSON Lines)')
+    args = parser.parse_args()
+
+    import_ms, slowest = measure_imports()
+    print(f"Импорт main (-X importtime): {import_ms:.1f} мс")
+    print("Самые медленные модули (собственное время):")
+    for self_us, cumulative_us, name in slowest:
+        print(f"  {self_us / 1000:>8.1f} мс  {name}")
+
+    cold, warm = [], []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for run in range(args.runs):
+            run_dir = os.path.join(tmp_dir, f"run{run}")
+            os.makedirs(run_dir)
+            cold.append(measure_start(run_dir))
+            warm.append(measure_start(run_dir))
+
+    results = {
+        'import_ms': round(import_ms, 1),
+        'cold_first_frame_ms': round(median(cold, 'first_frame_ms'), 1),
+        'cold_ready_ms': round(median(cold, 'ready_ms'), 1),
+        'warm_first_frame_ms': round(median(warm, 'first_frame_ms'), 1),
+        'warm_ready_ms': round(median(warm, 'ready_ms'), 1),
+    }
+
+    print(f"\n{'':<12}{'первый кадр, мс':>18}{'главный экран, мс':>20}")
+    print(f"{'Холодный':<12}{results['cold_first_frame_ms']:>18}{results['cold_ready_ms']:>20}")
+    print(f"{'Теплый':<12}{results['warm_first_frame_ms']:>18}{results['warm_ready_ms']:>20}")
+
+    budgets = [
+        ('Импорт main', results['import_ms'], args.import_budget),
+        ('Первый кадр', results['warm_first_frame_ms'], args.first_frame_budget),
+        ('Главный экран', results['warm_ready_ms'], args.ready_budget),
+    ]
+    over_budget = False
+    print()
+    for name, value, budget in budgets:
+        status = "OK" if value <= budget else "ПРЕВЫШЕН"
+        over_budget = over_budget or value > budget
+        print(f"{name:<16}{value:>8.1f} / {budget:.0f} мс  {status}")
+
+    if args.history:
+        record = dict(results, time=time.strftime('%Y-%m-%dT%H:%M:%S'), revision=git_revision(), runs=args.runs)
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
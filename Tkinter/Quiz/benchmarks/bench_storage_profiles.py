@@ -0,0 +1,64 @@
+"""
+Бенчмарк профилей хранения (utils.constants.DB_STORAGE_PROFILES):
+пропускная способность сохранения результатов игры и правки вопроса в админ-панели
+
+Запуск из каталога Tkinter/Quiz:
+    python benchmarks/bench_storage_profiles.py [--saves 500] [--edits 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db_manager  # noqa: E402
+from utils.constants import DB_STORAGE_PROFILES  # noqa: E402
+
+
+def bench_game_saves(user_id, category_id, count):
+    """Возвращает количество сохранений результатов игры в секунду"""
+    start = time.perf_counter()
+    for i in range(count):
+        db_manager.save_game_results(user_id, category_id, i, i % 10, 10)
+    return count / (time.perf_counter() - start)
+
+
+def bench_admin_edits(question_id, count):
+    """Возвращает количество правок вопроса (вопрос + 4 ответа) в секунду"""
+    answers = db_manager.get_answers_for_question(question_id)
+
+    start = time.perf_counter()
+    for i in range(count):
+        db_manager.update_question(question_id, f"Вопрос {i}", 30, 1.0)
+        for index, answer in enumerate(answers):
+            db_manager.update_answer(answer.answer_id, f"Ответ {i}-{index}", index == 0)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--saves', type=int, default=500, help='Количество сохранений результатов')
+    parser.add_argument('--edits', type=int, default=200, help='Количество правок вопроса')
+    args = parser.parse_args()
+
+    print(f"{'Профиль':<12}{'сохранений/с':>16}{'правок/с':>12}")
+    for profile in DB_STORAGE_PROFILES:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_manager.configure_database(os.path.join(tmp_dir, 'bench.db'), profile=profile)
+            db_manager.initialize_database()
+
+            user_id = db_manager.create_user("bench", None)
+            category_id = db_manager.get_all_categories()[0][0]
+            question_id = db_manager.get_questions_for_category(category_id, 1)[0].question_id
+
+            saves = bench_game_saves(user_id, category_id, args.saves)
+            edits = bench_admin_edits(question_id, args.edits)
+            print(f"{profile:<12}{saves:>16.0f}{edits:>12.0f}")
+
+            db_manager.close_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Потоковый экспорт банка вопросов и истории игр
+
+Строки читаются из базы порциями (fetchmany) и сразу записываются в файл,
+поэтому экспорт многогигабайтной истории не загружает таблицы в память.
+Вопросы выгружаются в формате question_importer, так что файл можно
+загрузить обратно на другой машине. Файлы с расширением .gz сжимаются gzip.
+"""
+import csv
+import gzip
+import io
+import json
+import time
+
+import db_manager
+from question_importer import detect_format
+
+EXPORT_FORMATS = ('csv', 'json', 'jsonl')
+DEFAULT_FETCH_SIZE = 1000
+
+# Как часто сообщать о прогрессе (в записях)
+PROGRESS_EVERY = 10000
+
+HISTORY_FIELDS = ['game_id', 'user_id', 'username', 'category', 'total_points',
+                  'correct_answers', 'total_questions', 'date_played']
+
+
+def open_text_for_write(path):
+    """Открывает текстовый файл на запись, при необходимости сжимая его gzip"""
+    if path.lower().endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'wb'), encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def question_to_record(question):
+    """Преобразует вопрос из db_manager.iter_question_bank в запись формата импорта"""
+    _, category_name, question_text, time_limit, difficulty, answers = question
+    correct = next((index for index, (_, is_correct) in enumerate(answers, start=1) if is_correct), None)
+    return {
+        'category': category_name,
+        'question': question_text,
+        'time_limit': time_limit,
+        'difficulty': difficulty,
+        'answers': [answer_text for answer_text, _ in answers],
+        'correct': correct,
+    }
+
+
+def history_to_record(row):
+    """Преобразует строку из db_manager.iter_game_history в словарь"""
+    return dict(zip(HISTORY_FIELDS, row))
+
+
+def write_records(file, records, file_format, fieldnames=None, flatten=None, progress=None):
+    """
+    Записывает записи в открытый файл
+
+    Args:
+        file: Текстовый файл
+        records: Итерируемый набор словарей
+        file_format (str): 'csv', 'json' или 'jsonl'
+        fieldnames (list, optional): Колонки CSV
+        flatten (callable, optional): Преобразует запись в строку CSV (словарь по fieldnames)
+        progress (callable, optional): Вызывается с количеством записанных записей
+
+    Returns:
+        int: Количество записанных записей
+    """
+    count = 0
+
+    if file_format == 'csv':
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+    elif file_format == 'json':
+        file.write('[')
+
+    for record in records:
+        if file_format == 'csv':
+            writer.writerow(flatten(record) if flatten else record)
+        elif file_format == 'json':
+            file.write(',\n' if count else '\n')
+            file.write(json.dumps(record, ensure_ascii=False))
+        else:
+            file.write(json.dumps(record, ensure_ascii=False))
+            file.write('\n')
+
+        count += 1
+        if progress and count % PROGRESS_EVERY == 0:
+            progress(count)
+
+    if file_format == 'json':
+        file.write('\n]\n')
+
+    return count
+
+
+def _export(path, file_format, records, fieldnames=None, flatten=None, progress=None):
+    """Общая часть экспорта: формат, файл, статистика"""
+    file_format = file_format or detect_format(path)
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Неподдерживаемый формат: {file_format}")
+
+    start = time.perf_counter()
+
+    def report(count):
+        if progress:
+            elapsed = time.perf_counter() - start
+            progress({'exported': count, 'elapsed': elapsed, 'rate': count / elapsed if elapsed > 0 else 0.0})
+
+    with open_text_for_write(path) as file:
+        count = write_records(file, records, file_format, fieldnames, flatten, report)
+
+    elapsed = time.perf_counter() - start
+    return {'exported': count, 'elapsed': elapsed, 'rate': count / elapsed if elapsed > 0 else 0.0}
+
+
+def export_questions(path, file_format=None, fetch_size=DEFAULT_FETCH_SIZE, progress=None):
+    """
+    Экспортирует банк вопросов с ответами
+
+    Args:
+        path (str): Путь к файлу
+        file_format (str, optional): 'csv', 'json' или 'jsonl'. По умолчанию по расширению.
+        fetch_size (int, optional): Количество строк, читаемых из базы за раз
+        progress (callable, optional): Вызывается со словарем статистики во время экспорта
+
+    Returns:
+        dict: Статистика экспорта (exported, elapsed, rate)
+    """
+    records = (question_to_record(question) for question in db_manager.iter_question_bank(fetch_size))
+
+    fieldnames = None
+    flatten = None
+    if (file_format or detect_format(path)) == 'csv':
+        answer_count = max(db_manager.get_max_answer_count(), 1)
+        answer_columns = [f"answer_{index}" for index in range(1, answer_count + 1)]
+        fieldnames = ['category', 'question', 'time_limit', 'difficulty'] + answer_columns + ['correct']
+
+        def flatten(record):
+            row = {key: record[key] for key in ('category', 'question', 'time_limit', 'difficulty', 'correct')}
+            row.update(zip(answer_columns, record['answers']))
+            return row
+
+    return _export(path, file_format, records, fieldnames, flatten, progress)
+
+
+def export_history(path, file_format=None, fetch_size=DEFAULT_FETCH_SIZE, progress=None):
+    """
+    Экспортирует историю игр
+
+    Args:
+        path (str): Путь к файлу
+        file_format (str, optional): 'csv', 'json' или 'jsonl'. По умолчанию по расширению.
+        fetch_size (int, optional): Количество строк, читаемых из базы за раз
+        progress (callable, optional): Вызывается со словарем статистики во время экспорта
+
+    Returns:
+        dict: Статистика экспорта (exported, elapsed, rate)
+    """
+    records = (history_to_record(row) for row in db_manager.iter_game_history(fetch_size))
+    return _export(path, file_format, records, HISTORY_FIELDS, None, progress)
@@ -0,0 +1,117 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class ConnectionManager:
+    """Пул долгоживущих соединений SQLite: по одному соединению на поток"""
+
+    def __init__(self, db_path, pragmas=None, cached_statements=256, functions=None):
+        """
+        Инициализирует менеджер соединений
+
+        Args:
+            db_path (str): Путь к файлу базы данных
+            pragmas (dict, optional): PRAGMA, применяемые к каждому новому соединению
+            cached_statements (int, optional): Размер кэша подготовленных выражений
+                на одно соединение. По умолчанию 256.
+            functions (dict, optional): SQL-функции {имя: (число аргументов, функция)},
+                регистрируемые на каждом соединении
+        """
+        self.db_path = db_path
+        self.pragmas = dict(pragmas or {})
+        self.cached_statements = cached_statements
+        self.functions = dict(functions or {})
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = set()
+
+    def _connect(self):
+        """Открывает новое соединение, применяет к нему PRAGMA и регистрирует SQL-функции"""
+        # isolation_level=None: транзакциями управляем сами через transaction()
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+        for name, (num_params, func) in self.functions.items():
+            conn.create_function(name, num_params, func, deterministic=True)
+
+        with self._lock:
+            self._connections.add(conn)
+
+        return conn
+
+    def connection(self):
+        """Возвращает соединение текущего потока, открывая его при первом обращении"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def cursor(self):
+        """Возвращает новый курсор на соединении текущего потока"""
+        return self.connection().cursor()
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Контекстный менеджер транзакции
+
+        Фиксирует изменения при выходе из блока и откатывает их при исключении.
+        Вложенные вызовы присоединяются к внешней транзакции.
+
+        Args:
+            immediate (bool, optional): Захватить блокировку записи сразу (BEGIN IMMEDIATE)
+
+        Yields:
+            sqlite3.Cursor: Курсор, выполняющий запросы внутри транзакции
+        """
+        conn = self.connection()
+        cursor = conn.cursor()
+
+        if conn.in_transaction:
+            yield cursor
+            return
+
+        cursor.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield cursor
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            cursor.close()
+
+    def close(self):
+        """Закрывает соединение текущего потока"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            with self._lock:
+                self._connections.discard(conn)
+            conn.close()
+
+    def close_all(self):
+        """Закрывает все открытые соединения (вызывается при завершении приложения)"""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+        # Соединение текущего потока больше недействительно
+        self._local = threading.local()
@@ -1,174 +1,162 @@
-import sqlite3
-import os
-from datetime import datetime
+import atexit
+import json
+import random
+import re
+from dataclasses import replace
+
+from db_connection import ConnectionManager
+from db_migrations import run_migrations, rebuild_stats_tables, rebuild_search_index, question_hash
+from models import Question, Answer, Round, question_row_factory
+from query_cache import QueryCache
+from question_sampler import QuestionSampler
+from utils.constants import DB_STORAGE_PROFILE, DB_STORAGE_PROFILES, QUERY_CACHE_MAX_BYTES
 
 DB_PATH = 'quiz_game.db'
 
 
-def initialize_database():
-    """Инициализирует базу данных при первом запуске приложения"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def get_storage_pragmas(profile):
+    """
+    Возвращает PRAGMA для профиля хранения из utils.constants.DB_STORAGE_PROFILES
 
-    # Создание таблицы пользователей
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS Users (
-        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT NOT NULL,
-        avatar_path TEXT,
-        date_created TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
+    Проверка внешних ключей (каскадное удаление вопросов и ответов) включается
+    при любом профиле.
 
-    # Создание таблицы категорий
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS Categories (
-        category_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        description TEXT
-    )
-    ''')
+    Args:
+        profile (str): Название профиля ("safe", "balanced", "fast")
 
-    # Создание таблицы вопросов
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS Questions (
-        question_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        category_id INTEGER,
-        question_text TEXT NOT NULL,
-        time_limit INTEGER DEFAULT 30,
-        difficulty_level REAL DEFAULT 1.0,
-        FOREIGN KEY (category_id) REFERENCES Categories (category_id)
-    )
-    ''')
+    Returns:
+        dict: PRAGMA в порядке применения
+    """
+    if profile not in DB_STORAGE_PROFILES:
+        raise ValueError(f"Неизвестный профиль хранения: {profile}")
+    pragmas = dict(DB_STORAGE_PROFILES[profile])
+    pragmas['foreign_keys'] = 'ON'
+    return pragmas
 
-    # Создание таблицы ответов
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS Answers (
-        answer_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        question_id INTEGER,
-        answer_text TEXT NOT NULL,
-        is_correct BOOLEAN NOT NULL CHECK (is_correct IN (0, 1)),
-        FOREIGN KEY (question_id) REFERENCES Questions (question_id)
-    )
-    ''')
 
-    # Создание таблицы истории игр
+# SQL-функции, доступные в запросах на каждом соединении
+SQL_FUNCTIONS = {
+    'question_hash': (2, question_hash),
+}
+
+# Долгоживущие соединения (по одному на поток), общие для всех функций модуля
+_connections = ConnectionManager(DB_PATH, pragmas=get_storage_pragmas(DB_STORAGE_PROFILE), functions=SQL_FUNCTIONS)
+atexit.register(_connections.close_all)
+
+
+def _load_question_ids(category_id):
+    """Читает ID вопросов категории (только индекс idx_questions_category)"""
+    cursor = _connections.cursor()
     cursor.execute('''
-    CREATE TABLE IF NOT EXISTS GameHistory (
-        game_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER,
-        category_id INTEGER,
-        total_points INTEGER,
-        correct_answers INTEGER,
-        total_questions INTEGER,
-        date_played TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES Users (user_id),
-        FOREIGN KEY (category_id) REFERENCES Categories (category_id)
+    SELECT question_id
+    FROM Questions
+    WHERE category_id = ?
+    ORDER BY question_id
+    ''', (category_id,))
+
+    question_ids = [row[0] for row in cursor]
+
+    cursor.close()
+    return question_ids
+
+
+# Кэш ID вопросов по категориям для случайной выборки за O(k).
+# Сбрасывается функциями, меняющими набор вопросов категории.
+_sampler = QuestionSampler(_load_question_ids)
+
+# Кэш рубрик и вопросов с ответами. Ключи: ('categories',) и ('question', question_id).
+# Сбрасывается функциями, изменяющими эти данные.
+_cache = QueryCache(QUERY_CACHE_MAX_BYTES)
+
+
+def configure_database(db_path=None, profile=None, pragmas=None, cached_statements=None, cache_max_bytes=None):
+    """
+    Переключает модуль на другую базу данных и/или меняет параметры соединений
+
+    Args:
+        db_path (str, optional): Путь к файлу базы данных
+        profile (str, optional): Профиль хранения ("safe", "balanced", "fast")
+        pragmas (dict, optional): Дополнительные PRAGMA, переопределяющие профиль
+        cached_statements (int, optional): Размер кэша подготовленных выражений
+        cache_max_bytes (int, optional): Бюджет памяти кэша запросов (0 - без кэша)
+    """
+    global DB_PATH, _connections
+
+    _connections.close_all()
+    atexit.unregister(_connections.close_all)
+
+    if db_path is not None:
+        DB_PATH = db_path
+
+    new_pragmas = get_storage_pragmas(profile) if profile is not None else dict(_connections.pragmas)
+    new_pragmas.update(pragmas or {})
+
+    _connections = ConnectionManager(
+        DB_PATH,
+        pragmas=new_pragmas,
+        cached_statements=cached_statements or _connections.cached_statements,
+        functions=SQL_FUNCTIONS
     )
-    ''')
+    atexit.register(_connections.close_all)
+    _sampler.invalidate()
 
-    # Добавление стандартных категорий
-    default_categories = [
-        ('История', 'Вопросы об исторических событиях и личностях'),
-        ('Наука', 'Вопросы о научных открытиях и явлениях'),
-        ('Культура', 'Вопросы о искусстве, литературе и музыке'),
-        ('Спорт', 'Вопросы о спортивных событиях и достижениях')
-    ]
+    if cache_max_bytes is not None:
+        _cache.max_bytes = cache_max_bytes
+    _cache.invalidate()
 
-    cursor.executemany('''
-    INSERT OR IGNORE INTO Categories (name, description) 
-    SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM Categories WHERE name = ?)
-    ''', [(c[0], c[1], c[0]) for c in default_categories])
 
-    # Добавление тестовых вопросов для каждой категории
-    populate_test_questions(cursor)
+def get_cache_stats():
+    """
+    Возвращает счетчики кэша запросов (для подбора QUERY_CACHE_MAX_BYTES)
 
-    conn.commit()
-    conn.close()
+    Returns:
+        dict: hits, misses, hit_rate, evictions, entries, size_bytes, max_bytes
+    """
+    return _cache.stats()
 
 
-def populate_test_questions(cursor):
-    """Заполняет базу данных тестовыми вопросами"""
-    # Получаем ID категорий
-    cursor.execute("SELECT category_id, name FROM Categories")
-    categories = cursor.fetchall()
+def close_database():
+    """Закрывает все соединения с базой данных"""
+    _connections.close_all()
 
-    for cat_id, cat_name in categories:
-        # Примеры вопросов для каждой категории (в реальном приложении здесь будет больше вопросов)
-        if cat_name == "История":
-            add_question_with_answers(cursor, cat_id, "В каком году началась Вторая мировая война?",
-                                      ["1937", "1939", "1941", "1940"], 1, 30, 1.0)
-            add_question_with_answers(cursor, cat_id, "Кто был первым президентом США?",
-                                      ["Джордж Вашингтон", "Томас Джефферсон", "Авраам Линкольн", "Франклин Рузвельт"],
-                                      0, 20, 1.0)
-        elif cat_name == "Наука":
-            add_question_with_answers(cursor, cat_id, "Что измеряется в Ньютонах?",
-                                      ["Масса", "Скорость", "Сила", "Ускорение"], 2, 25, 1.0)
-            add_question_with_answers(cursor, cat_id, "Какой химический элемент имеет символ 'O'?",
-                                      ["Золото", "Кислород", "Осмий", "Олово"], 1, 15, 1.0)
-        elif cat_name == "Культура":
-            add_question_with_answers(cursor, cat_id, "Кто написал 'Войну и мир'?",
-                                      ["Федор Достоевский", "Лев Толстой", "Антон Чехов", "Иван Тургенев"], 1, 20, 1.0)
-            add_question_with_answers(cursor, cat_id, "В каком городе находится Лувр?",
-                                      ["Лондон", "Рим", "Париж", "Мадрид"], 2, 15, 1.0)
-        elif cat_name == "Спорт":
-            add_question_with_answers(cursor, cat_id, "Сколько игроков в команде по футболу?",
-                                      ["9", "10", "11", "12"], 2, 15, 1.0)
-            add_question_with_answers(cursor, cat_id, "В каком году прошли первые современные Олимпийские игры?",
-                                      ["1886", "1896", "1900", "1904"], 1, 30, 1.5)
-
-
-def add_question_with_answers(cursor, category_id, question_text, answers, correct_index, time_limit, difficulty):
-    """Добавляет вопрос и соответствующие ответы в базу данных"""
-    cursor.execute('''
-    INSERT INTO Questions (category_id, question_text, time_limit, difficulty_level)
-    VALUES (?, ?, ?, ?)
-    ''', (category_id, question_text, time_limit, difficulty))
 
-    question_id = cursor.lastrowid
+def initialize_database():
+    """Инициализирует базу данных при первом запуске приложения"""
+    # Создание и обновление схемы (если схема актуальна - одно чтение PRAGMA user_version)
+    run_migrations(_connections)
 
-    for i, answer_text in enumerate(answers):
-        is_correct = 1 if i == correct_index else 0
-        cursor.execute('''
-        INSERT INTO Answers (question_id, answer_text, is_correct)
-        VALUES (?, ?, ?)
-        ''', (question_id, answer_text, is_correct))
+    # Стандартные категории и тестовые вопросы добавляются миграцией один раз
+    _sampler.invalidate()
+    _cache.invalidate()
 
 
 def check_user_exists():
     """Проверяет, существует ли хотя бы один пользователь в базе данных"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    cursor = _connections.cursor()
 
     cursor.execute("SELECT COUNT(*) FROM Users")
     count = cursor.fetchone()[0]
 
-    conn.close()
+    cursor.close()
     return count > 0
 
 
 def create_user(username, avatar_path):
     """Создает нового пользователя и возвращает его ID"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute('''
-    INSERT INTO Users (username, avatar_path)
-    VALUES (?, ?)
-    ''', (username, avatar_path))
-
-    user_id = cursor.lastrowid
+    with _connections.transaction() as cursor:
+        cursor.execute('''
+        INSERT INTO Users (username, avatar_path)
+        VALUES (?, ?)
+        ''', (username, avatar_path))
 
-    conn.commit()
-    conn.close()
+        user_id = cursor.lastrowid
 
-    return user_id
+        return user_id
 
 
 def get_user_info(user_id):
     """Возвращает информацию о пользователе по ID"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    cursor = _connections.cursor()
 
     cursor.execute('''
     SELECT user_id, username, avatar_path, date_created
@@ -178,223 +166,577 @@ def get_user_info(user_id):
 
     user_info = cursor.fetchone()
 
-    conn.close()
+    cursor.close()
     return user_info
 
 
 def update_user_profile(user_id, username, avatar_path):
     """Обновляет профиль пользователя"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute('''
-    UPDATE Users
-    SET username = ?, avatar_path = ?
-    WHERE user_id = ?
-    ''', (username, avatar_path, user_id))
-
-    conn.commit()
-    conn.close()
+    with _connections.transaction() as cursor:
+        cursor.execute('''
+        UPDATE Users
+        SET username = ?, avatar_path = ?
+        WHERE user_id = ?
+        ''', (username, avatar_path, user_id))
 
 
-def get_all_categories():
-    """Возвращает список всех категорий"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def _load_categories():
+    """Читает список рубрик из базы данных"""
+    cursor = _connections.cursor()
 
     cursor.execute('''
     SELECT category_id, name, description
     FROM Categories
+    WHERE is_deleted = 0
     ORDER BY name
     ''')
 
     categories = cursor.fetchall()
 
-    conn.close()
+    cursor.close()
     return categories
 
 
-def get_questions_for_category(category_id, limit=10):
-    """Возвращает вопросы для выбранной категории"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def get_all_categories():
+    """Возвращает список всех категорий (кроме удаленных)"""
+    # Копия списка: вызывающий код может его изменять, а кэш - нет
+    return list(_cache.get_or_load(('categories',), _load_categories))
 
-    cursor.execute('''
+
+def _make_rng(seed):
+    """Возвращает генератор случайных чисел: общий или с заданным зерном"""
+    return random if seed is None else random.Random(seed)
+
+
+def get_questions_for_category(category_id, limit=10, seed=None):
+    """
+    Возвращает случайные вопросы для выбранной категории
+
+    Args:
+        category_id (int): ID категории
+        limit (int, optional): Количество вопросов. По умолчанию 10.
+        seed (int, optional): Зерно генератора для воспроизводимой выборки
+
+    Returns:
+        list: Список Question (без ответов)
+    """
+    question_ids = _sampler.sample(category_id, limit, _make_rng(seed))
+    if not question_ids:
+        return []
+
+    cursor = _connections.cursor()
+    cursor.row_factory = question_row_factory
+
+    placeholders = ', '.join('?' * len(question_ids))
+    cursor.execute(f'''
     SELECT question_id, category_id, question_text, time_limit, difficulty_level
     FROM Questions
-    WHERE category_id = ?
-    ORDER BY RANDOM()
-    LIMIT ?
-    ''', (category_id, limit))
+    WHERE question_id IN ({placeholders})
+    ''', question_ids)
+
+    questions = {question.question_id: question for question in cursor}
 
-    questions = cursor.fetchall()
+    cursor.close()
+
+    # Сохраняем случайный порядок выборки
+    return [questions[question_id] for question_id in question_ids if question_id in questions]
+
+
+def _get_questions(question_ids):
+    """
+    Возвращает вопросы с ответами, читая из базы только отсутствующие в кэше
+
+    Args:
+        question_ids (list): ID вопросов
+
+    Returns:
+        dict: {question_id: Question} с ответами в порядке answer_id.
+            Несуществующие вопросы в словарь не попадают.
+    """
+    questions = {}
+    missing = []
+    generation = _cache.generation
+    for question_id in question_ids:
+        question = _cache.get(('question', question_id))
+        if question is None:
+            missing.append(question_id)
+        else:
+            questions[question_id] = question
+
+    if not missing:
+        return questions
+
+    cursor = _connections.cursor()
+
+    placeholders = ', '.join('?' * len(missing))
+    cursor.execute(f'''
+    SELECT q.question_id, q.category_id, q.question_text, q.time_limit, q.difficulty_level,
+           a.answer_id, a.answer_text, a.is_correct
+    FROM Questions q
+    LEFT JOIN Answers a ON a.question_id = q.question_id
+    WHERE q.question_id IN ({placeholders})
+    ORDER BY a.answer_id
+    ''', missing)
+
+    rows = {}
+    answers = {}
+    for question_id, cat_id, question_text, time_limit, difficulty, answer_id, answer_text, is_correct in cursor:
+        if question_id not in rows:
+            rows[question_id] = (question_id, cat_id, question_text, time_limit, difficulty)
+            answers[question_id] = []
+        if answer_id is not None:
+            answers[question_id].append(Answer(answer_id, question_id, answer_text, bool(is_correct)))
+
+    cursor.close()
+
+    for question_id, row in rows.items():
+        question = Question(*row, tuple(answers[question_id]))
+        _cache.put(('question', question_id), question, generation)
+        questions[question_id] = question
 
-    conn.close()
     return questions
 
 
 def get_answers_for_question(question_id):
-    """Возвращает варианты ответов для вопроса"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    """Возвращает варианты ответов (список Answer) для вопроса в случайном порядке"""
+    question = _get_questions([question_id]).get(question_id)
+    if question is None:
+        return []
 
-    cursor.execute('''
-    SELECT answer_id, question_id, answer_text, is_correct
-    FROM Answers
-    WHERE question_id = ?
-    ORDER BY RANDOM()
-    ''', (question_id,))
+    answers = list(question.answers)
+    random.shuffle(answers)
+    return answers
 
-    answers = cursor.fetchall()
 
-    conn.close()
-    return answers
+def load_round(category_id, n=10, seed=None):
+    """
+    Загружает вопросы раунда вместе с ответами (отсутствующие в кэше - одним запросом)
 
+    Args:
+        category_id (int): ID категории
+        n (int, optional): Количество вопросов. По умолчанию 10.
+        seed (int, optional): Зерно генератора для воспроизводимого раунда
 
-def save_game_results(user_id, category_id, total_points, correct_answers, total_questions):
-    """Сохраняет результаты игры"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    Returns:
+        Round: Вопросы в случайном порядке с перемешанными ответами
+    """
+    rng = _make_rng(seed)
+    question_ids = _sampler.sample(category_id, n, rng)
+    if not question_ids:
+        return Round(category_id, [], seed)
 
-    cursor.execute('''
-    INSERT INTO GameHistory (user_id, category_id, total_points, correct_answers, total_questions)
-    VALUES (?, ?, ?, ?, ?)
-    ''', (user_id, category_id, total_points, correct_answers, total_questions))
+    questions = _get_questions(question_ids)
+
+    # Порядок вопросов задает выборка; вопросы, удаленные после построения кэша,
+    # и вопросы без ответов пропускаются
+    round_questions = []
+    for question_id in question_ids:
+        question = questions.get(question_id)
+        if question is None or not question.answers:
+            continue
+
+        # Вопрос из кэша не изменяется: перемешанные ответы - в новом экземпляре
+        answers = list(question.answers)
+        rng.shuffle(answers)
+        round_questions.append(replace(question, answers=tuple(answers)))
 
-    conn.commit()
-    conn.close()
+    return Round(category_id, round_questions, seed)
+
+
+def save_game_results(user_id, category_id, total_points, correct_answers, total_questions):
+    """Сохраняет результаты игры и обновляет сводную статистику в той же транзакции"""
+    with _connections.transaction() as cursor:
+        cursor.execute('''
+        INSERT INTO GameHistory (user_id, category_id, total_points, correct_answers, total_questions)
+        VALUES (?, ?, ?, ?, ?)
+        ''', (user_id, category_id, total_points, correct_answers, total_questions))
+
+        # Общая статистика пользователя
+        cursor.execute('''
+        INSERT INTO UserStats (user_id, total_games, total_points, total_correct, total_questions, best_score)
+        VALUES (?, 1, ?, ?, ?, ?)
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_games = total_games + 1,
+            total_points = total_points + excluded.total_points,
+            total_correct = total_correct + excluded.total_correct,
+            total_questions = total_questions + excluded.total_questions,
+            best_score = MAX(best_score, excluded.best_score)
+        ''', (user_id, total_points, correct_answers, total_questions, total_points))
+
+        # Статистика пользователя по категории
+        cursor.execute('''
+        INSERT INTO UserCategoryStats (user_id, category_id, games_played, total_points, total_correct, total_questions)
+        VALUES (?, ?, 1, ?, ?, ?)
+        ON CONFLICT (user_id, category_id) DO UPDATE SET
+            games_played = games_played + 1,
+            total_points = total_points + excluded.total_points,
+            total_correct = total_correct + excluded.total_correct,
+            total_questions = total_questions + excluded.total_questions
+        ''', (user_id, category_id, total_points, correct_answers, total_questions))
 
 
 def get_user_statistics(user_id):
-    """Возвращает статистику пользователя"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    """Возвращает статистику пользователя (из сводных таблиц, без пересчета истории)"""
+    with _connections.transaction() as cursor:
+        # Общая статистика
+        cursor.execute('''
+        SELECT total_games, total_points, total_correct, total_questions, best_score
+        FROM UserStats
+        WHERE user_id = ?
+        ''', (user_id,))
+
+        general_stats = cursor.fetchone()
+
+        if general_stats is None:
+            # Возвращаем структуру с пустыми значениями
+            return {
+                'general': (0, 0, 0, 0, 0),
+                'categories': [],
+                'recent_games': []
+            }
+
+        # Статистика по категориям
+        cursor.execute('''
+        SELECT c.name, ucs.games_played, ucs.total_points, ucs.total_correct, ucs.total_questions
+        FROM UserCategoryStats ucs
+        JOIN Categories c ON ucs.category_id = c.category_id
+        WHERE ucs.user_id = ?
+        ORDER BY ucs.total_points DESC
+        ''', (user_id,))
+
+        category_stats = cursor.fetchall()
 
-    # Проверяем, есть ли у пользователя какие-либо игры
-    cursor.execute("SELECT COUNT(*) FROM GameHistory WHERE user_id = ?", (user_id,))
-    games_count = cursor.fetchone()[0]
+        # Последние игры (покрывающий индекс idx_game_history_user_date, читаются только 5 записей)
+        cursor.execute('''
+        SELECT gh.game_id, c.name, gh.total_points, gh.correct_answers, gh.total_questions, gh.date_played
+        FROM GameHistory gh
+        JOIN Categories c ON gh.category_id = c.category_id
+        WHERE gh.user_id = ?
+        ORDER BY gh.date_played DESC
+        LIMIT 5
+        ''', (user_id,))
+
+        recent_games = cursor.fetchall()
 
-    if games_count == 0:
-        conn.close()
-        # Возвращаем структуру с пустыми значениями
         return {
-            'general': (0, 0, 0, 0, 0),
-            'categories': [],
-            'recent_games': []
+            'general': general_stats,
+            'categories': category_stats,
+            'recent_games': recent_games
         }
 
-    # Общая статистика
-    cursor.execute('''
-    SELECT COUNT(*) as total_games,
-           SUM(total_points) as total_points,
-           SUM(correct_answers) as total_correct,
-           SUM(total_questions) as total_questions,
-           MAX(total_points) as best_score
-    FROM GameHistory
-    WHERE user_id = ?
-    ''', (user_id,))
 
-    general_stats = cursor.fetchone()
+def rebuild_user_statistics():
+    """Пересчитывает сводную статистику всех пользователей по истории игр"""
+    with _connections.transaction(immediate=True) as cursor:
+        rebuild_stats_tables(cursor)
 
-    # Статистика по категориям
-    cursor.execute('''
-    SELECT c.name,
-           COUNT(*) as games_played,
-           SUM(gh.total_points) as category_points,
-           SUM(gh.correct_answers) as category_correct,
-           SUM(gh.total_questions) as category_questions
-    FROM GameHistory gh
-    JOIN Categories c ON gh.category_id = c.category_id
-    WHERE gh.user_id = ?
-    GROUP BY gh.category_id
-    ORDER BY category_points DESC
-    ''', (user_id,))
 
-    category_stats = cursor.fetchall()
+def verify_user_statistics():
+    """
+    Сверяет сводную статистику с пересчетом по истории игр
+
+    Returns:
+        list: Расхождения в виде кортежей (таблица, ключ); пустой список, если все совпадает
+    """
+    with _connections.transaction() as cursor:
+        mismatches = []
+
+        # Строки, которые есть только в одной из сторон, или с разными значениями
+        cursor.execute('''
+        WITH expected AS (
+            SELECT user_id,
+                   COUNT(*) AS total_games,
+                   COALESCE(SUM(total_points), 0) AS total_points,
+                   COALESCE(SUM(correct_answers), 0) AS total_correct,
+                   COALESCE(SUM(total_questions), 0) AS total_questions,
+                   COALESCE(MAX(total_points), 0) AS best_score
+            FROM GameHistory
+            WHERE user_id IS NOT NULL
+            GROUP BY user_id
+        ),
+        actual AS (
+            SELECT user_id, total_games, total_points, total_correct, total_questions, best_score
+            FROM UserStats
+        )
+        SELECT user_id FROM (SELECT * FROM expected EXCEPT SELECT * FROM actual)
+        UNION
+        SELECT user_id FROM (SELECT * FROM actual EXCEPT SELECT * FROM expected)
+        ''')
+        mismatches.extend(('UserStats', (user_id,)) for user_id, in cursor.fetchall())
+
+        cursor.execute('''
+        WITH expected AS (
+            SELECT user_id,
+                   category_id,
+                   COUNT(*) AS games_played,
+                   COALESCE(SUM(total_points), 0) AS total_points,
+                   COALESCE(SUM(correct_answers), 0) AS total_correct,
+                   COALESCE(SUM(total_questions), 0) AS total_questions
+            FROM GameHistory
+            WHERE user_id IS NOT NULL AND category_id IS NOT NULL
+            GROUP BY user_id, category_id
+        ),
+        actual AS (
+            SELECT user_id, category_id, games_played, total_points, total_correct, total_questions
+            FROM UserCategoryStats
+        )
+        SELECT user_id, category_id FROM (SELECT * FROM expected EXCEPT SELECT * FROM actual)
+        UNION
+        SELECT user_id, category_id FROM (SELECT * FROM actual EXCEPT SELECT * FROM expected)
+        ''')
+        mismatches.extend(('UserCategoryStats', key) for key in cursor.fetchall())
+
+        return mismatches
+
+
+def iter_question_bank(fetch_size=1000):
+    """
+    Потоково перебирает все вопросы с ответами (для экспорта)
+
+    Строки читаются порциями через fetchmany в порядке question_id,
+    поэтому память не зависит от размера банка вопросов.
+
+    Args:
+        fetch_size (int, optional): Количество строк в одной порции
+
+    Yields:
+        tuple: (question_id, category_name, question_text, time_limit, difficulty_level, answers),
+            где answers - список кортежей (answer_text, is_correct)
+    """
+    cursor = _connections.connection().cursor()
+    cursor.arraysize = fetch_size
+
+    try:
+        cursor.execute('''
+        SELECT q.question_id, c.name, q.question_text, q.time_limit, q.difficulty_level,
+               a.answer_text, a.is_correct
+        FROM Questions q
+        LEFT JOIN Categories c ON c.category_id = q.category_id
+        JOIN Answers a ON a.question_id = q.question_id
+        ORDER BY q.question_id, a.answer_id
+        ''')
+
+        current = None
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+
+            for question_id, category_name, question_text, time_limit, difficulty, answer_text, is_correct in rows:
+                if current is None or current[0] != question_id:
+                    if current is not None:
+                        yield current
+                    current = (question_id, category_name, question_text, time_limit, difficulty, [])
+                current[5].append((answer_text, bool(is_correct)))
+
+        if current is not None:
+            yield current
+    finally:
+        cursor.close()
+
+
+def get_max_answer_count():
+    """Возвращает наибольшее количество вариантов ответа у одного вопроса"""
+    cursor = _connections.cursor()
 
-    # Последние игры
     cursor.execute('''
-    SELECT gh.game_id, c.name, gh.total_points, gh.correct_answers, gh.total_questions, gh.date_played
-    FROM GameHistory gh
-    JOIN Categories c ON gh.category_id = c.category_id
-    WHERE gh.user_id = ?
-    ORDER BY gh.date_played DESC
-    LIMIT 5
-    ''', (user_id,))
+    SELECT COALESCE(MAX(answer_count), 0)
+    FROM (SELECT COUNT(*) AS answer_count FROM Answers GROUP BY question_id)
+    ''')
+    max_count = cursor.fetchone()[0]
 
-    recent_games = cursor.fetchall()
+    cursor.close()
+    return max_count
 
-    conn.close()
 
-    return {
-        'general': general_stats,
-        'categories': category_stats,
-        'recent_games': recent_games
-    }
+def iter_game_history(fetch_size=1000):
+    """
+    Потоково перебирает историю игр (для экспорта)
 
+    Args:
+        fetch_size (int, optional): Количество строк в одной порции
 
-def add_category(name, description):
-    """Adds a new category to the database"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    Yields:
+        tuple: (game_id, user_id, username, category_name, total_points,
+            correct_answers, total_questions, date_played)
+    """
+    cursor = _connections.connection().cursor()
+    cursor.arraysize = fetch_size
+
+    try:
+        cursor.execute('''
+        SELECT gh.game_id, gh.user_id, u.username, c.name,
+               gh.total_points, gh.correct_answers, gh.total_questions, gh.date_played
+        FROM GameHistory gh
+        LEFT JOIN Users u ON u.user_id = gh.user_id
+        LEFT JOIN Categories c ON c.category_id = gh.category_id
+        ORDER BY gh.game_id
+        ''')
+
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def get_questions_page(category_id, after_id=0, page_size=200):
+    """
+    Возвращает страницу вопросов категории в порядке question_id
+
+    Постраничная выборка по ключу: следующая страница начинается после последнего
+    ID предыдущей, поэтому любая страница читается диапазоном индекса, как бы
+    далеко ни был прокручен список.
+
+    Args:
+        category_id (int): ID категории
+        after_id (int, optional): Последний question_id предыдущей страницы (0 - первая страница)
+        page_size (int, optional): Максимальное количество вопросов на странице. По умолчанию 200.
+
+    Returns:
+        list: Вопросы страницы (Question без ответов)
+    """
+    cursor = _connections.cursor()
+    cursor.row_factory = question_row_factory
 
     cursor.execute('''
-    INSERT INTO Categories (name, description)
-    VALUES (?, ?)
-    ''', (name, description))
+    SELECT question_id, category_id, question_text, time_limit, difficulty_level
+    FROM Questions
+    WHERE category_id = ? AND question_id > ?
+    ORDER BY question_id
+    LIMIT ?
+    ''', (category_id, after_id, page_size))
+
+    page = cursor.fetchall()
+
+    cursor.close()
+    return page
+
+
+def rebuild_question_search():
+    """Заполняет полнотекстовый индекс заново по таблицам вопросов и ответов"""
+    with _connections.transaction(immediate=True) as cursor:
+        rebuild_search_index(cursor)
 
-    category_id = cursor.lastrowid
 
-    conn.commit()
-    conn.close()
+def _build_search_query(text):
+    """Превращает строку поиска в запрос FTS5: каждое слово ищется как префикс, нужны все слова"""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
 
+
+def search_questions(text, category_id=None, limit=50, highlight=('[', ']')):
+    """
+    Полнотекстовый поиск по текстам вопросов и ответов
+
+    Args:
+        text (str): Строка поиска; каждое слово ищется как префикс
+        category_id (int, optional): ID категории, которой ограничивается поиск.
+            По умолчанию ищется во всех категориях.
+        limit (int, optional): Максимальное количество результатов. По умолчанию 50.
+        highlight (tuple, optional): Маркеры начала и конца найденных слов во фрагментах
+
+    Returns:
+        list: Кортежи (Question без ответов, текст вопроса с выделенными словами,
+            фрагмент текста ответов), лучшие совпадения первыми
+    """
+    query = _build_search_query(text)
+    if not query:
+        return []
+
+    start, end = highlight
+    params = [start, end, start, end, query]
+    category_filter = ''
+    if category_id is not None:
+        category_filter = 'AND q.category_id = ?'
+        params.append(category_id)
+    params.append(limit)
+
+    cursor = _connections.cursor()
+
+    # Совпадение в тексте вопроса весит больше, чем совпадение в ответах
+    cursor.execute(f'''
+    SELECT q.question_id, q.category_id, q.question_text, q.time_limit, q.difficulty_level,
+           highlight(QuestionSearch, 0, ?, ?),
+           snippet(QuestionSearch, 1, ?, ?, '...', 8)
+    FROM QuestionSearch
+    JOIN Questions q ON q.question_id = QuestionSearch.rowid
+    WHERE QuestionSearch MATCH ? {category_filter}
+    ORDER BY bm25(QuestionSearch, 2.0, 1.0)
+    LIMIT ?
+    ''', params)
+
+    results = [(Question(*row[:5]), row[5], row[6]) for row in cursor]
+
+    cursor.close()
+    return results
+
+
+def add_category(name, description):
+    """Adds a new category to the database"""
+    with _connections.transaction() as cursor:
+        cursor.execute('''
+        INSERT INTO Categories (name, description)
+        VALUES (?, ?)
+        ''', (name, description))
+
+        category_id = cursor.lastrowid
+
+    _cache.invalidate('categories')
     return category_id
 
 
 def update_category(category_id, name, description):
     """Updates an existing category"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute('''
-    UPDATE Categories
-    SET name = ?, description = ?
-    WHERE category_id = ?
-    ''', (name, description, category_id))
+    with _connections.transaction() as cursor:
+        cursor.execute('''
+        UPDATE Categories
+        SET name = ?, description = ?
+        WHERE category_id = ?
+        ''', (name, description, category_id))
 
-    conn.commit()
-    conn.close()
+        updated = cursor.rowcount > 0
 
-    return cursor.rowcount > 0
+    _cache.invalidate('categories')
+    return updated
 
 
 def delete_category(category_id):
-    """Deletes a category and its associated questions"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    """
+    Deletes a category's questions and marks the category as deleted
 
-    # First delete associated answers
-    cursor.execute('''
-    DELETE FROM Answers 
-    WHERE question_id IN (SELECT question_id FROM Questions WHERE category_id = ?)
-    ''', (category_id,))
+    Answers go with their questions through ON DELETE CASCADE. The category row
+    itself is kept (soft delete), so game history and statistics keep its name.
+    """
+    with _connections.transaction() as cursor:
+        cursor.execute('''
+        UPDATE Categories
+        SET is_deleted = 1
+        WHERE category_id = ? AND is_deleted = 0
+        ''', (category_id,))
 
-    # Then delete the questions
-    cursor.execute('''
-    DELETE FROM Questions
-    WHERE category_id = ?
-    ''', (category_id,))
+        deleted = cursor.rowcount > 0
 
-    # Finally delete the category
-    cursor.execute('''
-    DELETE FROM Categories
-    WHERE category_id = ?
-    ''', (category_id,))
+        # Search index rows are removed in bulk instead of by a trigger per question and answer
+        cursor.execute("INSERT INTO SearchIndexPause (paused) VALUES (1)")
+        cursor.execute('''
+        DELETE FROM QuestionSearch
+        WHERE rowid IN (SELECT question_id FROM Questions WHERE category_id = ?)
+        ''', (category_id,))
+
+        cursor.execute('''
+        DELETE FROM Questions
+        WHERE category_id = ?
+        ''', (category_id,))
 
-    conn.commit()
-    conn.close()
+        cursor.execute("DELETE FROM SearchIndexPause")
 
-    return cursor.rowcount > 0
+    _sampler.invalidate(category_id)
+    _cache.invalidate('categories')
+    _cache.invalidate('question')
+    return deleted
 
 
 def add_question(category_id, question_text, time_limit, difficulty_level, answers):
@@ -408,82 +750,291 @@ def add_question(category_id, question_text, time_limit, difficulty_level, answe
         difficulty_level: Difficulty level (1.0-2.0)
         answers: List of tuples (answer_text, is_correct)
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with _connections.transaction() as cursor:
+        # Add the question
+        cursor.execute('''
+        INSERT INTO Questions (category_id, question_text, time_limit, difficulty_level, content_hash)
+        VALUES (?, ?, ?, ?, ?)
+        ''', (category_id, question_text, time_limit, difficulty_level,
+              question_hash(category_id, question_text)))
 
-    # Add the question
-    cursor.execute('''
-    INSERT INTO Questions (category_id, question_text, time_limit, difficulty_level)
-    VALUES (?, ?, ?, ?)
-    ''', (category_id, question_text, time_limit, difficulty_level))
+        question_id = cursor.lastrowid
 
-    question_id = cursor.lastrowid
+        # Add the answers
+        for answer_text, is_correct in answers:
+            cursor.execute('''
+            INSERT INTO Answers (question_id, answer_text, is_correct)
+            VALUES (?, ?, ?)
+            ''', (question_id, answer_text, 1 if is_correct else 0))
+
+    _sampler.invalidate(category_id)
+    return question_id
 
-    # Add the answers
-    for answer_text, is_correct in answers:
+
+def add_questions_batch(questions):
+    """
+    Adds many questions with their answers in one transaction (bulk import)
+
+    Question ids are allocated up front under the write lock, so both tables
+    are filled with executemany instead of one INSERT per row.
+
+    Args:
+        questions: List of tuples (category_id, question_text, time_limit, difficulty_level, answers),
+            where answers is a list of tuples (answer_text, is_correct)
+
+    Returns:
+        int: Number of added questions (duplicates of existing questions are skipped)
+    """
+    if not questions:
+        return 0
+
+    question_rows = []
+    answer_rows = []
+    categories = set()
+
+    with _connections.transaction(immediate=True) as cursor:
+        # Next free id, respecting AUTOINCREMENT history of deleted rows
         cursor.execute('''
+        SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'Questions'), 0),
+                   COALESCE((SELECT MAX(question_id) FROM Questions), 0))
+        ''')
+        next_id = cursor.fetchone()[0] + 1
+
+        for question_id, (category_id, question_text, time_limit, difficulty_level, answers) in enumerate(
+                questions, start=next_id):
+            question_rows.append((question_id, category_id, question_text, time_limit, difficulty_level,
+                                  question_hash(category_id, question_text)))
+            answer_rows.extend((question_id, answer_text, 1 if is_correct else 0, question_id)
+                               for answer_text, is_correct in answers)
+            categories.add(category_id)
+
+        # Search index triggers are paused and the index is filled in bulk below;
+        # the pause never becomes visible outside this transaction
+        cursor.execute("INSERT INTO SearchIndexPause (paused) VALUES (1)")
+
+        # Questions already in the bank (same content hash) are skipped
+        cursor.executemany('''
+        INSERT OR IGNORE INTO Questions
+            (question_id, category_id, question_text, time_limit, difficulty_level, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', question_rows)
+        inserted = cursor.rowcount
+
+        # Answers only for the questions that were actually inserted
+        cursor.executemany('''
         INSERT INTO Answers (question_id, answer_text, is_correct)
-        VALUES (?, ?, ?)
-        ''', (question_id, answer_text, 1 if is_correct else 0))
+        SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM Questions WHERE question_id = ?)
+        ''', answer_rows)
 
-    conn.commit()
-    conn.close()
+        cursor.execute('''
+        INSERT INTO QuestionSearch (rowid, question_text, answers_text)
+        SELECT q.question_id, q.question_text, group_concat(a.answer_text, ' ')
+        FROM Questions q
+        LEFT JOIN Answers a ON a.question_id = q.question_id
+        WHERE q.question_id >= ?
+        GROUP BY q.question_id
+        ''', (next_id,))
 
-    return question_id
+        cursor.execute("DELETE FROM SearchIndexPause")
+
+    if inserted:
+        for category_id in categories:
+            _sampler.invalidate(category_id)
+    return inserted
 
 
 def update_question(question_id, question_text, time_limit, difficulty_level):
     """Updates an existing question"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute('''
-    UPDATE Questions
-    SET question_text = ?, time_limit = ?, difficulty_level = ?
-    WHERE question_id = ?
-    ''', (question_text, time_limit, difficulty_level, question_id))
+    with _connections.transaction() as cursor:
+        cursor.execute('''
+        UPDATE Questions
+        SET question_text = ?, time_limit = ?, difficulty_level = ?,
+            content_hash = question_hash(category_id, ?)
+        WHERE question_id = ?
+        ''', (question_text, time_limit, difficulty_level, question_text, question_id))
 
-    conn.commit()
-    conn.close()
+        updated = cursor.rowcount > 0
 
-    return cursor.rowcount > 0
+    _cache.invalidate('question', question_id)
+    return updated
 
 
 def update_answer(answer_id, answer_text, is_correct):
     """Updates an existing answer"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with _connections.transaction() as cursor:
+        cursor.execute('''
+        UPDATE Answers
+        SET answer_text = ?, is_correct = ?
+        WHERE answer_id = ?
+        ''', (answer_text, 1 if is_correct else 0, answer_id))
 
-    cursor.execute('''
-    UPDATE Answers
-    SET answer_text = ?, is_correct = ?
-    WHERE answer_id = ?
-    ''', (answer_text, 1 if is_correct else 0, answer_id))
+        updated = cursor.rowcount > 0
 
-    conn.commit()
-    conn.close()
+        cursor.execute("SELECT question_id FROM Answers WHERE answer_id = ?", (answer_id,))
+        row = cursor.fetchone()
 
-    return cursor.rowcount > 0
+    if row:
+        _cache.invalidate('question', row[0])
+    return updated
 
 
-def delete_question(question_id):
-    """Deletes a question and its associated answers"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def save_question_bundle(question_id, category_id, question_text, time_limit, difficulty_level, answers):
+    """
+    Adds or updates a question together with all its answers in one transaction
 
-    # First delete the answers
-    cursor.execute('''
-    DELETE FROM Answers
-    WHERE question_id = ?
-    ''', (question_id,))
+    Answers with an id are updated, answers without an id are added, and the
+    question's stored answers missing from the list are deleted.
 
-    # Then delete the question
-    cursor.execute('''
-    DELETE FROM Questions
-    WHERE question_id = ?
-    ''', (question_id,))
+    Args:
+        question_id: ID of the question to update, or None to add a new question
+        category_id: ID of the category (the question is moved if it changed)
+        question_text: Text of the question
+        time_limit: Time limit in seconds
+        difficulty_level: Difficulty level (1.0-2.0)
+        answers: List of tuples (answer_id or None, answer_text, is_correct)
+
+    Returns:
+        int: ID of the saved question
+
+    Raises:
+        sqlite3.IntegrityError: If the category already has the same question
+        ValueError: If the question to update does not exist
+    """
+    categories = {category_id}
+
+    with _connections.transaction() as cursor:
+        content_hash = question_hash(category_id, question_text)
+
+        if question_id is None:
+            cursor.execute('''
+            INSERT INTO Questions (category_id, question_text, time_limit, difficulty_level, content_hash)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (category_id, question_text, time_limit, difficulty_level, content_hash))
+            question_id = cursor.lastrowid
+        else:
+            cursor.execute("SELECT category_id FROM Questions WHERE question_id = ?", (question_id,))
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"Question {question_id} does not exist")
+            categories.add(row[0])
+
+            cursor.execute('''
+            UPDATE Questions
+            SET category_id = ?, question_text = ?, time_limit = ?, difficulty_level = ?, content_hash = ?
+            WHERE question_id = ?
+            ''', (category_id, question_text, time_limit, difficulty_level, content_hash, question_id))
+
+        kept_ids = [answer_id for answer_id, _, _ in answers if answer_id is not None]
+        cursor.execute('''
+        DELETE FROM Answers
+        WHERE question_id = ? AND answer_id NOT IN (SELECT value FROM json_each(?))
+        ''', (question_id, json.dumps(kept_ids)))
+
+        cursor.executemany('''
+        UPDATE Answers
+        SET answer_text = ?, is_correct = ?
+        WHERE answer_id = ? AND question_id = ?
+        ''', [(answer_text, 1 if is_correct else 0, answer_id, question_id)
+              for answer_id, answer_text, is_correct in answers if answer_id is not None])
+
+        cursor.executemany('''
+        INSERT INTO Answers (question_id, answer_text, is_correct)
+        VALUES (?, ?, ?)
+        ''', [(question_id, answer_text, 1 if is_correct else 0)
+              for answer_id, answer_text, is_correct in answers if answer_id is None])
+
+    for changed_category_id in categories:
+        _sampler.invalidate(changed_category_id)
+    _cache.invalidate('question', question_id)
+    return question_id
+
+
+def _invalidate_cached_questions(question_ids, max_single=1000):
+    """Сбрасывает вопросы в кэше; при большом количестве пространство имен очищается целиком"""
+    if len(question_ids) > max_single:
+        _cache.invalidate('question')
+    else:
+        for question_id in question_ids:
+            _cache.invalidate('question', question_id)
+
+
+def update_questions_bulk(question_ids, category_id=None, time_limit=None, difficulty_level=None):
+    """
+    Changes the category, time limit and/or difficulty of many questions with one UPDATE
+
+    Fields left as None are not changed. The whole update is rolled back if moving
+    the questions would create a duplicate in the target category.
+
+    Args:
+        question_ids: IDs of the questions to change
+        category_id: New category ID
+        time_limit: New time limit in seconds
+        difficulty_level: New difficulty level (1.0-2.0)
+
+    Returns:
+        int: Number of updated questions
+
+    Raises:
+        sqlite3.IntegrityError: If the target category already has one of the questions
+    """
+    assignments = []
+    params = []
+    if category_id is not None:
+        # The content hash includes the category
+        assignments.append("category_id = ?, content_hash = question_hash(?, question_text)")
+        params.extend((category_id, category_id))
+    if time_limit is not None:
+        assignments.append("time_limit = ?")
+        params.append(time_limit)
+    if difficulty_level is not None:
+        assignments.append("difficulty_level = ?")
+        params.append(difficulty_level)
+
+    if not question_ids or not assignments:
+        return 0
+
+    # The id list is passed as one JSON parameter, so its size is not limited by SQLite variables
+    ids_json = json.dumps(list(question_ids))
+
+    with _connections.transaction() as cursor:
+        categories = set()
+        if category_id is not None:
+            cursor.execute('''
+            SELECT DISTINCT category_id FROM Questions
+            WHERE question_id IN (SELECT value FROM json_each(?))
+            ''', (ids_json,))
+            categories = {row[0] for row in cursor.fetchall()}
+            categories.add(category_id)
+
+        cursor.execute(f'''
+        UPDATE Questions
+        SET {', '.join(assignments)}
+        WHERE question_id IN (SELECT value FROM json_each(?))
+        ''', params + [ids_json])
+
+        updated = cursor.rowcount
+
+    for changed_category_id in categories:
+        _sampler.invalidate(changed_category_id)
+    _invalidate_cached_questions(question_ids)
+    return updated
+
+
+def delete_question(question_id):
+    """Удаляет вопрос; его ответы удаляются каскадно (ON DELETE CASCADE)"""
+    with _connections.transaction() as cursor:
+        # Запоминаем рубрику, чтобы сбросить ее кэш в выборщике вопросов
+        cursor.execute("SELECT category_id FROM Questions WHERE question_id = ?", (question_id,))
+        row = cursor.fetchone()
+
+        cursor.execute('''
+        DELETE FROM Questions
+        WHERE question_id = ?
+        ''', (question_id,))
 
-    conn.commit()
-    conn.close()
+        deleted = cursor.rowcount > 0
 
-    return cursor.rowcount > 0
\ No newline at end of file
+    if row:
+        _sampler.invalidate(row[0])
+    _cache.invalidate('question', question_id)
+    return deleted
\ No newline at end of file
@@ -0,0 +1,561 @@
+"""
+Версионные миграции схемы базы данных
+
+Текущая версия схемы хранится в PRAGMA user_version. Каждая миграция
+выполняется в отдельной транзакции вместе с повышением версии, поэтому
+существующие файлы quiz_game.db обновляются на месте без пересоздания.
+Новые изменения схемы добавляются в конец списка MIGRATIONS.
+"""
+import hashlib
+import sqlite3
+
+
+def question_hash(category_id, question_text):
+    """
+    Вычисляет хеш содержимого вопроса для поиска дубликатов
+
+    Текст нормализуется (регистр и пробелы не учитываются), результат -
+    64-битное целое со знаком, которое SQLite хранит как INTEGER.
+
+    Args:
+        category_id (int): ID категории
+        question_text (str): Текст вопроса
+
+    Returns:
+        int: Хеш вопроса
+    """
+    normalized = ' '.join(str(question_text).split()).casefold()
+    digest = hashlib.blake2b(f"{category_id}\x1f{normalized}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def _migration_base_schema(cursor):
+    """Базовая схема (таблицы, существовавшие до появления миграций)"""
+    # Создание таблицы пользователей
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS Users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL,
+        avatar_path TEXT,
+        date_created TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # Создание таблицы категорий
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS Categories (
+        category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        description TEXT
+    )
+    ''')
+
+    # Создание таблицы вопросов
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS Questions (
+        question_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category_id INTEGER,
+        question_text TEXT NOT NULL,
+        time_limit INTEGER DEFAULT 30,
+        difficulty_level REAL DEFAULT 1.0,
+        FOREIGN KEY (category_id) REFERENCES Categories (category_id)
+    )
+    ''')
+
+    # Создание таблицы ответов
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS Answers (
+        answer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        question_id INTEGER,
+        answer_text TEXT NOT NULL,
+        is_correct BOOLEAN NOT NULL CHECK (is_correct IN (0, 1)),
+        FOREIGN KEY (question_id) REFERENCES Questions (question_id)
+    )
+    ''')
+
+    # Создание таблицы истории игр
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS GameHistory (
+        game_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        category_id INTEGER,
+        total_points INTEGER,
+        correct_answers INTEGER,
+        total_questions INTEGER,
+        date_played TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES Users (user_id),
+        FOREIGN KEY (category_id) REFERENCES Categories (category_id)
+    )
+    ''')
+
+
+def _migration_secondary_indexes(cursor):
+    """Индексы для выборки вопросов, ответов и статистики пользователя"""
+    # get_questions_for_category: поиск по категории (rowid входит в индекс)
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_questions_category
+    ON Questions (category_id)
+    ''')
+
+    # get_answers_for_question
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_answers_question
+    ON Answers (question_id)
+    ''')
+
+    # get_user_statistics: покрывающий индекс, все три запроса читают только его
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_game_history_user_date
+    ON GameHistory (user_id, date_played, category_id, total_points, correct_answers, total_questions)
+    ''')
+
+
+def rebuild_stats_tables(cursor):
+    """
+    Пересчитывает сводные таблицы статистики UserStats и UserCategoryStats по GameHistory
+
+    Args:
+        cursor: Курсор SQLite внутри открытой транзакции
+    """
+    cursor.execute("DELETE FROM UserStats")
+    cursor.execute("DELETE FROM UserCategoryStats")
+
+    cursor.execute('''
+    INSERT INTO UserStats (user_id, total_games, total_points, total_correct, total_questions, best_score)
+    SELECT user_id,
+           COUNT(*),
+           COALESCE(SUM(total_points), 0),
+           COALESCE(SUM(correct_answers), 0),
+           COALESCE(SUM(total_questions), 0),
+           COALESCE(MAX(total_points), 0)
+    FROM GameHistory
+    WHERE user_id IS NOT NULL
+    GROUP BY user_id
+    ''')
+
+    cursor.execute('''
+    INSERT INTO UserCategoryStats (user_id, category_id, games_played, total_points, total_correct, total_questions)
+    SELECT user_id,
+           category_id,
+           COUNT(*),
+           COALESCE(SUM(total_points), 0),
+           COALESCE(SUM(correct_answers), 0),
+           COALESCE(SUM(total_questions), 0)
+    FROM GameHistory
+    WHERE user_id IS NOT NULL AND category_id IS NOT NULL
+    GROUP BY user_id, category_id
+    ''')
+
+
+def _migration_user_stats(cursor):
+    """Сводные таблицы статистики, обновляемые при каждом сохранении игры"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS UserStats (
+        user_id INTEGER PRIMARY KEY,
+        total_games INTEGER NOT NULL DEFAULT 0,
+        total_points INTEGER NOT NULL DEFAULT 0,
+        total_correct INTEGER NOT NULL DEFAULT 0,
+        total_questions INTEGER NOT NULL DEFAULT 0,
+        best_score INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (user_id) REFERENCES Users (user_id)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS UserCategoryStats (
+        user_id INTEGER NOT NULL,
+        category_id INTEGER NOT NULL,
+        games_played INTEGER NOT NULL DEFAULT 0,
+        total_points INTEGER NOT NULL DEFAULT 0,
+        total_correct INTEGER NOT NULL DEFAULT 0,
+        total_questions INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, category_id),
+        FOREIGN KEY (user_id) REFERENCES Users (user_id),
+        FOREIGN KEY (category_id) REFERENCES Categories (category_id)
+    ) WITHOUT ROWID
+    ''')
+
+    # Заполнение по уже накопленной истории игр
+    rebuild_stats_tables(cursor)
+
+
+def _migration_question_hash(cursor):
+    """Хеш содержимого вопросов с уникальным индексом и удаление накопившихся дубликатов"""
+    cursor.connection.create_function('question_hash', 2, question_hash, deterministic=True)
+
+    cursor.execute("ALTER TABLE Questions ADD COLUMN content_hash INTEGER")
+    cursor.execute("UPDATE Questions SET content_hash = question_hash(category_id, question_text)")
+
+    # Из каждой группы одинаковых вопросов остается вопрос с наименьшим ID
+    cursor.execute('''
+    CREATE TEMP TABLE duplicate_questions AS
+    SELECT question_id
+    FROM Questions
+    WHERE question_id NOT IN (SELECT MIN(question_id) FROM Questions GROUP BY content_hash)
+    ''')
+    cursor.execute("DELETE FROM Answers WHERE question_id IN (SELECT question_id FROM duplicate_questions)")
+    cursor.execute("DELETE FROM Questions WHERE question_id IN (SELECT question_id FROM duplicate_questions)")
+    cursor.execute("DROP TABLE duplicate_questions")
+
+    cursor.execute('''
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_content_hash
+    ON Questions (content_hash)
+    ''')
+
+
+# Стандартные категории: (название, описание)
+DEFAULT_CATEGORIES = [
+    ('История', 'Вопросы об исторических событиях и личностях'),
+    ('Наука', 'Вопросы о научных открытиях и явлениях'),
+    ('Культура', 'Вопросы о искусстве, литературе и музыке'),
+    ('Спорт', 'Вопросы о спортивных событиях и достижениях')
+]
+
+# Тестовые вопросы: категория -> [(текст, ответы, индекс правильного ответа, время, сложность)]
+SAMPLE_QUESTIONS = {
+    "История": [
+        ("В каком году началась Вторая мировая война?",
+         ["1937", "1939", "1941", "1940"], 1, 30, 1.0),
+        ("Кто был первым президентом США?",
+         ["Джордж Вашингтон", "Томас Джефферсон", "Авраам Линкольн", "Франклин Рузвельт"], 0, 20, 1.0),
+    ],
+    "Наука": [
+        ("Что измеряется в Ньютонах?",
+         ["Масса", "Скорость", "Сила", "Ускорение"], 2, 25, 1.0),
+        ("Какой химический элемент имеет символ 'O'?",
+         ["Золото", "Кислород", "Осмий", "Олово"], 1, 15, 1.0),
+    ],
+    "Культура": [
+        ("Кто написал 'Войну и мир'?",
+         ["Федор Достоевский", "Лев Толстой", "Антон Чехов", "Иван Тургенев"], 1, 20, 1.0),
+        ("В каком городе находится Лувр?",
+         ["Лондон", "Рим", "Париж", "Мадрид"], 2, 15, 1.0),
+    ],
+    "Спорт": [
+        ("Сколько игроков в команде по футболу?",
+         ["9", "10", "11", "12"], 2, 15, 1.0),
+        ("В каком году прошли первые современные Олимпийские игры?",
+         ["1886", "1896", "1900", "1904"], 1, 30, 1.5),
+    ],
+}
+
+
+def _migration_seed_data(cursor):
+    """Стандартные категории и тестовые вопросы (добавляются один раз, без дубликатов)"""
+    cursor.executemany('''
+    INSERT INTO Categories (name, description)
+    SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM Categories WHERE name = ?)
+    ''', [(name, description, name) for name, description in DEFAULT_CATEGORIES])
+
+    cursor.execute("SELECT category_id, name FROM Categories")
+    for category_id, name in cursor.fetchall():
+        for question_text, answers, correct_index, time_limit, difficulty in SAMPLE_QUESTIONS.get(name, []):
+            cursor.execute('''
+            INSERT OR IGNORE INTO Questions (category_id, question_text, time_limit, difficulty_level, content_hash)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (category_id, question_text, time_limit, difficulty, question_hash(category_id, question_text)))
+
+            # Вопрос уже есть в базе
+            if cursor.rowcount == 0:
+                continue
+
+            question_id = cursor.lastrowid
+            cursor.executemany('''
+            INSERT INTO Answers (question_id, answer_text, is_correct)
+            VALUES (?, ?, ?)
+            ''', [(question_id, answer_text, 1 if i == correct_index else 0)
+                  for i, answer_text in enumerate(answers)])
+
+
+# Триггеры синхронизации полнотекстового индекса QuestionSearch с Questions и Answers.
+# Пока в SearchIndexPause есть строка, триггеры не срабатывают: массовая вставка
+# заполняет индекс сама одним запросом в той же транзакции (так в разы быстрее)
+SEARCH_TRIGGERS = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_questions_search_insert AFTER INSERT ON Questions
+    WHEN NOT EXISTS (SELECT 1 FROM SearchIndexPause)
+    BEGIN
+        INSERT INTO QuestionSearch (rowid, question_text, answers_text)
+        VALUES (new.question_id, new.question_text,
+                (SELECT group_concat(answer_text, ' ') FROM Answers WHERE question_id = new.question_id));
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_questions_search_update AFTER UPDATE OF question_text ON Questions
+    WHEN NOT EXISTS (SELECT 1 FROM SearchIndexPause)
+    BEGIN
+        UPDATE QuestionSearch SET question_text = new.question_text WHERE rowid = new.question_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_questions_search_delete AFTER DELETE ON Questions
+    WHEN NOT EXISTS (SELECT 1 FROM SearchIndexPause)
+    BEGIN
+        DELETE FROM QuestionSearch WHERE rowid = old.question_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_answers_search_insert AFTER INSERT ON Answers
+    WHEN NOT EXISTS (SELECT 1 FROM SearchIndexPause)
+    BEGIN
+        UPDATE QuestionSearch
+        SET answers_text = (SELECT group_concat(answer_text, ' ') FROM Answers WHERE question_id = new.question_id)
+        WHERE rowid = new.question_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_answers_search_update AFTER UPDATE OF answer_text, question_id ON Answers
+    WHEN NOT EXISTS (SELECT 1 FROM SearchIndexPause)
+    BEGIN
+        UPDATE QuestionSearch
+        SET answers_text = (SELECT group_concat(answer_text, ' ') FROM Answers WHERE question_id = old.question_id)
+        WHERE rowid = old.question_id;
+        UPDATE QuestionSearch
+        SET answers_text = (SELECT group_concat(answer_text, ' ') FROM Answers WHERE question_id = new.question_id)
+        WHERE rowid = new.question_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_answers_search_delete AFTER DELETE ON Answers
+    WHEN NOT EXISTS (SELECT 1 FROM SearchIndexPause)
+    BEGIN
+        UPDATE QuestionSearch
+        SET answers_text = (SELECT group_concat(answer_text, ' ') FROM Answers WHERE question_id = old.question_id)
+        WHERE rowid = old.question_id;
+    END
+    ''',
+]
+
+
+def create_search_triggers(cursor):
+    """
+    Создает триггеры, поддерживающие полнотекстовый индекс QuestionSearch
+
+    Строка индекса имеет rowid = question_id и хранит текст вопроса и все его
+    ответы одной строкой, поэтому любое изменение Questions или Answers
+    сразу отражается в поиске.
+
+    Args:
+        cursor: Курсор SQLite внутри открытой транзакции
+    """
+    # executescript не используется: он фиксирует открытую транзакцию миграции
+    for statement in SEARCH_TRIGGERS:
+        cursor.execute(statement)
+
+
+def rebuild_search_index(cursor):
+    """
+    Заполняет полнотекстовый индекс QuestionSearch заново по Questions и Answers
+
+    Args:
+        cursor: Курсор SQLite внутри открытой транзакции
+    """
+    cursor.execute("DELETE FROM QuestionSearch")
+    cursor.execute('''
+    INSERT INTO QuestionSearch (rowid, question_text, answers_text)
+    SELECT q.question_id, q.question_text, group_concat(a.answer_text, ' ')
+    FROM Questions q
+    LEFT JOIN Answers a ON a.question_id = q.question_id
+    GROUP BY q.question_id
+    ''')
+    cursor.execute("INSERT INTO QuestionSearch (QuestionSearch) VALUES ('optimize')")
+
+
+def _migration_question_search(cursor):
+    """Полнотекстовый поиск (FTS5) по текстам вопросов и ответов"""
+    # unicode61 приводит кириллицу и латиницу к нижнему регистру и убирает диакритику
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS QuestionSearch USING fts5(
+        question_text,
+        answers_text,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS SearchIndexPause (
+        paused INTEGER PRIMARY KEY
+    )
+    ''')
+
+    rebuild_search_index(cursor)
+    create_search_triggers(cursor)
+
+
+def _rebuild_table(cursor, table, create_sql, columns):
+    """
+    Пересоздает таблицу с новым определением, сохраняя данные и счетчик AUTOINCREMENT
+
+    Выполняется при выключенных внешних ключах (см. run_migrations). Индексы и
+    триггеры таблицы удаляются вместе с ней и должны быть созданы заново.
+
+    Args:
+        cursor: Курсор SQLite внутри открытой транзакции
+        table (str): Имя таблицы
+        create_sql (str): CREATE TABLE для новой таблицы с именем new_<table>
+        columns (str): Список переносимых столбцов
+    """
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+    row = cursor.fetchone()
+
+    cursor.execute(create_sql)
+    cursor.execute(f"INSERT INTO new_{table} ({columns}) SELECT {columns} FROM {table}")
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE new_{table} RENAME TO {table}")
+
+    if row is not None:
+        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (row[0], table))
+
+
+# Рубрика, в которую миграция 7 переносит вопросы без рубрики
+UNCATEGORIZED_NAME = 'Без рубрики'
+UNCATEGORIZED_DESCRIPTION = 'Вопросы, у которых не была указана рубрика'
+
+
+def _migration_foreign_keys(cursor):
+    """Каскадное удаление вопросов и ответов по внешним ключам, мягкое удаление рубрик"""
+    # Удаленная рубрика остается в таблице, чтобы история игр и статистика сохранили ее название
+    cursor.execute("ALTER TABLE Categories ADD COLUMN is_deleted INTEGER NOT NULL DEFAULT 0")
+
+    # Вопросы без рубрики (category_id IS NULL) не подходят под NOT NULL новой таблицы:
+    # переносим их в рубрику-заглушку, чтобы администратор мог разобрать их вручную
+    cursor.execute("SELECT COUNT(*) FROM Questions WHERE category_id IS NULL")
+    if cursor.fetchone()[0]:
+        cursor.connection.create_function('question_hash', 2, question_hash, deterministic=True)
+        cursor.execute("INSERT INTO Categories (name, description) VALUES (?, ?)",
+                       (UNCATEGORIZED_NAME, UNCATEGORIZED_DESCRIPTION))
+        category_id = cursor.lastrowid
+        cursor.execute('''
+        UPDATE Questions
+        SET category_id = ?, content_hash = question_hash(?, question_text)
+        WHERE category_id IS NULL
+        ''', (category_id, category_id))
+
+    # Строки, ссылающиеся на уже удаленные записи, не прошли бы проверку внешних ключей.
+    # NULL NOT IN (...) никогда не истинно, поэтому NULL проверяется отдельно
+    cursor.execute('''
+    DELETE FROM Questions
+    WHERE category_id IS NULL OR category_id NOT IN (SELECT category_id FROM Categories)
+    ''')
+    cursor.execute('''
+    DELETE FROM Answers
+    WHERE question_id IS NULL OR question_id NOT IN (SELECT question_id FROM Questions)
+    ''')
+
+    # Игры по рубрикам, удаленным раньше, привязываем к удаленной рубрике-заглушке
+    cursor.execute('''
+    INSERT INTO Categories (category_id, name, description, is_deleted)
+    SELECT DISTINCT category_id, 'Удаленная рубрика', '', 1
+    FROM GameHistory
+    WHERE category_id IS NOT NULL AND category_id NOT IN (SELECT category_id FROM Categories)
+    ''')
+
+    cursor.execute("UPDATE GameHistory SET user_id = NULL WHERE user_id NOT IN (SELECT user_id FROM Users)")
+    if cursor.rowcount:
+        rebuild_stats_tables(cursor)
+
+    _rebuild_table(cursor, 'Questions', '''
+    CREATE TABLE new_Questions (
+        question_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category_id INTEGER NOT NULL REFERENCES Categories (category_id) ON DELETE CASCADE,
+        question_text TEXT NOT NULL,
+        time_limit INTEGER DEFAULT 30,
+        difficulty_level REAL DEFAULT 1.0,
+        content_hash INTEGER
+    )
+    ''', 'question_id, category_id, question_text, time_limit, difficulty_level, content_hash')
+
+    _rebuild_table(cursor, 'Answers', '''
+    CREATE TABLE new_Answers (
+        answer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        question_id INTEGER NOT NULL REFERENCES Questions (question_id) ON DELETE CASCADE,
+        answer_text TEXT NOT NULL,
+        is_correct BOOLEAN NOT NULL CHECK (is_correct IN (0, 1))
+    )
+    ''', 'answer_id, question_id, answer_text, is_correct')
+
+    # Индексы по внешним ключам: по ним выполняется каскадное удаление
+    cursor.execute("CREATE INDEX idx_questions_category ON Questions (category_id)")
+    cursor.execute("CREATE UNIQUE INDEX idx_questions_content_hash ON Questions (content_hash)")
+    cursor.execute("CREATE INDEX idx_answers_question ON Answers (question_id)")
+    create_search_triggers(cursor)
+
+
+# (версия, описание, функция) - версии идут подряд, начиная с 1
+MIGRATIONS = [
+    (1, "Базовая схема", _migration_base_schema),
+    (2, "Вторичные индексы", _migration_secondary_indexes),
+    (3, "Сводная статистика пользователей", _migration_user_stats),
+    (4, "Хеш содержимого вопросов и удаление дубликатов", _migration_question_hash),
+    (5, "Стандартные категории и тестовые вопросы", _migration_seed_data),
+    (6, "Полнотекстовый поиск по вопросам", _migration_question_search),
+    (7, "Внешние ключи с каскадным удалением", _migration_foreign_keys),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(cursor):
+    """
+    Возвращает текущую версию схемы базы данных
+
+    Args:
+        cursor: Курсор SQLite
+
+    Returns:
+        int: Значение PRAGMA user_version
+    """
+    cursor.execute("PRAGMA user_version")
+    return cursor.fetchone()[0]
+
+
+def run_migrations(connections):
+    """
+    Применяет все недостающие миграции
+
+    На время миграций проверка внешних ключей выключается (иначе пересоздание
+    таблиц удаляло бы связанные строки каскадом), а перед фиксацией каждой
+    миграции выполняется PRAGMA foreign_key_check.
+
+    Args:
+        connections (ConnectionManager): Менеджер соединений с базой данных
+
+    Returns:
+        list: Версии примененных миграций
+
+    Raises:
+        sqlite3.IntegrityError: Если после миграции нарушены внешние ключи
+    """
+    applied = []
+
+    # Быстрый путь: схема уже актуальна, блокировка записи не нужна
+    if get_schema_version(connections.cursor()) >= SCHEMA_VERSION:
+        return applied
+
+    # PRAGMA foreign_keys не действует внутри транзакции - переключаем до BEGIN
+    conn = connections.connection()
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF")
+
+    try:
+        for version, description, migrate in MIGRATIONS:
+            with connections.transaction(immediate=True) as cursor:
+                # Версию проверяем под блокировкой записи: другой процесс мог уже обновить схему
+                if get_schema_version(cursor) >= version:
+                    continue
+
+                migrate(cursor)
+
+                cursor.execute("PRAGMA foreign_key_check")
+                violations = cursor.fetchall()
+                if violations:
+                    raise sqlite3.IntegrityError(
+                        f"Миграция {version} ({description}) нарушает внешние ключи: {violations[:10]}"
+                    )
+
+                cursor.execute(f"PRAGMA user_version = {version}")
+                applied.append(version)
+    finally:
+        conn.execute(f"PRAGMA foreign_keys = {foreign_keys}")
+
+    return applied
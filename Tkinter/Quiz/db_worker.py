@@ -0,0 +1,117 @@
+import queue
+import threading
+
+
+class DatabaseWorker:
+    """
+    Асинхронный доступ к базе данных для экранов Tkinter
+
+    Запросы выполняются по очереди в отдельном потоке (у него свое
+    соединение из пула db_manager), а результаты передаются обратно
+    в поток Tkinter: очередь результатов опрашивается через after(),
+    поэтому обратные вызовы всегда выполняются в цикле событий окна.
+    """
+
+    def __init__(self, root, poll_interval=20, name="db-worker"):
+        """
+        Инициализирует и запускает рабочий поток
+
+        Args:
+            root: Корневое окно Tkinter, в цикле событий которого вызываются обратные вызовы
+            poll_interval (int, optional): Период опроса результатов в мс. По умолчанию 20.
+            name (str, optional): Имя рабочего потока
+        """
+        self.root = root
+        self.poll_interval = poll_interval
+
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+
+        # Поток-демон не держит процесс после закрытия окна (см. stop)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+        self._poll_id = None
+        self._poll()
+
+    def submit(self, func, *args, callback=None, errback=None, owner=None, **kwargs):
+        """
+        Ставит вызов функции доступа к данным в очередь
+
+        Args:
+            func (callable): Функция db_manager (или любая другая блокирующая функция)
+            *args: Позиционные аргументы функции
+            callback (callable, optional): Вызывается с результатом в потоке Tkinter
+            errback (callable, optional): Вызывается с исключением в потоке Tkinter
+            owner (optional): Виджет-владелец; если к моменту ответа он уничтожен,
+                обратные вызовы не выполняются
+            **kwargs: Именованные аргументы функции
+        """
+        self._requests.put((func, args, kwargs, callback, errback, owner))
+
+    def notify(self, callback, value, owner=None):
+        """
+        Передает значение обратному вызову в потоке Tkinter
+
+        Можно вызывать из рабочего потока, например для отчета о прогрессе долгой операции.
+
+        Args:
+            callback (callable): Вызывается со значением в потоке Tkinter
+            value: Передаваемое значение
+            owner (optional): Виджет-владелец (см. submit)
+        """
+        self._results.put((callback, value, owner, None))
+
+    def _run(self):
+        """Цикл рабочего потока"""
+        while True:
+            request = self._requests.get()
+            if request is None:
+                break
+
+            func, args, kwargs, callback, errback, owner = request
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self._results.put((errback, e, owner, func))
+            else:
+                self._results.put((callback, result, owner, None))
+
+    def _poll(self):
+        """Передает готовые результаты обратным вызовам в потоке Tkinter"""
+        # Следующий опрос планируем сразу, чтобы ошибка в обратном вызове не остановила опрос
+        self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+        while True:
+            try:
+                handler, value, owner, failed_func = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if owner is not None and not owner.winfo_exists():
+                continue
+
+            if handler:
+                handler(value)
+            elif failed_func is not None:
+                print(f"Ошибка при обращении к базе данных ({failed_func.__name__}): {value}")
+
+    def stop(self, timeout=None):
+        """
+        Останавливает рабочий поток после выполнения уже поставленных запросов
+
+        Args:
+            timeout (float, optional): Сколько секунд ждать выполнения запросов.
+                По умолчанию без ограничения. Если время истекло, поток-демон
+                завершится вместе с процессом, а незафиксированная транзакция
+                будет отменена SQLite.
+
+        Returns:
+            bool: True, если все запросы выполнены и поток остановлен
+        """
+        if self._poll_id:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._requests.put(None)
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
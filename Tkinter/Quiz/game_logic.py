@@ -1,3 +1,115 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: score_batch считает в чистом Python
+    np = None
+
+from models import AnswerEvent
+from utils.constants import BASE_POINTS, MAX_TIME_BONUS
+
+
+def score_answer(is_correct, latency_ms, time_limit, difficulty,
+                 base_points=BASE_POINTS, max_time_bonus=MAX_TIME_BONUS):
+    """
+    Рассчитывает количество баллов за ответ
+
+    Бонус за скорость пропорционален доле оставшегося времени и считается
+    в целых миллисекундах, чтобы результат не зависел от ошибок округления
+    и совпадал с score_batch.
+
+    Args:
+        is_correct (bool): Правильный ли ответ
+        latency_ms (int): Время от показа вопроса до ответа в миллисекундах
+        time_limit (int): Общее время на вопрос в секундах
+        difficulty (float): Сложность вопроса (множитель)
+        base_points (int, optional): Очки за правильный ответ
+        max_time_bonus (int, optional): Максимальный бонус за скорость
+
+    Returns:
+        int: Количество баллов
+    """
+    if not is_correct:
+        return 0
+
+    limit_ms = int(time_limit * 1000)
+    time_bonus = 0
+    if limit_ms > 0:
+        remaining_ms = max(0, limit_ms - int(latency_ms))
+        time_bonus = remaining_ms * max_time_bonus // limit_ms
+
+    return int((base_points + time_bonus) * difficulty)
+
+
+def score_batch(is_correct, latency_ms, time_limit, difficulty,
+                base_points=BASE_POINTS, max_time_bonus=MAX_TIME_BONUS):
+    """
+    Рассчитывает баллы сразу для множества ответов
+
+    Используется для пересчета сессий при изменении правил начисления очков
+    и для таблиц лидеров. Если установлен NumPy, расчет векторизован,
+    иначе выполняется поэлементно через score_answer; результаты совпадают.
+
+    Args:
+        is_correct (sequence): Признаки правильности ответов
+        latency_ms (sequence): Время ответа в миллисекундах
+        time_limit (sequence): Время на вопрос в секундах
+        difficulty (sequence): Сложность вопросов
+        base_points (int, optional): Очки за правильный ответ
+        max_time_bonus (int, optional): Максимальный бонус за скорость
+
+    Returns:
+        list: Баллы (int) для каждого ответа
+    """
+    if np is None:
+        return [
+            score_answer(correct, latency, limit, level, base_points, max_time_bonus)
+            for correct, latency, limit, level in zip(is_correct, latency_ms, time_limit, difficulty)
+        ]
+
+    is_correct = np.asarray(is_correct, dtype=bool)
+    latency_ms = np.asarray(latency_ms, dtype=np.int64)
+    limit_ms = (np.asarray(time_limit, dtype=np.float64) * 1000).astype(np.int64)
+    difficulty = np.asarray(difficulty, dtype=np.float64)
+
+    remaining_ms = np.maximum(limit_ms - latency_ms, 0)
+    time_bonus = np.where(limit_ms > 0, remaining_ms * max_time_bonus // np.maximum(limit_ms, 1), 0)
+    points = np.floor((base_points + time_bonus) * difficulty).astype(np.int64)
+
+    return np.where(is_correct, points, 0).tolist()
+
+
+def score_sessions(sessions, base_points=BASE_POINTS, max_time_bonus=MAX_TIME_BONUS):
+    """
+    Пересчитывает итоговые баллы нескольких сессий по записанным ответам
+
+    Ответы всех сессий обрабатываются одним вызовом score_batch.
+
+    Args:
+        sessions (list): Список GameSession
+        base_points (int, optional): Очки за правильный ответ
+        max_time_bonus (int, optional): Максимальный бонус за скорость
+
+    Returns:
+        list: Итоговые баллы каждой сессии в том же порядке
+    """
+    events = [event for session in sessions for event in session.events]
+    points = score_batch(
+        [event.is_correct for event in events],
+        [event.latency_ms for event in events],
+        [event.time_limit for event in events],
+        [event.difficulty_level for event in events],
+        base_points,
+        max_time_bonus
+    )
+
+    totals = []
+    offset = 0
+    for session in sessions:
+        count = len(session.events)
+        totals.append(sum(points[offset:offset + count]))
+        offset += count
+    return totals
+
+
 class GameSession:
     """Класс, представляющий игровую сессию"""
 
@@ -10,6 +122,9 @@ class GameSession:
         self.total_questions = 0
         self.current_question = None
 
+        # Все ответы сессии (models.AnswerEvent) в порядке поступления
+        self.events = []
+
     def calculate_points(self, is_correct, time_left, time_limit, difficulty):
         """
         Рассчитывает количество баллов за ответ
@@ -23,17 +138,41 @@ class GameSession:
         Returns:
             int: Количество баллов
         """
-        if not is_correct:
-            return 0
+        latency_ms = int((time_limit - time_left) * 1000)
+        return score_answer(is_correct, latency_ms, time_limit, difficulty)
 
-        # Базовые очки за правильный ответ
-        base_points = 100
+    def record_answer(self, question, answer, latency_ms):
+        """
+        Записывает ответ на вопрос и начисляет баллы
 
-        # Бонус за скорость (до 50 очков)
-        time_bonus = int((time_left / time_limit) * 50) if time_limit > 0 else 0
+        Args:
+            question (models.Question): Вопрос
+            answer (models.Answer): Выбранный ответ или None, если вопрос пропущен
+                или время истекло
+            latency_ms (int): Время от показа вопроса до ответа в миллисекундах
 
-        # Применение множителя сложности
-        return int((base_points + time_bonus) * difficulty)
+        Returns:
+            int: Количество баллов за ответ
+        """
+        is_correct = answer is not None and answer.is_correct
+        latency_ms = int(latency_ms)
+        points = score_answer(is_correct, latency_ms, question.time_limit, question.difficulty_level)
+
+        self.events.append(AnswerEvent(
+            question.question_id,
+            answer.answer_id if answer is not None else None,
+            is_correct,
+            latency_ms,
+            question.time_limit,
+            question.difficulty_level,
+            points
+        ))
+
+        self.total_questions += 1
+        if is_correct:
+            self.correct_answers += 1
+        self.total_points += points
+        return points
 
     def answer_question(self, is_correct, time_left, time_limit, difficulty):
         """
@@ -58,6 +197,19 @@ class GameSession:
 
         return 0
 
+    def rescore(self, base_points=BASE_POINTS, max_time_bonus=MAX_TIME_BONUS):
+        """
+        Пересчитывает баллы за записанные ответы по другим правилам
+
+        Args:
+            base_points (int, optional): Очки за правильный ответ
+            max_time_bonus (int, optional): Максимальный бонус за скорость
+
+        Returns:
+            int: Итоговые баллы (сама сессия не изменяется)
+        """
+        return score_sessions([self], base_points, max_time_bonus)[0]
+
     def get_results(self):
         """
         Возвращает результаты игровой сессии
@@ -96,7 +248,7 @@ class QuestionHandler:
             limit (int, optional): Максимальное количество вопросов. По умолчанию 10.
 
         Returns:
-            list: Список вопросов
+            list: Список models.Question
         """
         return self.db_manager.get_questions_for_category(category_id, limit)
 
@@ -108,7 +260,7 @@ class QuestionHandler:
             question_id (int): ID вопроса
 
         Returns:
-            list: Список вариантов ответов
+            list: Список models.Answer
         """
         return self.db_manager.get_answers_for_question(question_id)
 
@@ -130,12 +282,12 @@ class QuestionHandler:
         Получает правильный ответ из списка вариантов
 
         Args:
-            answers (list): Список вариантов ответов
+            answers (list): Список models.Answer
 
         Returns:
             int: ID правильного ответа
         """
-        for answer_id, _, _, is_correct in answers:
-            if is_correct:
-                return answer_id
+        for answer in answers:
+            if answer.is_correct:
+                return answer.answer_id
         return None
\ No newline at end of file
@@ -1,12 +1,26 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import messagebox, ttk
 
-from ui.main_menu import MainMenuScreen
-from ui.profile_screen import ProfileScreen
-from ui.category_select import CategorySelectScreen
-from ui.question_screen import QuestionScreen
-from ui.results_screen import ResultsScreen
-from db_manager import initialize_database, check_user_exists, create_user
+from ui.screen_manager import ScreenManager
+from db_worker import DatabaseWorker
+from utils.constants import DB_WORKER_STOP_TIMEOUT
+
+# Модули экранов и db_manager импортируются при первом обращении, чтобы окно
+# появлялось без ожидания их загрузки (profile_screen, например, тянет PIL)
+
+
+def prepare_database():
+    """
+    Применяет миграции и проверяет наличие пользователя
+
+    Выполняется в потоке базы данных после того, как окно уже показано.
+
+    Returns:
+        bool: True, если пользователь уже создан
+    """
+    from db_manager import initialize_database, check_user_exists
+    initialize_database()
+    return check_user_exists()
 
 
 class QuizApp(tk.Tk):
@@ -16,62 +30,146 @@ class QuizApp(tk.Tk):
         self.geometry("800x600")
         self.resizable(True, True)
 
-        # Инициализация базы данных
-        initialize_database()
+        # Фоновый поток для обращений к базе данных из экранов. Долгие импорт и
+        # экспорт админ-панели идут в отдельном потоке, чтобы не задерживать
+        # запросы экранов и закрытие окна
+        self.db = DatabaseWorker(self)
+        self.io_worker = DatabaseWorker(self, name="io-worker")
+        self.protocol("WM_DELETE_WINDOW", self.exit_app)
 
         # Глобальные данные приложения
         self.current_user_id = None
         self.current_screen = None
 
-        # Проверка наличия пользователя при запуске
-        self.check_user_on_startup()
+        # Экраны создаются один раз и переиспользуются при переходах
+        self.screens = ScreenManager(self)
+        self.register_screens()
+
+        # Пока готовится база данных, показываем заставку. Миграции запускаются
+        # после отрисовки первого кадра, первым запросом в очереди потока БД,
+        # поэтому запросы экранов выполняются уже после них
+        self.current_screen = self.screens.show("loading")
+        self.after_idle(self.start_database)
+
+    def start_database(self):
+        """Запускает подготовку базы данных в фоновом потоке"""
+        self.db.submit(
+            prepare_database,
+            callback=self.check_user_on_startup,
+            errback=self.on_database_error
+        )
+
+    def on_database_error(self, error):
+        """Сообщает об ошибке подготовки базы данных"""
+        print(f"Ошибка при подготовке базы данных: {error}")
+        self.current_screen.message_label.config(text="Не удалось открыть базу данных")
+
+    def register_screens(self):
+        """Регистрирует экраны приложения в менеджере экранов"""
+        self.screens.register("loading", self.create_loading_screen, cache=False)
+        self.screens.register("main_menu", self.create_main_menu)
+        self.screens.register("category_select", self.create_category_select)
+        self.screens.register("question", self.create_question_screen)
+        self.screens.register("results", self.create_results_screen)
+
+        # Профиль показывается редко и держит изображение аватара - не кэшируем
+        self.screens.register("create_profile", self.create_profile_creation_screen, cache=False)
+        self.screens.register("profile", self.create_profile_screen, cache=False)
+
+    def create_loading_screen(self):
+        screen = tk.Frame(self, bg="#f0f0f0")
+        screen.message_label = tk.Label(
+            screen,
+            text="Загрузка...",
+            font=("Arial", 14),
+            bg="#f0f0f0"
+        )
+        screen.message_label.pack(expand=True)
+        return screen
+
+    def create_main_menu(self):
+        from ui.main_menu import MainMenuScreen
+        return MainMenuScreen(
+            self,
+            start_game_callback=self.show_category_select,
+            show_profile_callback=self.show_profile,
+            exit_callback=self.exit_app
+        )
+
+    def create_category_select(self):
+        from ui.category_select import CategorySelectScreen
+        return CategorySelectScreen(self, start_game_callback=self.start_game)
+
+    def create_question_screen(self):
+        from ui.question_screen import QuestionScreen
+        return QuestionScreen(
+            self,
+            finish_game_callback=self.show_results,
+            cancel_game_callback=self.show_category_select
+        )
+
+    def create_results_screen(self):
+        from ui.results_screen import ResultsScreen
+        return ResultsScreen(
+            self,
+            return_to_menu_callback=self.show_main_menu,
+            play_again_callback=self.show_category_select
+        )
+
+    def create_profile_creation_screen(self):
+        from ui.profile_screen import ProfileScreen
+        return ProfileScreen(self, is_creation=True, save_callback=self.on_profile_created)
+
+    def create_profile_screen(self):
+        from ui.profile_screen import ProfileScreen
+        return ProfileScreen(
+            self,
+            user_id=self.current_user_id,
+            is_creation=False,
+            save_callback=self.on_profile_updated
+        )
 
-    def check_user_on_startup(self):
+    def check_user_on_startup(self, user_exists):
         # Если пользователь существует, загрузить его профиль и показать главное меню
         # Иначе показать экран создания профиля
-        if check_user_exists():
+        if user_exists:
             self.current_user_id = 1  # Упрощенно, в реальности получаем ID пользователя
             self.show_main_menu()
         else:
             self.show_create_profile()
 
     def show_create_profile(self):
-        # Очищаем предыдущий экран, если он был
-        if self.current_screen:
-            self.current_screen.pack_forget()
-
-        # Создаем и отображаем экран создания профиля
-        self.current_screen = ProfileScreen(self, is_creation=True, save_callback=self.on_profile_created)
-        self.current_screen.pack(fill=tk.BOTH, expand=True)
+        self.current_screen = self.screens.show("create_profile")
 
     def on_profile_created(self, username, avatar_path):
-        # Создаем пользователя и переходим в главное меню
-        self.current_user_id = create_user(username, avatar_path)
+        # Создаем пользователя в потоке базы данных, затем переходим в главное меню
+        from db_manager import create_user
+        self.db.submit(
+            create_user,
+            username,
+            avatar_path,
+            callback=self.on_user_created,
+            errback=lambda e: messagebox.showerror("Ошибка", f"Не удалось создать профиль: {e}", parent=self)
+        )
+
+    def on_user_created(self, user_id):
+        self.current_user_id = user_id
         self.show_main_menu()
 
     def show_main_menu(self):
-        if self.current_screen:
-            self.current_screen.pack_forget()
+        self.current_screen = self.screens.show("main_menu")
 
-        self.current_screen = MainMenuScreen(
-            self,
-            start_game_callback=self.show_category_select,
-            show_profile_callback=self.show_profile,
-            exit_callback=self.quit
-        )
-        self.current_screen.pack(fill=tk.BOTH, expand=True)
+    def exit_app(self):
+        # Дожидаемся уже поставленных запросов (например, сохранения результатов игры),
+        # но не дольше DB_WORKER_STOP_TIMEOUT, чтобы окно не выглядело зависшим.
+        # Незавершенный импорт или экспорт прерывается вместе с процессом
+        if not self.db.stop(timeout=DB_WORKER_STOP_TIMEOUT):
+            print("Не все запросы к базе данных успели выполниться до закрытия")
+        self.io_worker.stop(timeout=0)
+        self.quit()
 
     def show_profile(self):
-        if self.current_screen:
-            self.current_screen.pack_forget()
-
-        self.current_screen = ProfileScreen(
-            self,
-            user_id=self.current_user_id,
-            is_creation=False,
-            save_callback=self.on_profile_updated
-        )
-        self.current_screen.pack(fill=tk.BOTH, expand=True)
+        self.current_screen = self.screens.show("profile")
 
     def on_profile_updated(self, username, avatar_path):
         # Обновить профиль и вернуться в главное меню
@@ -79,42 +177,24 @@ class QuizApp(tk.Tk):
         self.show_main_menu()
 
     def show_category_select(self):
-        if self.current_screen:
-            self.current_screen.pack_forget()
-
-        self.current_screen = CategorySelectScreen(
-            self,
-            start_game_callback=self.start_game
-        )
-        self.current_screen.pack(fill=tk.BOTH, expand=True)
+        self.current_screen = self.screens.show("category_select")
 
     def start_game(self, category_id, category_name):
-        if self.current_screen:
-            self.current_screen.pack_forget()
-
-        self.current_screen = QuestionScreen(
-            self,
-            category_id,
-            category_name,
-            finish_game_callback=self.show_results
+        self.current_screen = self.screens.show(
+            "question",
+            {'category_id': category_id, 'category_name': category_name}
         )
-        self.current_screen.pack(fill=tk.BOTH, expand=True)
 
     def show_results(self, total_points, correct_answers, total_questions, category_name):
-        if self.current_screen:
-            self.current_screen.pack_forget()
-
-        self.current_screen = ResultsScreen(
-            self,
-            total_points,
-            correct_answers,
-            total_questions,
-            category_name,
-            return_to_menu_callback=self.show_main_menu,
-            play_again_callback=self.show_category_select
+        self.current_screen = self.screens.show(
+            "results",
+            {
+                'total_points': total_points,
+                'correct_answers': correct_answers,
+                'total_questions': total_questions,
+                'category_name': category_name,
+            }
         )
-        self.current_screen.pack(fill=tk.BOTH, expand=True)
-
 
 if __name__ == "__main__":
     app = QuizApp()
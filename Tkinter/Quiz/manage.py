@@ -0,0 +1,141 @@
+"""
+Служебные команды для базы данных викторины (без графического интерфейса)
+
+Запуск из каталога Tkinter/Quiz:
+    python manage.py rebuild-stats   - пересчитать сводную статистику по истории игр
+    python manage.py verify-stats    - сверить сводную статистику с историей игр
+    python manage.py rebuild-search  - перестроить полнотекстовый индекс вопросов
+    python manage.py search TEXT     - найти вопросы по тексту вопроса и ответов
+    python manage.py import FILE     - импортировать вопросы из CSV/JSON/JSONL
+    python manage.py export questions|history FILE
+                                     - выгрузить вопросы или историю игр в CSV/JSON/JSONL(.gz)
+"""
+import argparse
+import sys
+
+import db_manager
+from question_importer import import_questions, SUPPORTED_FORMATS, DEFAULT_BATCH_SIZE
+from data_exporter import export_questions, export_history, EXPORT_FORMATS, DEFAULT_FETCH_SIZE
+
+
+def cmd_rebuild_stats(args):
+    """Пересчитывает сводную статистику"""
+    db_manager.rebuild_user_statistics()
+    print("Сводная статистика пересчитана")
+    return 0
+
+
+def cmd_verify_stats(args):
+    """Сверяет сводную статистику с историей игр"""
+    mismatches = db_manager.verify_user_statistics()
+    if not mismatches:
+        print("Сводная статистика совпадает с историей игр")
+        return 0
+
+    for table, key in mismatches:
+        print(f"Расхождение в {table}: {key}")
+    print(f"Найдено расхождений: {len(mismatches)}. Выполните 'python manage.py rebuild-stats'")
+    return 1
+
+
+def cmd_rebuild_search(args):
+    """Перестраивает полнотекстовый индекс вопросов"""
+    db_manager.rebuild_question_search()
+    print("Поисковый индекс перестроен")
+    return 0
+
+
+def cmd_search(args):
+    """Ищет вопросы по тексту"""
+    results = db_manager.search_questions(args.text, limit=args.limit)
+    for question, question_snippet, answers_snippet in results:
+        print(f"{question.question_id}: {question_snippet}")
+        if answers_snippet:
+            print(f"    {answers_snippet}")
+    print(f"Найдено: {len(results)}")
+    return 0
+
+
+def print_import_progress(stats):
+    """Выводит прогресс импорта в одну строку"""
+    print(f"\rОбработано: {stats['processed']}, добавлено: {stats['imported']}, "
+          f"дубликатов: {stats['duplicates']}, пропущено: {stats['skipped']}, {stats['rate']:.0f} записей/с", end='', flush=True)
+
+
+def cmd_import(args):
+    """Импортирует вопросы из файла"""
+    stats = import_questions(args.file, args.format, args.batch_size, progress=print_import_progress)
+    print()
+
+    for record_number, message in stats['errors']:
+        print(f"Запись {record_number}: {message}")
+
+    print(f"Импорт завершен за {stats['elapsed']:.1f} с: добавлено {stats['imported']}, "
+          f"дубликатов {stats['duplicates']}, пропущено {stats['skipped']} ({stats['rate']:.0f} записей/с)")
+    return 0 if stats['skipped'] == 0 else 1
+
+
+def cmd_export(args):
+    """Выгружает вопросы или историю игр в файл"""
+    export = export_questions if args.table == 'questions' else export_history
+
+    def print_progress(stats):
+        print(f"\rВыгружено: {stats['exported']}, {stats['rate']:.0f} записей/с", end='', flush=True)
+
+    stats = export(args.file, args.format, args.fetch_size, progress=print_progress)
+    print()
+    print(f"Экспорт завершен за {stats['elapsed']:.1f} с: выгружено {stats['exported']} "
+          f"({stats['rate']:.0f} записей/с)")
+    return 0
+
+
+def build_parser():
+    """Создает парсер аргументов командной строки"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=db_manager.DB_PATH, help='Путь к файлу базы данных')
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rebuild_parser = subparsers.add_parser('rebuild-stats', help='Пересчитать сводную статистику')
+    rebuild_parser.set_defaults(func=cmd_rebuild_stats)
+
+    verify_parser = subparsers.add_parser('verify-stats', help='Сверить сводную статистику с историей игр')
+    verify_parser.set_defaults(func=cmd_verify_stats)
+
+    rebuild_search_parser = subparsers.add_parser('rebuild-search', help='Перестроить поисковый индекс вопросов')
+    rebuild_search_parser.set_defaults(func=cmd_rebuild_search)
+
+    search_parser = subparsers.add_parser('search', help='Найти вопросы по тексту')
+    search_parser.add_argument('text', help='Слова для поиска (ищутся по началу слова)')
+    search_parser.add_argument('--limit', type=int, default=20, help='Максимальное количество результатов')
+    search_parser.set_defaults(func=cmd_search)
+
+    import_parser = subparsers.add_parser('import', help='Импортировать вопросы из CSV/JSON/JSONL')
+    import_parser.add_argument('file', help='Путь к файлу (допускается сжатие .gz)')
+    import_parser.add_argument('--format', choices=SUPPORTED_FORMATS, help='Формат файла (по умолчанию по расширению)')
+    import_parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                               help='Количество вопросов в одной транзакции')
+    import_parser.set_defaults(func=cmd_import)
+
+    export_parser = subparsers.add_parser('export', help='Выгрузить вопросы или историю игр')
+    export_parser.add_argument('table', choices=['questions', 'history'], help='Что выгружать')
+    export_parser.add_argument('file', help='Путь к файлу (.gz - со сжатием)')
+    export_parser.add_argument('--format', choices=EXPORT_FORMATS, help='Формат файла (по умолчанию по расширению)')
+    export_parser.add_argument('--fetch-size', type=int, default=DEFAULT_FETCH_SIZE,
+                               help='Количество строк, читаемых из базы за раз')
+    export_parser.set_defaults(func=cmd_export)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    db_manager.configure_database(args.db)
+    db_manager.initialize_database()
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Компактные типы данных банка вопросов
+
+Классы объявлены с __slots__ (dataclass(slots=True)): у экземпляров нет
+__dict__, поэтому кэш запросов и загруженные раунды занимают меньше памяти,
+а обращение к полю по имени не требует индексации кортежа. Вопросы и ответы
+неизменяемы (frozen) и могут безопасно разделяться между кэшем и экранами.
+"""
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True, slots=True)
+class Answer:
+    """Вариант ответа на вопрос"""
+    answer_id: int
+    question_id: int
+    answer_text: str
+    is_correct: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Question:
+    """Вопрос викторины; answers заполняется, только если ответы загружались вместе с вопросом"""
+    question_id: int
+    category_id: int
+    question_text: str
+    time_limit: int
+    difficulty_level: float
+    answers: tuple = ()
+
+    def correct_answer(self):
+        """Возвращает правильный вариант ответа или None"""
+        for answer in self.answers:
+            if answer.is_correct:
+                return answer
+        return None
+
+
+@dataclass(slots=True)
+class Round:
+    """Раунд игры: вопросы в порядке показа с уже перемешанными ответами"""
+    category_id: int
+    questions: list = field(default_factory=list)
+    seed: int = None
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __getitem__(self, index):
+        return self.questions[index]
+
+    def __iter__(self):
+        return iter(self.questions)
+
+
+@dataclass(frozen=True, slots=True)
+class AnswerEvent:
+    """Ответ игрока на вопрос; answer_id = None - вопрос пропущен или время истекло"""
+    question_id: int
+    answer_id: int
+    is_correct: bool
+    latency_ms: int
+    time_limit: int
+    difficulty_level: float
+    points: int
+
+
+def question_row_factory(cursor, row):
+    """
+    Фабрика строк sqlite3 для запросов вида
+    SELECT question_id, category_id, question_text, time_limit, difficulty_level
+    """
+    return Question(*row)
@@ -0,0 +1,180 @@
+import sys
+import threading
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """
+    Приблизительно оценивает объем памяти, занимаемый значением
+
+    Учитываются вложенные кортежи, списки, словари и поля объектов
+    с __slots__ (models.Question и др.); строки и числа считаются через
+    sys.getsizeof. Общие объекты (например, интернированные
+    строки) могут учитываться несколько раз - для бюджета кэша это допустимо.
+
+    Args:
+        value: Значение (результат запроса)
+
+    Returns:
+        int: Размер в байтах
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(estimate_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif hasattr(type(value), '__slots__'):
+        size += sum(estimate_size(getattr(value, name)) for name in type(value).__slots__)
+    return size
+
+
+class QueryCache:
+    """
+    Общий для процесса кэш результатов запросов с вытеснением LRU
+
+    Ключ - кортеж, первый элемент которого задает пространство имен
+    (например, ('categories',) или ('question', 42)), что позволяет сбрасывать
+    как отдельные записи, так и все записи одного вида. Объем кэша ограничен
+    бюджетом памяти: при превышении вытесняются давно не использованные записи.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        Инициализирует кэш
+
+        Args:
+            max_bytes (int): Бюджет памяти в байтах (0 - кэш выключен)
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # Увеличивается при каждом сбросе: значение, загруженное до сброса, не сохраняется
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Возвращает значение из кэша и отмечает его как недавно использованное
+
+        Args:
+            key (tuple): Ключ
+            default (optional): Значение, возвращаемое при промахе
+
+        Returns:
+            Значение из кэша или default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, generation=None):
+        """
+        Сохраняет значение в кэше, вытесняя старые записи при превышении бюджета
+
+        Args:
+            key (tuple): Ключ
+            value: Значение (не должно изменяться после сохранения)
+            generation (int, optional): Значение generation до загрузки; если с тех пор
+                кэш сбрасывался, значение могло устареть и не сохраняется
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+
+            self._entries[key] = (value, size)
+            self._size += size
+
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def get_or_load(self, key, load):
+        """
+        Возвращает значение из кэша, а при промахе загружает и сохраняет его
+
+        Args:
+            key (tuple): Ключ
+            load (callable): Функция без аргументов, загружающая значение
+
+        Returns:
+            Значение
+        """
+        missing = object()
+        generation = self.generation
+        value = self.get(key, missing)
+        if value is missing:
+            value = load()
+            self.put(key, value, generation)
+        return value
+
+    def invalidate(self, namespace=None, *key):
+        """
+        Сбрасывает записи кэша
+
+        Args:
+            namespace (str, optional): Пространство имен. Если не указано, кэш очищается полностью.
+            *key: Остальные элементы ключа. Если не указаны, сбрасывается все пространство имен.
+        """
+        with self._lock:
+            self.generation += 1
+
+            if namespace is None:
+                self._entries.clear()
+                self._size = 0
+                return
+
+            if key:
+                keys = [(namespace, *key)]
+            else:
+                keys = [existing for existing in self._entries if existing[0] == namespace]
+
+            for existing in keys:
+                entry = self._entries.pop(existing, None)
+                if entry is not None:
+                    self._size -= entry[1]
+
+    def stats(self):
+        """
+        Возвращает счетчики кэша для настройки бюджета
+
+        Returns:
+            dict: hits, misses, hit_rate, evictions, entries, size_bytes, max_bytes
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+            }
+
+    def reset_stats(self):
+        """Обнуляет счетчики попаданий, промахов и вытеснений"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
@@ -0,0 +1,314 @@
+"""
+Потоковый импорт банка вопросов из CSV, JSON и JSONL
+
+Файл читается по частям, каждая запись проверяется, а корректные записи
+добавляются пачками через db_manager.add_questions_batch (executemany
+в одной транзакции на пачку), поэтому память не зависит от размера файла.
+
+Формат записи (JSON/JSONL):
+    {"category": "История", "question": "Текст вопроса",
+     "time_limit": 30, "difficulty": 1.0,
+     "answers": ["Вариант 1", "Вариант 2", "Вариант 3", "Вариант 4"],
+     "correct": 2}
+
+Поле correct - номер правильного ответа, начиная с 1; вариантов ответа
+от двух до четырех. В CSV ответы задаются колонками answer_1, answer_2, ...
+Поля time_limit и difficulty необязательны. Файлы с расширением .gz распаковываются на лету.
+Вопросы, которые уже есть в рубрике, пропускаются (см. content_hash).
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import time
+
+import db_manager
+from utils.constants import (DEFAULT_TIME_PER_QUESTION, MIN_DIFFICULTY, MAX_DIFFICULTY,
+                             MIN_ANSWERS, MAX_ANSWERS)
+
+SUPPORTED_FORMATS = ('csv', 'json', 'jsonl')
+DEFAULT_BATCH_SIZE = 5000
+
+# Сколько ошибок проверки сохранять в отчете (остальные только подсчитываются)
+MAX_REPORTED_ERRORS = 100
+
+# Символы, которые могут следовать за элементом массива JSON
+JSON_DELIMITERS = ' \t\r\n,]'
+
+
+class ImportRecordError(ValueError):
+    """Запись файла импорта не прошла проверку"""
+
+
+def detect_format(path):
+    """
+    Определяет формат файла по расширению
+
+    Args:
+        path (str): Путь к файлу
+
+    Returns:
+        str: 'csv', 'json' или 'jsonl'
+    """
+    name = path.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+
+    extension = os.path.splitext(name)[1]
+    if extension == '.csv':
+        return 'csv'
+    if extension == '.json':
+        return 'json'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"Не удалось определить формат файла: {path}")
+
+
+def open_text(path, encoding='utf-8'):
+    """Открывает текстовый файл, при необходимости распаковывая gzip"""
+    if path.lower().endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding=encoding, newline='')
+    return open(path, encoding=encoding, newline='')
+
+
+def iter_csv_records(file):
+    """Читает записи из CSV (первая строка - заголовок)"""
+    reader = csv.DictReader(file)
+    for row in reader:
+        answer_columns = sorted(
+            (key for key in row if key and key.startswith('answer_')),
+            key=lambda key: int(key.split('_')[1]) if key.split('_')[1].isdigit() else 0
+        )
+        yield {
+            'category': row.get('category'),
+            'question': row.get('question'),
+            'time_limit': row.get('time_limit') or None,
+            'difficulty': row.get('difficulty') or None,
+            'answers': [row[key] for key in answer_columns if row[key]],
+            'correct': row.get('correct'),
+        }
+
+
+def iter_jsonl_records(file):
+    """
+    Читает записи из JSONL (один объект JSON на строку)
+
+    Строка с некорректным JSON не прерывает импорт: вместо записи возвращается
+    ImportRecordError с номером строки, и validate_record отклоняет ее как
+    любую другую некорректную запись.
+    """
+    for line_number, line in enumerate(file, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ImportRecordError(f"строка {line_number}: некорректный JSON ({e.msg})")
+
+
+def iter_json_records(file, chunk_size=1 << 16):
+    """
+    Читает элементы массива JSON верхнего уровня, не загружая файл целиком
+
+    Args:
+        file: Текстовый файл
+        chunk_size (int, optional): Размер читаемого блока в символах
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        # Пропускаем пробелы и разделители между элементами
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n':
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            chunk = file.read(chunk_size)
+            buffer = buffer[position:] + chunk
+            position = 0
+            eof = not chunk
+
+        if position >= len(buffer):
+            if started:
+                raise ValueError("Неожиданный конец файла JSON")
+            return
+
+        char = buffer[position]
+        if not started:
+            if char != '[':
+                raise ValueError("Файл JSON должен содержать массив записей")
+            started = True
+            position += 1
+            continue
+        if char == ']':
+            return
+        if char == ',':
+            position += 1
+            continue
+
+        # Декодируем очередной элемент; если он обрезан концом буфера, дочитываем
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = file.read(chunk_size)
+            buffer = buffer[position:] + chunk
+            position = 0
+            eof = not chunk
+            continue
+
+        # Число на границе блока могло быть обрезано ("1" из "1.5", "12" из "1234"): значение
+        # принимаем, только если за ним в буфере уже есть разделитель или файл закончился.
+        # Объекты, массивы и строки заканчиваются закрывающим символом, им это не нужно
+        if not eof and (end >= len(buffer) or buffer[end] not in JSON_DELIMITERS):
+            chunk = file.read(chunk_size)
+            buffer = buffer[position:] + chunk
+            position = 0
+            eof = not chunk
+            continue
+
+        position = end
+        yield record
+
+
+def validate_record(record):
+    """
+    Проверяет запись и приводит ее к виду для db_manager.add_questions_batch
+
+    Args:
+        record (dict): Запись из файла импорта
+
+    Returns:
+        tuple: (category_name, question_text, time_limit, difficulty, answers)
+
+    Raises:
+        ImportRecordError: Если запись некорректна
+    """
+    if isinstance(record, ImportRecordError):
+        # Запись не удалось прочитать (см. iter_jsonl_records)
+        raise record
+    if not isinstance(record, dict):
+        raise ImportRecordError("запись должна быть объектом")
+
+    category = str(record.get('category') or '').strip()
+    if not category:
+        raise ImportRecordError("не указана рубрика")
+
+    question_text = str(record.get('question') or '').strip()
+    if not question_text:
+        raise ImportRecordError("пустой текст вопроса")
+
+    # Значение по умолчанию - только для отсутствующего или пустого поля: явный 0
+    # должен дойти до проверок диапазона ниже
+    time_limit = record.get('time_limit')
+    difficulty = record.get('difficulty')
+    try:
+        time_limit = int(DEFAULT_TIME_PER_QUESTION if time_limit in (None, '') else time_limit)
+        difficulty = float(MIN_DIFFICULTY if difficulty in (None, '') else difficulty)
+        correct = int(record.get('correct'))
+    except (TypeError, ValueError):
+        raise ImportRecordError("некорректное число в полях time_limit, difficulty или correct")
+
+    if time_limit <= 0:
+        raise ImportRecordError("время на ответ должно быть положительным")
+    if not MIN_DIFFICULTY <= difficulty <= MAX_DIFFICULTY:
+        raise ImportRecordError(f"сложность должна быть от {MIN_DIFFICULTY} до {MAX_DIFFICULTY}")
+
+    answers = record.get('answers')
+    if not isinstance(answers, list) or len(answers) < MIN_ANSWERS:
+        raise ImportRecordError(f"нужно минимум {MIN_ANSWERS} варианта ответа")
+    if len(answers) > MAX_ANSWERS:
+        raise ImportRecordError(f"не больше {MAX_ANSWERS} вариантов ответа")
+
+    answer_texts = [str(answer).strip() for answer in answers]
+    if not all(answer_texts):
+        raise ImportRecordError("пустой вариант ответа")
+    if not 1 <= correct <= len(answer_texts):
+        raise ImportRecordError("номер правильного ответа вне диапазона")
+
+    return (
+        category,
+        question_text,
+        time_limit,
+        difficulty,
+        [(text, index == correct) for index, text in enumerate(answer_texts, start=1)]
+    )
+
+
+def import_questions(path, file_format=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Импортирует вопросы из файла
+
+    Args:
+        path (str): Путь к файлу
+        file_format (str, optional): 'csv', 'json' или 'jsonl'. По умолчанию по расширению.
+        batch_size (int, optional): Количество вопросов в одной транзакции
+        progress (callable, optional): Вызывается со словарем статистики после каждой пачки
+
+    Returns:
+        dict: Статистика импорта (processed, imported, duplicates, skipped, errors, elapsed, rate)
+    """
+    file_format = file_format or detect_format(path)
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Неподдерживаемый формат: {file_format}")
+
+    readers = {
+        'csv': iter_csv_records,
+        'json': iter_json_records,
+        'jsonl': iter_jsonl_records,
+    }
+
+    categories = {name: category_id for category_id, name, _ in db_manager.get_all_categories()}
+    stats = {
+        'processed': 0,
+        'imported': 0,
+        'duplicates': 0,
+        'skipped': 0,
+        'errors': [],
+        'elapsed': 0.0,
+        'rate': 0.0,
+    }
+    start = time.perf_counter()
+    batch = []
+
+    def flush():
+        inserted = db_manager.add_questions_batch(batch)
+        stats['imported'] += inserted
+        stats['duplicates'] += len(batch) - inserted
+        batch.clear()
+
+        stats['elapsed'] = time.perf_counter() - start
+        stats['rate'] = stats['processed'] / stats['elapsed'] if stats['elapsed'] > 0 else 0.0
+        if progress:
+            progress(dict(stats))
+
+    # utf-8-sig: CSV из Excel начинается с BOM
+    with open_text(path, encoding='utf-8-sig' if file_format == 'csv' else 'utf-8') as file:
+        for record_number, record in enumerate(readers[file_format](file), start=1):
+            stats['processed'] += 1
+            try:
+                category, question_text, time_limit, difficulty, answers = validate_record(record)
+            except ImportRecordError as e:
+                stats['skipped'] += 1
+                if len(stats['errors']) < MAX_REPORTED_ERRORS:
+                    stats['errors'].append((record_number, str(e)))
+                continue
+
+            category_id = categories.get(category)
+            if category_id is None:
+                category_id = db_manager.add_category(category, "")
+                categories[category] = category_id
+
+            batch.append((category_id, question_text, time_limit, difficulty, answers))
+            if len(batch) >= batch_size:
+                flush()
+
+    flush()
+    return stats
@@ -0,0 +1,79 @@
+import random
+import threading
+from array import array
+
+
+class QuestionSampler:
+    """
+    Выбор случайных вопросов категории за O(k)
+
+    Для каждой категории один раз загружается компактный список ID вопросов
+    (array из 64-битных целых), после чего k различных ID выбираются через
+    random.sample без сортировки всей категории, как при ORDER BY RANDOM().
+    Кэш категории сбрасывается через invalidate() при изменении набора вопросов.
+    """
+
+    def __init__(self, load_ids):
+        """
+        Инициализирует выборщик вопросов
+
+        Args:
+            load_ids (callable): Функция load_ids(category_id), возвращающая
+                итерируемый набор ID вопросов категории
+        """
+        self._load_ids = load_ids
+        self._ids = {}
+        self._lock = threading.Lock()
+
+        # Увеличивается при каждом сбросе: список, загруженный до сброса, не сохраняется
+        self.generation = 0
+
+    def get_ids(self, category_id):
+        """
+        Возвращает кэшированный список ID вопросов категории
+
+        Args:
+            category_id (int): ID категории
+
+        Returns:
+            array: ID вопросов категории
+        """
+        ids = self._ids.get(category_id)
+        if ids is None:
+            generation = self.generation
+            ids = array('q', self._load_ids(category_id))
+            with self._lock:
+                if generation == self.generation:
+                    self._ids[category_id] = ids
+        return ids
+
+    def sample(self, category_id, k, rng=None):
+        """
+        Выбирает k различных ID вопросов категории
+
+        Args:
+            category_id (int): ID категории
+            k (int): Количество вопросов
+            rng (random.Random, optional): Генератор случайных чисел
+                (для воспроизводимых раундов)
+
+        Returns:
+            list: ID выбранных вопросов в случайном порядке
+        """
+        ids = self.get_ids(category_id)
+        rng = rng or random
+        return rng.sample(ids, min(k, len(ids)))
+
+    def invalidate(self, category_id=None):
+        """
+        Сбрасывает кэш ID вопросов
+
+        Args:
+            category_id (int, optional): ID категории. Если не указан, сбрасывается весь кэш.
+        """
+        with self._lock:
+            self.generation += 1
+            if category_id is None:
+                self._ids.clear()
+            else:
+                self._ids.pop(category_id, None)
@@ -0,0 +1,79 @@
+"""
+Проверка миграций схемы на базах данных старых версий
+
+Запуск из каталога Tkinter/Quiz:
+    python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_connection import ConnectionManager  # noqa: E402
+from db_migrations import MIGRATIONS, SCHEMA_VERSION, UNCATEGORIZED_NAME, run_migrations  # noqa: E402
+
+
+def migrate_to(connections, target_version):
+    """Применяет миграции до версии target_version включительно (состояние старой базы)"""
+    for version, _, migrate in MIGRATIONS:
+        if version > target_version:
+            break
+        with connections.transaction(immediate=True) as cursor:
+            migrate(cursor)
+            cursor.execute(f"PRAGMA user_version = {version}")
+
+
+class ForeignKeysMigrationTest(unittest.TestCase):
+    """Миграция 7: внешние ключи и NOT NULL для Questions.category_id"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.connections = ConnectionManager(os.path.join(self.tmp_dir.name, 'quiz.db'))
+        migrate_to(self.connections, 6)
+
+    def tearDown(self):
+        self.connections.close_all()
+        self.tmp_dir.cleanup()
+
+    def add_question(self, category_id, text):
+        with self.connections.transaction() as cursor:
+            cursor.execute("INSERT INTO Questions (category_id, question_text) VALUES (?, ?)",
+                           (category_id, text))
+            question_id = cursor.lastrowid
+            cursor.executemany("INSERT INTO Answers (question_id, answer_text, is_correct) VALUES (?, ?, ?)",
+                               [(question_id, "Да", 1), (question_id, "Нет", 0)])
+        return question_id
+
+    def fetch(self, sql, *params):
+        cursor = self.connections.cursor()
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+    def test_uncategorized_question_is_kept(self):
+        question_id = self.add_question(None, "Вопрос без рубрики")
+
+        self.assertEqual(run_migrations(self.connections), [7])
+        self.assertEqual(self.fetch("PRAGMA user_version"), [(SCHEMA_VERSION,)])
+
+        rows = self.fetch('''
+        SELECT c.name FROM Questions q JOIN Categories c ON c.category_id = q.category_id
+        WHERE q.question_id = ?
+        ''', question_id)
+        self.assertEqual(rows, [(UNCATEGORIZED_NAME,)])
+        self.assertEqual(len(self.fetch("SELECT * FROM Answers WHERE question_id = ?", question_id)), 2)
+        self.assertEqual(self.fetch("PRAGMA foreign_key_check"), [])
+
+    def test_orphaned_rows_are_removed(self):
+        question_id = self.add_question(10 ** 6, "Вопрос удаленной рубрики")
+
+        self.assertEqual(run_migrations(self.connections), [7])
+
+        self.assertEqual(self.fetch("SELECT * FROM Questions WHERE question_id = ?", question_id), [])
+        self.assertEqual(self.fetch("SELECT * FROM Answers WHERE question_id = ?", question_id), [])
+        self.assertEqual(self.fetch("SELECT * FROM Categories WHERE name = ?", UNCATEGORIZED_NAME), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
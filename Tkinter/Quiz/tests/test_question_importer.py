@@ -0,0 +1,71 @@
+"""
+Проверка чтения и проверки записей импорта вопросов
+
+Запуск из каталога Tkinter/Quiz:
+    python -m pytest tests
+"""
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_importer import (ImportRecordError, iter_json_records,  # noqa: E402
+                               iter_jsonl_records, validate_record)
+
+
+def valid_record(**fields):
+    record = {"category": "История", "question": "Текст вопроса", "answers": ["Да", "Нет"], "correct": 1}
+    record.update(fields)
+    return record
+
+
+class JsonRecordsTest(unittest.TestCase):
+    """Потоковое чтение массива JSON"""
+
+    def test_values_split_across_chunks(self):
+        # Маленький блок режет значения в любом месте, в том числе внутри чисел
+        text = '[1234, -12.5e-3 ,true, null, "строка", {"answers": [1, 2]}, 1.5]'
+        for chunk_size in range(1, 10):
+            with self.subTest(chunk_size=chunk_size):
+                records = list(iter_json_records(io.StringIO(text), chunk_size=chunk_size))
+                self.assertEqual(records, json.loads(text))
+
+    def test_truncated_file(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_records(io.StringIO('[{"a": 1}, '), chunk_size=4))
+
+
+class JsonlRecordsTest(unittest.TestCase):
+    """Чтение JSONL"""
+
+    def test_malformed_line_is_reported(self):
+        text = '{"a": 1}\n\n{"a": \n{"a": 3}\n'
+        records = list(iter_jsonl_records(io.StringIO(text)))
+
+        self.assertEqual(records[0], {"a": 1})
+        self.assertIsInstance(records[1], ImportRecordError)
+        self.assertIn("строка 3", str(records[1]))
+        self.assertEqual(records[2], {"a": 3})
+
+
+class ValidateRecordTest(unittest.TestCase):
+    """Проверка записи"""
+
+    def test_defaults(self):
+        _, _, time_limit, difficulty, answers = validate_record(valid_record(time_limit="", difficulty=None))
+        self.assertEqual((time_limit, difficulty), (30, 1.0))
+        self.assertEqual(answers, [("Да", True), ("Нет", False)])
+
+    def test_invalid_records(self):
+        for fields in ({"time_limit": 0}, {"time_limit": "0"}, {"difficulty": 0},
+                       {"answers": ["Да"]}, {"answers": ["1", "2", "3", "4", "5"]}, {"correct": 3}):
+            with self.subTest(fields=fields):
+                with self.assertRaises(ImportRecordError):
+                    validate_record(valid_record(**fields))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,14 @@
+import sqlite3
 import tkinter as tk
-from tkinter import ttk, messagebox
-from db_manager import (get_all_categories, get_questions_for_category,
+from tkinter import ttk, messagebox, filedialog
+from db_manager import (get_all_categories, get_questions_page,
                         get_answers_for_question, add_category, update_category,
-                        delete_category, add_question, update_question,
-                        update_answer, delete_question)
+                        delete_category, save_question_bundle, update_questions_bulk,
+                        delete_question, search_questions)
+from question_importer import import_questions
+from data_exporter import export_questions, export_history
+from ui.virtual_list import PagedListbox
+from utils.constants import ADMIN_QUESTIONS_PAGE_SIZE, MIN_ANSWERS, MAX_ANSWERS
 
 
 class AdminPanel(tk.Toplevel):
@@ -24,6 +29,9 @@ class AdminPanel(tk.Toplevel):
         self.notebook.add(self.categories_tab, text="Рубрики")
         self.notebook.add(self.questions_tab, text="Вопросы")
 
+        # Categories as (category_id, name, description), loaded in the background
+        self.categories = []
+
         # Setup each tab
         self.setup_categories_tab()
         self.setup_questions_tab()
@@ -79,9 +87,6 @@ class AdminPanel(tk.Toplevel):
         # Current selected category ID
         self.current_category_id = None
 
-        # Load categories
-        self.load_categories()
-
     def setup_questions_tab(self):
         # Split into frames
         top_frame = ttk.Frame(self.questions_tab)
@@ -97,6 +102,13 @@ class AdminPanel(tk.Toplevel):
         self.category_combobox.pack(side=tk.LEFT, padx=5)
         self.category_combobox.bind("<<ComboboxSelected>>", self.on_question_category_change)
 
+        # Full-text search over question and answer texts
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(top_frame, textvariable=self.search_var, width=30)
+        search_entry.pack(side=tk.RIGHT, padx=5)
+        search_entry.bind("<Return>", lambda event: self.search_questions())
+        ttk.Label(top_frame, text="Поиск:").pack(side=tk.RIGHT, padx=5)
+
         # Split main frame
         left_frame = ttk.Frame(main_frame)
         left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -108,15 +120,22 @@ class AdminPanel(tk.Toplevel):
         list_frame = ttk.LabelFrame(left_frame, text="Список вопросов")
         list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        scrollbar = ttk.Scrollbar(list_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.question_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, font=("Arial", 12))
-        self.question_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        scrollbar.config(command=self.question_listbox.yview)
+        # Questions are fetched page by page while scrolling
+        self.question_list = PagedListbox(
+            list_frame,
+            load_page=self.load_questions_page,
+            render=self.format_question,
+            key=lambda question: question.question_id,
+            page_size=ADMIN_QUESTIONS_PAGE_SIZE,
+            on_error=self.show_questions_error,
+            font=("Arial", 12),
+            selectmode=tk.EXTENDED,  # Shift/Ctrl for bulk changes
+            exportselection=False
+        )
+        self.question_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
         # Bind selection event
-        self.question_listbox.bind('<<ListboxSelect>>', self.on_question_select)
+        self.question_list.listbox.bind('<<ListboxSelect>>', self.on_question_select)
 
         # Buttons for question actions
         button_frame = ttk.Frame(left_frame)
@@ -127,6 +146,23 @@ class AdminPanel(tk.Toplevel):
                                                                                                     padx=5)
         ttk.Button(button_frame, text="Обновить список", command=self.load_questions).pack(side=tk.LEFT, padx=5)
 
+        # Bulk import of a question bank
+        io_frame = ttk.Frame(left_frame)
+        io_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.import_button = ttk.Button(io_frame, text="Импорт из файла...", command=self.import_questions_from_file)
+        self.import_button.pack(side=tk.LEFT, padx=5)
+
+        self.export_button = ttk.Menubutton(io_frame, text="Экспорт")
+        export_menu = tk.Menu(self.export_button, tearoff=False)
+        export_menu.add_command(label="Вопросы...", command=lambda: self.export_to_file(export_questions))
+        export_menu.add_command(label="История игр...", command=lambda: self.export_to_file(export_history))
+        self.export_button['menu'] = export_menu
+        self.export_button.pack(side=tk.LEFT, padx=5)
+
+        self.io_status_var = tk.StringVar()
+        ttk.Label(io_frame, textvariable=self.io_status_var).pack(side=tk.LEFT, padx=5)
+
         # Question edit form
         edit_frame = ttk.LabelFrame(right_frame, text="Редактирование вопроса")
         edit_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -158,7 +194,7 @@ class AdminPanel(tk.Toplevel):
         self.answer_vars = []
         self.correct_answer_var = tk.IntVar(value=0)
 
-        for i in range(4):
+        for i in range(MAX_ANSWERS):
             frame = ttk.Frame(answers_frame)
             frame.pack(fill=tk.X, padx=5, pady=2)
 
@@ -175,31 +211,82 @@ class AdminPanel(tk.Toplevel):
         ttk.Button(edit_frame, text="Сохранить изменения", command=self.save_question).grid(row=4, column=0,
                                                                                             columnspan=2, pady=10)
 
-        # Current selected question ID and answers
+        # Bulk changes for the selected questions
+        bulk_frame = ttk.LabelFrame(right_frame, text="Изменить выбранные вопросы")
+        bulk_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.bulk_category_enabled = tk.BooleanVar(value=False)
+        ttk.Checkbutton(bulk_frame, text="Рубрика:", variable=self.bulk_category_enabled).grid(row=0, column=0,
+                                                                                            sticky=tk.W, padx=5,
+                                                                                            pady=2)
+        self.bulk_category_var = tk.StringVar()
+        self.bulk_category_combobox = ttk.Combobox(bulk_frame, textvariable=self.bulk_category_var, width=25,
+                                                   state="readonly")
+        self.bulk_category_combobox.grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
+
+        self.bulk_time_enabled = tk.BooleanVar(value=False)
+        ttk.Checkbutton(bulk_frame, text="Время (сек):", variable=self.bulk_time_enabled).grid(row=1, column=0,
+                                                                                             sticky=tk.W, padx=5,
+                                                                                             pady=2)
+        self.bulk_time_var = tk.IntVar(value=30)
+        ttk.Spinbox(bulk_frame, from_=10, to=60, textvariable=self.bulk_time_var, width=5).grid(row=1, column=1,
+                                                                                                sticky=tk.W, padx=5,
+                                                                                                pady=2)
+
+        self.bulk_difficulty_enabled = tk.BooleanVar(value=False)
+        ttk.Checkbutton(bulk_frame, text="Сложность:", variable=self.bulk_difficulty_enabled).grid(row=2, column=0,
+                                                                                                 sticky=tk.W,
+                                                                                                 padx=5, pady=2)
+        self.bulk_difficulty_var = tk.DoubleVar(value=1.0)
+        ttk.Spinbox(bulk_frame, from_=1.0, to=2.0, increment=0.1, textvariable=self.bulk_difficulty_var,
+                    width=5).grid(row=2, column=1, sticky=tk.W, padx=5, pady=2)
+
+        self.bulk_button = ttk.Button(bulk_frame, text="Применить к выбранным (0)", command=self.apply_bulk_changes,
+                                      state=tk.DISABLED)
+        self.bulk_button.grid(row=3, column=0, columnspan=2, pady=5)
+
+        # Current selected question ID, its category and answers
         self.current_question_id = None
+        self.current_question_category_id = None
         self.current_answers = []
 
-        # Load categories for dropdown
-        self.load_category_dropdown()
+        # Category shown in the questions list and the id of the latest search request
+        self.questions_category_id = None
+        self.search_request_id = 0
+
+        # Load categories for the listbox and the dropdowns
+        self.load_categories()
 
     def load_categories(self):
-        """Load categories into the listbox"""
-        self.category_listbox.delete(0, tk.END)
-        self.categories = get_all_categories()
+        """Load categories in the background"""
+        self.master.db.submit(
+            get_all_categories,
+            callback=self.show_categories,
+            errback=lambda e: self.show_error(f"Не удалось загрузить рубрики: {e}"),
+            owner=self
+        )
+
+    def show_categories(self, categories):
+        """Fill the categories listbox and the dropdowns on the questions tab"""
+        self.categories = categories
 
+        self.category_listbox.delete(0, tk.END)
         for category_id, name, description in self.categories:
             self.category_listbox.insert(tk.END, name)
 
-    def load_category_dropdown(self):
-        """Load categories into the dropdown on the questions tab"""
-        self.categories = get_all_categories()
         category_names = [name for _, name, _ in self.categories]
         self.category_combobox['values'] = category_names
+        self.bulk_category_combobox['values'] = category_names
 
-        if category_names:
+        # Keep the category shown on the questions tab if it still exists
+        if category_names and self.question_category_var.get() not in category_names:
             self.category_combobox.current(0)
             self.on_question_category_change(None)
 
+    def show_error(self, message):
+        """Show an error message over the panel"""
+        messagebox.showerror("Ошибка", message, parent=self)
+
     def on_category_select(self, event):
         """Handle category selection in the listbox"""
         selection = self.category_listbox.curselection()
@@ -228,21 +315,25 @@ class AdminPanel(tk.Toplevel):
             messagebox.showerror("Ошибка", "Название рубрики не может быть пустым")
             return
 
-        try:
-            if self.current_category_id:
-                # Update existing category
-                update_category(self.current_category_id, name, description)
-                messagebox.showinfo("Успешно", "Рубрика обновлена")
-            else:
-                # Add new category
-                add_category(name, description)
-                messagebox.showinfo("Успешно", "Рубрика добавлена")
-
-            # Refresh lists
-            self.load_categories()
-            self.load_category_dropdown()
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось сохранить рубрику: {e}")
+        if self.current_category_id:
+            # Update existing category
+            save, args, message = update_category, (self.current_category_id, name, description), "Рубрика обновлена"
+        else:
+            # Add new category
+            save, args, message = add_category, (name, description), "Рубрика добавлена"
+
+        self.master.db.submit(
+            save,
+            *args,
+            callback=lambda _: self.on_category_saved(message),
+            errback=lambda e: self.show_error(f"Не удалось сохранить рубрику: {e}"),
+            owner=self
+        )
+
+    def on_category_saved(self, message):
+        """Report a saved category and refresh lists"""
+        messagebox.showinfo("Успешно", message, parent=self)
+        self.load_categories()
 
     def delete_selected_category(self):
         """Delete the selected category"""
@@ -251,75 +342,160 @@ class AdminPanel(tk.Toplevel):
             return
 
         if not messagebox.askyesno("Подтверждение",
-                                   "Вы уверены, что хотите удалить эту рубрику? Все вопросы и ответы в этой рубрике также будут удалены."):
+                                   "Вы уверены, что хотите удалить эту рубрику? Все вопросы и ответы в этой рубрике также будут удалены. История игр и статистика сохранятся."):
             return
 
-        try:
-            delete_category(self.current_category_id)
-            messagebox.showinfo("Успешно", "Рубрика удалена")
+        self.master.db.submit(
+            delete_category,
+            self.current_category_id,
+            callback=self.on_category_deleted,
+            errback=lambda e: self.show_error(f"Не удалось удалить рубрику: {e}"),
+            owner=self
+        )
 
-            # Refresh lists
-            self.current_category_id = None
-            self.category_name_var.set("")
-            self.category_desc_var.set("")
-            self.load_categories()
-            self.load_category_dropdown()
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось удалить рубрику: {e}")
+    def on_category_deleted(self, _):
+        """Report a deleted category and refresh lists"""
+        messagebox.showinfo("Успешно", "Рубрика удалена", parent=self)
+
+        self.current_category_id = None
+        self.category_name_var.set("")
+        self.category_desc_var.set("")
+        self.load_categories()
 
     def on_question_category_change(self, event):
         """Handle category selection in the questions tab"""
+        self.search_var.set("")
         self.load_questions()
 
     def load_questions(self):
         """Load questions for the selected category"""
-        self.question_listbox.delete(0, tk.END)
+        self.search_request_id += 1
+        self.bulk_button.config(text="Применить к выбранным (0)", state=tk.DISABLED)
 
-        selected_category = self.question_category_var.get()
-        if not selected_category:
+        self.questions_category_id = self.get_selected_category_id()
+        if not self.questions_category_id:
+            self.question_list.clear()
             return
 
-        # Find category ID
-        category_id = None
-        for cat_id, name, _ in self.categories:
-            if name == selected_category:
-                category_id = cat_id
-                break
+        # The list requests the first page and the next ones while scrolling
+        self.question_list.reset()
+
+    def load_questions_page(self, after_id, page_size, callback, errback):
+        """Fetch one page of the selected category in the background"""
+        self.master.db.submit(
+            get_questions_page,
+            self.questions_category_id,
+            after_id,
+            page_size,
+            callback=callback,
+            errback=errback,
+            owner=self
+        )
+
+    @staticmethod
+    def format_question(question):
+        """List entry for a question; long questions are truncated"""
+        question_text = question.question_text
+        return question_text if len(question_text) < 50 else question_text[:47] + "..."
+
+    @staticmethod
+    def format_search_result(question_snippet, answers_snippet):
+        """List entry for a search match, matched words are shown in brackets"""
+        # Show the answers only when the match is there
+        if '[' in (answers_snippet or '') and '[' not in question_snippet:
+            return f"{question_snippet}  ({answers_snippet})"
+        return question_snippet
+
+    def search_questions(self):
+        """Search questions in all categories; an empty query shows the selected category again"""
+        text = self.search_var.get().strip()
+        if not text:
+            self.load_questions()
+            return
 
-        if not category_id:
+        self.search_request_id += 1
+        request_id = self.search_request_id
+        self.question_list.show_message("Поиск...")
+
+        self.master.db.submit(
+            search_questions,
+            text,
+            callback=lambda results: self.show_search_results(request_id, results),
+            errback=lambda e: self.show_search_error(request_id, e),
+            owner=self
+        )
+
+    def show_search_results(self, request_id, results):
+        """Show search matches in the questions list"""
+        # Ignore stale results if another search or category was requested meanwhile
+        if request_id != self.search_request_id:
             return
 
-        # Load questions for this category
-        self.questions = get_questions_for_category(category_id, limit=100)  # Get all questions
+        # The list holds the questions themselves, snippets are only used for display
+        snippets = {question.question_id: (question_snippet, answers_snippet)
+                    for question, question_snippet, answers_snippet in results}
+        self.question_list.set_rows(
+            [question for question, _, _ in results],
+            render=lambda question: self.format_search_result(*snippets[question.question_id]),
+            empty_message="Ничего не найдено"
+        )
+
+    def show_search_error(self, request_id, error):
+        """Handle a failed search"""
+        if request_id != self.search_request_id:
+            return
+
+        self.question_list.clear()
+        self.show_questions_error(error)
 
-        for question_id, _, question_text, _, _ in self.questions:
-            # Truncate long questions for display
-            display_text = question_text if len(question_text) < 50 else question_text[:47] + "..."
-            self.question_listbox.insert(tk.END, display_text)
+    def show_questions_error(self, error):
+        """Handle a failed question load"""
+        messagebox.showerror("Ошибка", f"Не удалось загрузить вопросы: {error}", parent=self)
 
     def on_question_select(self, event):
         """Handle question selection in the listbox"""
-        selection = self.question_listbox.curselection()
-        if not selection:
+        selected = self.question_list.selected_rows()
+        self.bulk_button.config(text=f"Применить к выбранным ({len(selected)})",
+                                state=tk.NORMAL if selected else tk.DISABLED)
+
+        # The edit form shows a question only when exactly one is selected
+        if len(selected) != 1:
             return
 
-        index = selection[0]
-        question_id, category_id, question_text, time_limit, difficulty = self.questions[index]
+        question = selected[0]
+
+        self.current_question_id = question.question_id
+        self.current_question_category_id = question.category_id
+        self.question_text_var.set(question.question_text)
+        self.time_limit_var.set(question.time_limit)
+        self.difficulty_var.set(question.difficulty_level)
 
-        self.current_question_id = question_id
-        self.question_text_var.set(question_text)
-        self.time_limit_var.set(time_limit)
-        self.difficulty_var.set(difficulty)
+        # Load answers; None until they arrive, so the form cannot be saved without them
+        self.current_answers = None
+        for answer_var in self.answer_vars:
+            answer_var.set("")
+        self.master.db.submit(
+            get_answers_for_question,
+            question.question_id,
+            callback=lambda answers: self.show_answers(question.question_id, answers),
+            errback=lambda e: self.show_error(f"Не удалось загрузить ответы: {e}"),
+            owner=self
+        )
+
+    def show_answers(self, question_id, answers):
+        """Fill the answer fields of the edited question"""
+        # Another question was selected meanwhile
+        if question_id != self.current_question_id:
+            return
 
-        # Load answers
-        self.current_answers = get_answers_for_question(question_id)
+        self.current_answers = answers
 
         # Reset all answer fields
         for i, (answer_var, entry) in enumerate(zip(self.answer_vars, self.answer_entries)):
             if i < len(self.current_answers):
-                answer_id, _, answer_text, is_correct = self.current_answers[i]
-                answer_var.set(answer_text)
-                if is_correct:
+                answer = self.current_answers[i]
+                answer_var.set(answer.answer_text)
+                if answer.is_correct:
                     self.correct_answer_var.set(i)
             else:
                 answer_var.set("")
@@ -327,6 +503,7 @@ class AdminPanel(tk.Toplevel):
     def add_new_question(self):
         """Add a new question"""
         self.current_question_id = None
+        self.current_question_category_id = None
         self.question_text_var.set("")
         self.time_limit_var.set(30)
         self.difficulty_var.set(1.0)
@@ -347,50 +524,130 @@ class AdminPanel(tk.Toplevel):
             messagebox.showerror("Ошибка", "Текст вопроса не может быть пустым")
             return
 
-        # Validate answers
+        if self.current_answers is None:
+            messagebox.showerror("Ошибка", "Ответы вопроса еще загружаются", parent=self)
+            return
+
+        # The form has MAX_ANSWERS fields: saving a question with more answers
+        # would silently delete the ones that are not shown
+        if len(self.current_answers) > MAX_ANSWERS:
+            messagebox.showerror("Ошибка", f"У вопроса больше {MAX_ANSWERS} вариантов ответа, "
+                                           f"его нельзя редактировать в этой форме")
+            return
+
+        # Validate answers: empty fields are dropped, so answers can be removed and added
         answers = []
         correct_index = self.correct_answer_var.get()
 
         for i, answer_var in enumerate(self.answer_vars):
             answer_text = answer_var.get().strip()
             if not answer_text:
-                messagebox.showerror("Ошибка", f"Вариант ответа {i + 1} не может быть пустым")
+                if i == correct_index:
+                    messagebox.showerror("Ошибка", "Правильный вариант ответа не может быть пустым")
+                    return
+                continue
+
+            # Fields are matched to the loaded answers by position
+            answer_id = self.current_answers[i].answer_id if i < len(self.current_answers) else None
+            answers.append((answer_id, answer_text, i == correct_index))
+
+        if len(answers) < MIN_ANSWERS:
+            messagebox.showerror("Ошибка", f"Нужно минимум {MIN_ANSWERS} варианта ответа")
+            return
+
+        if self.current_question_id:
+            category_id = self.current_question_category_id
+        else:
+            # New questions go to the selected category
+            category_id = self.get_selected_category_id()
+            if not category_id:
+                messagebox.showerror("Ошибка", "Не выбрана рубрика")
                 return
-            answers.append((answer_text, i == correct_index))
 
-        try:
-            if self.current_question_id:
-                # Update existing question
-                update_question(self.current_question_id, question_text, time_limit, difficulty)
+        # The question and all its answers are saved in one transaction
+        message = "Вопрос обновлен" if self.current_question_id else "Вопрос добавлен"
+        self.master.db.submit(
+            save_question_bundle,
+            self.current_question_id,
+            category_id,
+            question_text,
+            time_limit,
+            difficulty,
+            answers,
+            callback=lambda _: self.on_question_saved(message),
+            errback=self.on_question_save_failed,
+            owner=self
+        )
+
+    def on_question_saved(self, message):
+        """Report a saved question and refresh the list"""
+        messagebox.showinfo("Успешно", message, parent=self)
+        self.load_questions()
+        self.add_new_question()  # Reset form
 
-                # Update answers
-                for i, (answer_text, is_correct) in enumerate(answers):
-                    if i < len(self.current_answers):
-                        answer_id = self.current_answers[i][0]
-                        update_answer(answer_id, answer_text, is_correct)
+    def on_question_save_failed(self, error):
+        """Handle a failed question save"""
+        if isinstance(error, sqlite3.IntegrityError):
+            self.show_error("Такой вопрос уже есть в этой рубрике")
+        else:
+            self.show_error(f"Не удалось сохранить вопрос: {error}")
 
-                messagebox.showinfo("Успешно", "Вопрос обновлен")
-            else:
-                # Add new question
-                # Get selected category
-                selected_category = self.question_category_var.get()
-                category_id = None
-                for cat_id, name, _ in self.categories:
-                    if name == selected_category:
-                        category_id = cat_id
-                        break
-
-                if not category_id:
-                    messagebox.showerror("Ошибка", "Не выбрана рубрика")
-                    return
+    def get_selected_category_id(self):
+        """ID of the category selected on the questions tab, or None"""
+        selected_category = self.question_category_var.get()
+        for cat_id, name, _ in self.categories:
+            if name == selected_category:
+                return cat_id
+        return None
+
+    def apply_bulk_changes(self):
+        """Apply the checked bulk changes to all selected questions in one statement"""
+        question_ids = [question.question_id for question in self.question_list.selected_rows()]
+        if not question_ids:
+            messagebox.showerror("Ошибка", "Не выбраны вопросы", parent=self)
+            return
 
-                add_question(category_id, question_text, time_limit, difficulty, answers)
-                messagebox.showinfo("Успешно", "Вопрос добавлен")
+        changes = {}
+        if self.bulk_category_enabled.get():
+            category_name = self.bulk_category_var.get()
+            category_id = next((cat_id for cat_id, name, _ in self.categories if name == category_name), None)
+            if category_id is None:
+                messagebox.showerror("Ошибка", "Не выбрана рубрика", parent=self)
+                return
+            changes['category_id'] = category_id
+        if self.bulk_time_enabled.get():
+            changes['time_limit'] = self.bulk_time_var.get()
+        if self.bulk_difficulty_enabled.get():
+            changes['difficulty_level'] = self.bulk_difficulty_var.get()
+
+        if not changes:
+            messagebox.showerror("Ошибка", "Отметьте, что нужно изменить", parent=self)
+            return
 
-            # Refresh list
-            self.load_questions()
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось сохранить вопрос: {e}")
+        self.bulk_button.config(state=tk.DISABLED)
+        self.master.db.submit(
+            update_questions_bulk,
+            question_ids,
+            callback=self.on_bulk_changes_applied,
+            errback=self.on_bulk_changes_failed,
+            owner=self,
+            **changes
+        )
+
+    def on_bulk_changes_applied(self, updated):
+        """Report bulk update results and refresh the list"""
+        messagebox.showinfo("Успешно", f"Изменено вопросов: {updated}", parent=self)
+        self.load_questions()
+        self.add_new_question()  # Reset form
+
+    def on_bulk_changes_failed(self, error):
+        """Handle a failed bulk update"""
+        self.bulk_button.config(state=tk.NORMAL)
+        if isinstance(error, sqlite3.IntegrityError):
+            messagebox.showerror("Ошибка", "В выбранной рубрике уже есть такие вопросы, ничего не изменено",
+                                 parent=self)
+        else:
+            messagebox.showerror("Ошибка", f"Не удалось изменить вопросы: {error}", parent=self)
 
     def delete_selected_question(self):
         """Delete the selected question"""
@@ -401,13 +658,109 @@ class AdminPanel(tk.Toplevel):
         if not messagebox.askyesno("Подтверждение", "Вы уверены, что хотите удалить этот вопрос?"):
             return
 
-        try:
-            delete_question(self.current_question_id)
-            messagebox.showinfo("Успешно", "Вопрос удален")
+        self.master.db.submit(
+            delete_question,
+            self.current_question_id,
+            callback=self.on_question_deleted,
+            errback=lambda e: self.show_error(f"Не удалось удалить вопрос: {e}"),
+            owner=self
+        )
+
+    def on_question_deleted(self, _):
+        """Report a deleted question and refresh the list"""
+        messagebox.showinfo("Успешно", "Вопрос удален", parent=self)
+        self.load_questions()
+        self.add_new_question()  # Reset form
+
+    def import_questions_from_file(self):
+        """Import questions from a CSV/JSON/JSONL file in the background"""
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Выберите файл с вопросами",
+            filetypes=[("Банк вопросов", "*.csv *.json *.jsonl *.ndjson *.gz"), ("Все файлы", "*.*")]
+        )
+        if not path:
+            return
 
-            # Refresh list
-            self.current_question_id = None
-            self.load_questions()
-            self.add_new_question()  # Reset form
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось удалить вопрос: {e}")
\ No newline at end of file
+        db = self.master.io_worker
+        self.import_button.config(state=tk.DISABLED)
+        self.io_status_var.set("Импорт...")
+
+        db.submit(
+            import_questions,
+            path,
+            # Progress is reported from the worker thread, so hand it over to Tk first
+            progress=lambda stats: db.notify(self.show_import_progress, stats, owner=self),
+            callback=self.on_import_finished,
+            errback=self.on_import_failed,
+            owner=self
+        )
+
+    def show_import_progress(self, stats):
+        """Show import progress"""
+        self.io_status_var.set(f"Импорт: {stats['imported']} вопросов, {stats['rate']:.0f} записей/с")
+
+    def on_import_finished(self, stats):
+        """Report import results and refresh lists"""
+        self.import_button.config(state=tk.NORMAL)
+        self.io_status_var.set("")
+
+        message = (f"Добавлено вопросов: {stats['imported']}\n"
+                   f"Уже были в базе: {stats['duplicates']}\n"
+                   f"Пропущено записей: {stats['skipped']}\n"
+                   f"Скорость: {stats['rate']:.0f} записей/с")
+        if stats['errors']:
+            details = "\n".join(f"Запись {number}: {error}" for number, error in stats['errors'][:10])
+            message += f"\n\nОшибки:\n{details}"
+        messagebox.showinfo("Импорт завершен", message, parent=self)
+
+        # New categories may have been created
+        self.load_categories()
+
+    def on_import_failed(self, error):
+        """Report a failed import"""
+        self.import_button.config(state=tk.NORMAL)
+        self.io_status_var.set("")
+        messagebox.showerror("Ошибка", f"Не удалось импортировать вопросы: {error}", parent=self)
+
+    def export_to_file(self, export):
+        """Export questions or game history to a file in the background"""
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Сохранить как",
+            defaultextension=".jsonl.gz",
+            filetypes=[("JSONL (сжатый)", "*.jsonl.gz"), ("JSONL", "*.jsonl"), ("CSV", "*.csv"), ("JSON", "*.json")]
+        )
+        if not path:
+            return
+
+        db = self.master.io_worker
+        self.export_button.config(state=tk.DISABLED)
+        self.io_status_var.set("Экспорт...")
+
+        db.submit(
+            export,
+            path,
+            progress=lambda stats: db.notify(self.show_export_progress, stats, owner=self),
+            callback=self.on_export_finished,
+            errback=self.on_export_failed,
+            owner=self
+        )
+
+    def show_export_progress(self, stats):
+        """Show export progress"""
+        self.io_status_var.set(f"Экспорт: {stats['exported']} записей, {stats['rate']:.0f} записей/с")
+
+    def on_export_finished(self, stats):
+        """Report export results"""
+        self.export_button.config(state=tk.NORMAL)
+        self.io_status_var.set("")
+        messagebox.showinfo("Экспорт завершен",
+                            f"Выгружено записей: {stats['exported']}\nСкорость: {stats['rate']:.0f} записей/с",
+                            parent=self)
+
+    def on_export_failed(self, error):
+        """Report a failed export"""
+        self.export_button.config(state=tk.NORMAL)
+        self.io_status_var.set("")
+        messagebox.showerror("Ошибка", f"Не удалось выполнить экспорт: {error}", parent=self)
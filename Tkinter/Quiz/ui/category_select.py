@@ -9,6 +9,9 @@ class CategorySelectScreen(tk.Frame):
         self.master = master
         self.start_game_callback = start_game_callback
 
+        # Номер последнего запроса категорий: ответы на более ранние запросы игнорируются
+        self.request_id = 0
+
         self.setup_ui()
 
     def setup_ui(self):
@@ -22,16 +25,52 @@ class CategorySelectScreen(tk.Frame):
         title_label.pack(pady=20)
 
         # Основной контейнер для категорий
-        categories_container = tk.Frame(self, bg="#f0f0f0")
-        categories_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        self.categories_container = tk.Frame(self, bg="#f0f0f0")
+        self.categories_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+        # Кнопка "Назад"
+        back_button = ttk.Button(
+            self,
+            text="Назад",
+            command=self.master.show_main_menu
+        )
+        back_button.pack(pady=20)
+
+    def refresh(self, data=None):
+        """Перезагружает список категорий при каждом показе экрана"""
+        for widget in self.categories_container.winfo_children():
+            widget.destroy()
+
+        # Заглушка на время загрузки категорий
+        self.loading_label = tk.Label(
+            self.categories_container,
+            text="Загрузка категорий...",
+            font=("Arial", 12),
+            bg="#f0f0f0"
+        )
+        self.loading_label.pack(pady=20)
+
+        # Получение списка категорий из базы данных в фоновом потоке
+        self.request_id += 1
+        request_id = self.request_id
+        self.master.db.submit(
+            get_all_categories,
+            callback=lambda categories: self.show_categories(categories, request_id),
+            errback=lambda error: self.show_load_error(error, request_id),
+            owner=self
+        )
 
-        # Получение списка категорий из базы данных
-        categories = get_all_categories()
+    def show_categories(self, categories, request_id=None):
+        """Отображает загруженные категории вместо заглушки"""
+        if request_id is not None and request_id != self.request_id:
+            return
+
+        self.loading_label.destroy()
 
         # Создание карточек для каждой категории
         for cat_id, name, description in categories:
             category_card = tk.Frame(
-                categories_container,
+                self.categories_container,
                 bg="#ffffff",
                 relief=tk.RAISED,
                 bd=1
@@ -66,13 +105,13 @@ class CategorySelectScreen(tk.Frame):
             )
             select_button.pack(side=tk.RIGHT, padx=15, pady=10)
 
-        # Кнопка "Назад"
-        back_button = ttk.Button(
-            self,
-            text="Назад",
-            command=self.master.show_main_menu
-        )
-        back_button.pack(pady=20)
+    def show_load_error(self, error, request_id=None):
+        """Отображает сообщение об ошибке загрузки категорий"""
+        if request_id is not None and request_id != self.request_id:
+            return
+
+        print(f"Ошибка при загрузке категорий: {error}")
+        self.loading_label.config(text="Не удалось загрузить категории")
 
     def select_category(self, category_id, category_name):
         """Обработчик выбора категории"""
@@ -199,10 +199,32 @@ class ProfileScreen(tk.Frame):
             self.save_callback(username, self.avatar_path)
 
     def load_statistics(self):
-        """Загружает и отображает статистику пользователя"""
-        try:
-            stats = get_user_statistics(self.user_id)
+        """Запускает загрузку статистики пользователя в фоновом потоке"""
+        # Заглушка на время загрузки
+        loading_label = tk.Label(
+            self.general_stats_frame,
+            text="Загрузка статистики...",
+            font=("Arial", 12),
+            bg="#f0f0f0"
+        )
+        loading_label.pack(pady=50)
+
+        self.master.db.submit(
+            get_user_statistics,
+            self.user_id,
+            callback=self.show_statistics,
+            errback=self.show_statistics_error,
+            owner=self
+        )
 
+    def show_statistics_error(self, error):
+        """Обрабатывает ошибку загрузки статистики"""
+        print(f"Ошибка при загрузке статистики: {error}")
+        self.show_no_statistics_message()
+
+    def show_statistics(self, stats):
+        """Отображает загруженную статистику пользователя"""
+        try:
             # Проверяем, получены ли статистические данные
             if not stats or 'general' not in stats:
                 # Если статистики нет, показываем заглушку
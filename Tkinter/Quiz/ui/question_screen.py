@@ -1,32 +1,80 @@
+import math
+import time
 import tkinter as tk
-from tkinter import ttk
-from db_manager import get_questions_for_category, get_answers_for_question, save_game_results
+from tkinter import messagebox, ttk
+from db_manager import load_round, save_game_results
+from game_logic import GameSession
+from utils.constants import MAX_ANSWERS, TIMER_FPS
 
 
 class QuestionScreen(tk.Frame):
-    def __init__(self, master, category_id, category_name, finish_game_callback):
+    def __init__(self, master, finish_game_callback, cancel_game_callback, timer_fps=TIMER_FPS):
         super().__init__(master, bg="#f0f0f0")
         self.master = master
-        self.category_id = category_id
-        self.category_name = category_name
+        self.category_id = None
+        self.category_name = ""
         self.finish_game_callback = finish_game_callback
+        self.cancel_game_callback = cancel_game_callback
+        self.frame_interval = 1 / timer_fps
 
-        # Получение вопросов для выбранной категории
-        self.questions = get_questions_for_category(category_id, 10)
+        # Вопросы раунда (models.Round) появятся после фоновой загрузки
+        self.questions = []
+        self.current_question = None
+
+        # Игровая сессия ведет счет и записывает каждый ответ (создается в refresh)
+        self.session = None
 
         # Инициализация переменных для игры
         self.current_question_index = 0
-        self.correct_answers = 0
-        self.total_points = 0
+        self.question_started = 0.0
+        self.deadline = 0.0
+        self.shown_seconds = None
         self.timer_id = None
+        self.transition_id = None
+        self.round_request = 0
         self.answers = []
-        self.time_left = 0
 
         # Настройка интерфейса
         self.setup_ui()
 
-        # Загрузка первого вопроса
-        self.load_question()
+    def refresh(self, data):
+        """
+        Начинает новую игру; экран переиспользуется между раундами
+
+        Args:
+            data (dict): category_id, category_name
+        """
+        self.stop_timer()
+        if self.transition_id:
+            self.after_cancel(self.transition_id)
+            self.transition_id = None
+
+        self.category_id = data['category_id']
+        self.category_name = data['category_name']
+        self.category_label.config(text=f"Категория: {self.category_name}")
+        self.progress_label.config(text="")
+
+        self.session = GameSession(self.master.current_user_id, self.category_id)
+        self.questions = []
+        self.current_question = None
+        self.current_question_index = 0
+        self.answers = []
+        for button in self.answer_buttons:
+            button.config(text="", bg="#f0f0f0")
+
+        # Загрузка всего раунда (вопросы вместе с ответами) одним запросом в фоновом потоке,
+        # чтобы переход между вопросами не обращался к базе данных
+        self.show_loading()
+        self.round_request += 1
+        round_request = self.round_request
+        self.master.db.submit(
+            load_round,
+            self.category_id,
+            10,
+            callback=lambda game_round: self.on_round_loaded(game_round, round_request),
+            errback=lambda error: self.on_round_load_error(error, round_request),
+            owner=self
+        )
 
     def setup_ui(self):
         # Create styles for buttons
@@ -42,7 +90,7 @@ class QuestionScreen(tk.Frame):
         # Категория
         self.category_label = tk.Label(
             self.info_frame,
-            text=f"Категория: {self.category_name}",
+            text="",
             font=("Arial", 12),
             bg="#e0e0e0"
         )
@@ -97,7 +145,7 @@ class QuestionScreen(tk.Frame):
 
         # Using standard tk.Button instead of ttk.Button for easier styling
         self.answer_buttons = []
-        for i in range(4):
+        for i in range(MAX_ANSWERS):
             button = tk.Button(
                 self.answers_frame,
                 text="",
@@ -122,6 +170,33 @@ class QuestionScreen(tk.Frame):
         )
         self.skip_button.pack(side=tk.BOTTOM, pady=15)
 
+    def show_loading(self):
+        """Показывает заглушку, пока загружаются вопросы раунда"""
+        self.question_text.config(text="Загрузка вопросов...")
+        self.disable_answer_buttons()
+
+    def on_round_loaded(self, game_round, round_request=None):
+        """Начинает игру после загрузки вопросов раунда"""
+        # Ответ на запрос предыдущей игры
+        if round_request is not None and round_request != self.round_request:
+            return
+
+        self.questions = game_round
+        self.skip_button.config(state=tk.NORMAL)
+
+        # Загрузка первого вопроса (она же включает кнопки ответов)
+        self.load_question()
+
+    def on_round_load_error(self, error, round_request=None):
+        """Обрабатывает ошибку загрузки вопросов раунда"""
+        if round_request is not None and round_request != self.round_request:
+            return
+
+        # Игра не началась: результаты не сохраняем, чтобы ошибка базы данных
+        # не попала в историю игр и статистику как сыгранный раунд
+        messagebox.showerror("Ошибка", f"Не удалось загрузить вопросы: {error}", parent=self)
+        self.cancel_game_callback()
+
     def load_question(self):
         """Загружает текущий вопрос и варианты ответов"""
         if self.current_question_index >= len(self.questions):
@@ -129,8 +204,7 @@ class QuestionScreen(tk.Frame):
             return
 
         # Очистка предыдущего таймера, если есть
-        if self.timer_id:
-            self.after_cancel(self.timer_id)
+        self.stop_timer()
 
         # Обновляем индикатор прогресса
         self.progress_label.config(
@@ -138,52 +212,98 @@ class QuestionScreen(tk.Frame):
         )
 
         # Получаем данные текущего вопроса
-        question_data = self.questions[self.current_question_index]
-        question_id, _, question_text, time_limit, difficulty = question_data
+        question = self.current_question = self.questions[self.current_question_index]
 
         # Обновляем текст вопроса
-        self.question_text.config(text=question_text)
+        self.question_text.config(text=question.question_text)
 
-        # Получаем варианты ответов для текущего вопроса
-        self.answers = get_answers_for_question(question_id)
+        # Варианты ответов уже загружены и перемешаны вместе с раундом
+        self.answers = question.answers
 
-        # Перемешиваем варианты ответов и обновляем кнопки
-        for i, (answer_id, _, answer_text, _) in enumerate(self.answers):
-            self.answer_buttons[i].config(
-                text=answer_text,
+        # Обновляем кнопки: у вопроса от двух до четырех ответов, лишние кнопки скрываем,
+        # чтобы на них не остался текст предыдущего вопроса
+        for button in self.answer_buttons:
+            button.pack_forget()
+        for button, answer in zip(self.answer_buttons, self.answers):
+            button.config(
+                text=answer.answer_text,
                 state=tk.NORMAL,
                 bg="#f0f0f0"
             )
+            button.pack(fill=tk.X, pady=5, ipady=5)
+
+        # Запускаем таймер; время ответа отсчитывается от показа вопроса
+        self.start_timer(question.time_limit)
+
+    def start_timer(self, time_limit):
+        """
+        Запускает отсчет времени на вопрос
 
-        # Запускаем таймер
-        self.time_left = time_limit
+        Оставшееся время всегда вычисляется от крайнего срока по монотонным
+        часам, поэтому задержки обработки событий (загрузка изображений,
+        запросы к БД) не накапливаются, а лишь пропускают кадры анимации.
+
+        Args:
+            time_limit (int): Время на вопрос в секундах
+        """
+        self.stop_timer()
+        self.question_started = time.monotonic()
+        self.deadline = self.question_started + time_limit
+        self.shown_seconds = None
         self.timer_bar.config(maximum=time_limit, value=time_limit)
         self.update_timer()
 
+    def stop_timer(self):
+        """Останавливает отсчет времени"""
+        if self.timer_id:
+            self.after_cancel(self.timer_id)
+            self.timer_id = None
+
     def update_timer(self):
         """Обновляет отображение таймера и проверяет, не истекло ли время"""
-        if self.time_left > 0:
-            self.time_left -= 1
-            self.timer_label.config(text=f"Время: {self.time_left} сек")
-            self.timer_bar.config(value=self.time_left)
-            self.timer_id = self.after(1000, self.update_timer)
-        else:
+        self.timer_id = None
+        now = time.monotonic()
+        remaining = self.deadline - now
+
+        if remaining <= 0:
             # Время истекло
+            self.timer_bar.config(value=0)
             self.timer_label.config(text="Время истекло!")
             self.disable_answer_buttons()
-            self.after(1500, self.next_question)
+            self.session.record_answer(self.current_question, None, self.elapsed_ms())
+            self.transition_id = self.after(1500, self.next_question)
+            return
+
+        self.timer_bar.config(value=remaining)
+
+        # Надпись меняется раз в секунду - не перенастраиваем ее на каждом кадре
+        seconds = math.ceil(remaining)
+        if seconds != self.shown_seconds:
+            self.shown_seconds = seconds
+            self.timer_label.config(text=f"Время: {seconds} сек")
+
+        # Кадры привязаны к сетке от начала вопроса, а не к моменту предыдущего
+        # вызова: опоздавший кадр не сдвигает следующие
+        elapsed = now - self.question_started
+        next_frame = self.question_started + (int(elapsed / self.frame_interval) + 1) * self.frame_interval
+        delay = min(next_frame, self.deadline) - now
+        self.timer_id = self.after(max(1, math.ceil(delay * 1000)), self.update_timer)
 
     def check_answer(self, answer_index):
         """Проверяет правильность выбранного ответа"""
+        if answer_index >= len(self.answers):
+            return
+
         # Останавливаем таймер
-        if self.timer_id:
-            self.after_cancel(self.timer_id)
+        self.stop_timer()
 
         # Деактивируем все кнопки ответов
         self.disable_answer_buttons()
 
-        # Получаем выбранный ответ
-        _, _, _, is_correct = self.answers[answer_index]
+        # Записываем выбранный ответ в сессию, она же начисляет баллы
+        answer = self.answers[answer_index]
+        self.session.record_answer(self.current_question, answer, self.elapsed_ms())
+        is_correct = answer.is_correct
 
         # Выделяем выбранный ответ
         self.answer_buttons[answer_index].config(
@@ -192,24 +312,16 @@ class QuestionScreen(tk.Frame):
 
         # Показываем также правильный ответ, если выбран неправильный
         if not is_correct:
-            for i, (_, _, _, correct) in enumerate(self.answers):
-                if correct:
+            for i, answer in enumerate(self.answers):
+                if answer.is_correct:
                     self.answer_buttons[i].config(bg="#32CD32")
 
-        # Если ответ правильный, увеличиваем счетчики
-        if is_correct:
-            self.correct_answers += 1
-
-            # Расчет очков: базовые очки + бонус за скорость + множитель сложности
-            question_difficulty = self.questions[self.current_question_index][4]
-            base_points = 100
-            time_bonus = int((self.time_left / self.questions[self.current_question_index][3]) * 50)
-            points = int((base_points + time_bonus) * question_difficulty)
-
-            self.total_points += points
-
         # Переход к следующему вопросу через небольшую паузу
-        self.after(1500, self.next_question)
+        self.transition_id = self.after(1500, self.next_question)
+
+    def elapsed_ms(self):
+        """Возвращает время в миллисекундах, прошедшее с показа текущего вопроса"""
+        return int((time.monotonic() - self.question_started) * 1000)
 
     def disable_answer_buttons(self):
         """Деактивирует все кнопки ответов"""
@@ -220,27 +332,27 @@ class QuestionScreen(tk.Frame):
     def skip_question(self):
         """Пропускает текущий вопрос"""
         # Останавливаем таймер
-        if self.timer_id:
-            self.after_cancel(self.timer_id)
+        self.stop_timer()
 
         # Деактивируем кнопки
         self.disable_answer_buttons()
+        self.session.record_answer(self.current_question, None, self.elapsed_ms())
 
         # Показываем правильный ответ
-        for i, (_, _, _, is_correct) in enumerate(self.answers):
-            if is_correct:
+        for i, answer in enumerate(self.answers):
+            if answer.is_correct:
                 self.answer_buttons[i].config(bg="#32CD32")
 
         # Переход к следующему вопросу
-        self.after(1500, self.next_question)
+        self.transition_id = self.after(1500, self.next_question)
 
     def next_question(self):
         """Переходит к следующему вопросу"""
+        self.transition_id = None
         self.current_question_index += 1
 
-        # Восстанавливаем исходное состояние кнопок
-        for button in self.answer_buttons:
-            button.config(state=tk.NORMAL, bg="#f0f0f0")
+        # Кнопку пропуска включаем сразу, кнопки ответов включает load_question -
+        # только те, для которых у следующего вопроса есть варианты
         self.skip_button.config(state=tk.NORMAL)
 
         # Загружаем следующий вопрос
@@ -248,22 +360,23 @@ class QuestionScreen(tk.Frame):
 
     def finish_game(self):
         """Завершает игру и переходит к экрану результатов"""
-        # Сохраняем результаты в БД
-        try:
-            save_game_results(
-                self.master.current_user_id,
-                self.category_id,
-                self.total_points,
-                self.correct_answers,
-                len(self.questions)
-            )
-        except Exception as e:
-            print(f"Ошибка при сохранении результатов: {e}")
+        results = self.session.get_results()
+
+        # Сохраняем результаты в БД в фоновом потоке, не задерживая показ результатов
+        self.master.db.submit(
+            save_game_results,
+            results['user_id'],
+            results['category_id'],
+            results['total_points'],
+            results['correct_answers'],
+            results['total_questions'],
+            errback=lambda e: print(f"Ошибка при сохранении результатов: {e}")
+        )
 
         # Вызываем callback для отображения результатов
         self.finish_game_callback(
-            self.total_points,
-            self.correct_answers,
-            len(self.questions),
+            results['total_points'],
+            results['correct_answers'],
+            results['total_questions'],
             self.category_name
         )
\ No newline at end of file
@@ -3,14 +3,13 @@ from tkinter import ttk
 
 
 class ResultsScreen(tk.Frame):
-    def __init__(self, master, total_points, correct_answers, total_questions, category_name,
-                 return_to_menu_callback, play_again_callback):
+    def __init__(self, master, return_to_menu_callback, play_again_callback):
         super().__init__(master, bg="#f0f0f0")
         self.master = master
-        self.total_points = total_points
-        self.correct_answers = correct_answers
-        self.total_questions = total_questions
-        self.category_name = category_name
+        self.total_points = 0
+        self.correct_answers = 0
+        self.total_questions = 0
+        self.category_name = ""
         self.return_to_menu_callback = return_to_menu_callback
         self.play_again_callback = play_again_callback
 
@@ -31,58 +30,55 @@ class ResultsScreen(tk.Frame):
         results_container.pack(padx=50, pady=20)
 
         # Категория
-        category_label = tk.Label(
+        self.category_label = tk.Label(
             results_container,
-            text=f"Категория: {self.category_name}",
+            text="",
             font=("Arial", 14),
             bg="#ffffff",
             anchor=tk.W
         )
-        category_label.pack(fill=tk.X, pady=5)
+        self.category_label.pack(fill=tk.X, pady=5)
 
         # Разделительная линия
         separator = ttk.Separator(results_container, orient=tk.HORIZONTAL)
         separator.pack(fill=tk.X, pady=15)
 
         # Количество баллов
-        points_label = tk.Label(
+        self.points_label = tk.Label(
             results_container,
-            text=f"Набрано баллов: {self.total_points}",
+            text="",
             font=("Arial", 18, "bold"),
             bg="#ffffff",
             fg="#4CAF50"
         )
-        points_label.pack(pady=10)
+        self.points_label.pack(pady=10)
 
         # Количество правильных ответов
-        answers_label = tk.Label(
+        self.answers_label = tk.Label(
             results_container,
-            text=f"Правильных ответов: {self.correct_answers} из {self.total_questions}",
+            text="",
             font=("Arial", 14),
             bg="#ffffff"
         )
-        answers_label.pack(pady=5)
+        self.answers_label.pack(pady=5)
 
         # Процент правильных ответов
-        percentage = (self.correct_answers / self.total_questions) * 100 if self.total_questions > 0 else 0
-        percentage_label = tk.Label(
+        self.percentage_label = tk.Label(
             results_container,
-            text=f"Точность: {percentage:.1f}%",
+            text="",
             font=("Arial", 14),
             bg="#ffffff"
         )
-        percentage_label.pack(pady=5)
+        self.percentage_label.pack(pady=5)
 
         # Оценка результата
-        evaluation = self.evaluate_result(percentage)
-        evaluation_label = tk.Label(
+        self.evaluation_label = tk.Label(
             results_container,
-            text=evaluation,
+            text="",
             font=("Arial", 16, "bold"),
-            bg="#ffffff",
-            fg=self.get_evaluation_color(percentage)
+            bg="#ffffff"
         )
-        evaluation_label.pack(pady=15)
+        self.evaluation_label.pack(pady=15)
 
         # Контейнер для кнопок
         buttons_container = tk.Frame(self, bg="#f0f0f0")
@@ -104,6 +100,29 @@ class ResultsScreen(tk.Frame):
         )
         menu_button.pack(side=tk.LEFT, padx=10)
 
+    def refresh(self, data):
+        """
+        Показывает результаты завершенной игры
+
+        Args:
+            data (dict): total_points, correct_answers, total_questions, category_name
+        """
+        self.total_points = data['total_points']
+        self.correct_answers = data['correct_answers']
+        self.total_questions = data['total_questions']
+        self.category_name = data['category_name']
+
+        self.category_label.config(text=f"Категория: {self.category_name}")
+        self.points_label.config(text=f"Набрано баллов: {self.total_points}")
+        self.answers_label.config(text=f"Правильных ответов: {self.correct_answers} из {self.total_questions}")
+
+        percentage = (self.correct_answers / self.total_questions) * 100 if self.total_questions > 0 else 0
+        self.percentage_label.config(text=f"Точность: {percentage:.1f}%")
+        self.evaluation_label.config(
+            text=self.evaluate_result(percentage),
+            fg=self.get_evaluation_color(percentage)
+        )
+
     def evaluate_result(self, percentage):
         """Возвращает текстовую оценку результата на основе процента правильных ответов"""
         if percentage >= 90:
@@ -0,0 +1,137 @@
+import tkinter as tk
+
+
+class ScreenManager:
+    """
+    Переключение экранов приложения с повторным использованием виджетов
+
+    Экраны регистрируются под именами вместе с фабрикой, создающей экран.
+    Кэшируемый экран создается при первом показе, а при следующих лишь
+    получает новые данные через refresh(data), поэтому переходы между
+    экранами не пересоздают дерево виджетов. Некэшируемые экраны (например,
+    профиль с изображением аватара) уничтожаются сразу после ухода с них.
+    """
+
+    def __init__(self, master):
+        """
+        Инициализирует менеджер экранов
+
+        Args:
+            master: Окно, в котором показываются экраны
+        """
+        self.master = master
+        self.current = None
+        self.current_name = None
+
+        self._factories = {}
+        self._cached = {}
+
+        # Счетчики для проверки, что виджеты не накапливаются
+        self.created = 0
+        self.destroyed = 0
+
+    def register(self, name, factory, cache=True):
+        """
+        Регистрирует экран
+
+        Args:
+            name (str): Имя экрана
+            factory (callable): Функция без аргументов, создающая экран (tk.Frame)
+            cache (bool, optional): Сохранять экран для повторного показа. По умолчанию True.
+        """
+        self._factories[name] = (factory, cache)
+
+    def show(self, name, data=None):
+        """
+        Показывает экран, создавая его при необходимости
+
+        Если у экрана есть метод refresh, он вызывается с data при каждом
+        показе, в том числе сразу после создания.
+
+        Args:
+            name (str): Имя зарегистрированного экрана
+            data (dict, optional): Данные для экрана
+
+        Returns:
+            tk.Frame: Показанный экран
+        """
+        factory, cache = self._factories[name]
+
+        screen = self._cached.get(name)
+        if screen is None:
+            screen = factory()
+            self.created += 1
+            if cache:
+                self._cached[name] = screen
+
+        if screen is not self.current:
+            self._hide_current()
+
+        if hasattr(screen, 'refresh'):
+            screen.refresh(data)
+
+        screen.pack(fill=tk.BOTH, expand=True)
+        self.current = screen
+        self.current_name = name
+        return screen
+
+    def evict(self, name=None):
+        """
+        Уничтожает кэшированные экраны (кроме показанного в данный момент)
+
+        Args:
+            name (str, optional): Имя экрана. Если не указано, уничтожаются все скрытые экраны.
+        """
+        names = [name] if name is not None else list(self._cached)
+        for screen_name in names:
+            screen = self._cached.get(screen_name)
+            if screen is None or screen is self.current:
+                continue
+            del self._cached[screen_name]
+            self._destroy(screen)
+
+    def widget_count(self):
+        """
+        Возвращает общее количество виджетов в окне
+
+        Returns:
+            int: Количество виджетов, включая скрытые кэшированные экраны
+        """
+        count = 0
+        pending = list(self.master.winfo_children())
+        while pending:
+            widget = pending.pop()
+            count += 1
+            pending.extend(widget.winfo_children())
+        return count
+
+    def stats(self):
+        """
+        Возвращает счетчики для контроля памяти
+
+        Returns:
+            dict: cached (имена кэшированных экранов), created, destroyed, widgets
+        """
+        return {
+            'cached': sorted(self._cached),
+            'created': self.created,
+            'destroyed': self.destroyed,
+            'widgets': self.widget_count(),
+        }
+
+    def _hide_current(self):
+        """Скрывает текущий экран; некэшируемый экран уничтожается"""
+        screen = self.current
+        if screen is None:
+            return
+
+        self.current = None
+        self.current_name = None
+        if screen in self._cached.values():
+            screen.pack_forget()
+        else:
+            self._destroy(screen)
+
+    def _destroy(self, screen):
+        screen.destroy()
+        self.destroyed += 1
@@ -0,0 +1,174 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class PagedListbox(ttk.Frame):
+    """
+    Список с постраничной подгрузкой строк при прокрутке
+
+    Строки запрашиваются страницами через load_page(after_key, page_size,
+    callback, errback) (ключевая пагинация: следующая страница начинается
+    после ключа последней загруженной строки). Новая страница запрашивается,
+    когда до конца списка остается меньше порога, поэтому окно открывается
+    сразу, сколько бы строк ни было в базе.
+    """
+
+    def __init__(self, master, load_page, render=str, key=lambda row: row[0],
+                 page_size=200, prefetch=0.8, on_error=None, **listbox_options):
+        """
+        Инициализирует список
+
+        Args:
+            master: Родительский виджет
+            load_page (callable): load_page(after_key, page_size, callback, errback) -
+                асинхронно загружает страницу и передает список строк в callback
+            render (callable, optional): Преобразует строку в текст элемента списка
+            key (callable, optional): Возвращает ключ пагинации строки (по умолчанию первое поле)
+            page_size (int, optional): Количество строк на странице
+            prefetch (float, optional): Доля прокрутки, после которой запрашивается следующая страница
+            on_error (callable, optional): Вызывается с исключением, если страницу загрузить не удалось
+            **listbox_options: Параметры tk.Listbox
+        """
+        super().__init__(master)
+        self.load_page = load_page
+        self.render = render
+        self.key = key
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.on_error = on_error
+
+        self.rows = []
+        self._generation = 0
+        self._loading = False
+        self._exhausted = True
+        self._placeholder = False
+
+        scrollbar = ttk.Scrollbar(self)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar = scrollbar
+
+        self.listbox = tk.Listbox(self, yscrollcommand=self._on_scroll, **listbox_options)
+        self.listbox.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.listbox.yview)
+
+        # Пока список не показан, его размер неизвестен - проверяем прокрутку при отображении
+        self.listbox.bind('<Map>', lambda event: self._on_scroll(*self.listbox.yview()))
+
+    def reset(self):
+        """Очищает список и начинает загрузку с первой страницы"""
+        self._clear()
+        self._exhausted = False
+        self._request_page()
+
+    def clear(self):
+        """Очищает список без загрузки"""
+        self._clear()
+
+    def set_rows(self, rows, render=None, empty_message=None):
+        """
+        Показывает готовый набор строк без подгрузки (например, результаты поиска)
+
+        Args:
+            rows (list): Строки списка
+            render (callable, optional): Преобразование строк в текст вместо заданного в конструкторе
+            empty_message (str, optional): Текст, показываемый при пустом наборе
+        """
+        self._clear()
+        if rows:
+            self._append(rows, render)
+        elif empty_message:
+            self._show_placeholder(empty_message)
+
+    def show_message(self, text):
+        """Очищает список и показывает в нем служебное сообщение"""
+        self._clear()
+        self._show_placeholder(text)
+
+    def row_at(self, index):
+        """Возвращает строку по индексу элемента или None для служебной строки"""
+        if 0 <= index < len(self.rows):
+            return self.rows[index]
+        return None
+
+    def selected_row(self):
+        """Возвращает выбранную строку или None"""
+        selection = self.listbox.curselection()
+        if not selection:
+            return None
+        return self.row_at(selection[0])
+
+    def selected_rows(self):
+        """Возвращает все выбранные строки (служебные строки пропускаются)"""
+        return [self.rows[index] for index in self.listbox.curselection() if index < len(self.rows)]
+
+    def _clear(self):
+        """Сбрасывает строки; ответы на ранее запрошенные страницы будут проигнорированы"""
+        self._generation += 1
+        self._loading = False
+        self._exhausted = True
+        self._placeholder = False
+        self.rows = []
+        self.listbox.delete(0, tk.END)
+
+    def _show_placeholder(self, text):
+        self.listbox.insert(tk.END, text)
+        self._placeholder = True
+
+    def _remove_placeholder(self):
+        if self._placeholder:
+            self.listbox.delete(tk.END)
+            self._placeholder = False
+
+    def _append(self, rows, render=None):
+        render = render or self.render
+        self._remove_placeholder()
+        self.rows.extend(rows)
+        self.listbox.insert(tk.END, *(render(row) for row in rows))
+
+    def _request_page(self):
+        """Запрашивает следующую страницу, если она еще не запрошена"""
+        if self._loading or self._exhausted:
+            return
+
+        self._loading = True
+        generation = self._generation
+        after_key = self.key(self.rows[-1]) if self.rows else 0
+        self._show_placeholder("Загрузка...")
+
+        self.load_page(
+            after_key,
+            self.page_size,
+            lambda rows: self._on_page_loaded(generation, rows),
+            lambda error: self._on_page_failed(generation, error)
+        )
+
+    def _on_page_loaded(self, generation, rows):
+        # Список успели сбросить, пока страница загружалась
+        if generation != self._generation:
+            return
+
+        self._loading = False
+        self._exhausted = len(rows) < self.page_size
+        if rows:
+            self._append(rows)
+        else:
+            self._remove_placeholder()
+
+        # Страница не заполнила окно - yscrollcommand может не вызваться
+        self._on_scroll(*self.listbox.yview())
+
+    def _on_page_failed(self, generation, error):
+        if generation != self._generation:
+            return
+
+        self._loading = False
+        self._exhausted = True
+        self._remove_placeholder()
+        if self.on_error:
+            self.on_error(error)
+
+    def _on_scroll(self, first, last):
+        """Обновляет полосу прокрутки и подгружает страницу при приближении к концу"""
+        self.scrollbar.set(first, last)
+        if float(last) >= self.prefetch and self.listbox.winfo_ismapped():
+            self._request_page()
@@ -3,12 +3,62 @@ DEFAULT_DB_PATH = "quiz_game.db"
 DEFAULT_AVATAR_DIR = "avatars"
 DEFAULT_ICON_PATH = "assets/icon.png"
 
+# Настройки хранения базы данных
+# Профиль выбирает PRAGMA, которые применяются к каждому новому соединению:
+#   "safe"     - WAL + synchronous=FULL: fsync на каждую фиксацию транзакции
+#   "balanced" - WAL + synchronous=NORMAL: fsync только при checkpoint,
+#                при отключении питания может потеряться последняя транзакция
+#   "fast"     - WAL + synchronous=OFF: без fsync, только для импорта и тестов
+DB_STORAGE_PROFILE = "balanced"
+DB_STORAGE_PROFILES = {
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,  # в КиБ (отрицательное значение), ~8 МБ
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+# Бюджет памяти кэша рубрик, вопросов и ответов (query_cache.QueryCache), в байтах.
+# Счетчики попаданий для подбора значения: db_manager.get_cache_stats()
+QUERY_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Сколько секунд при закрытии окна ждать уже поставленных запросов к базе данных
+# (например, сохранения результатов игры); импорт и экспорт не ждем
+DB_WORKER_STOP_TIMEOUT = 3.0
+
 # Настройки игры
 DEFAULT_QUESTIONS_PER_GAME = 10
 DEFAULT_TIME_PER_QUESTION = 30
 MIN_DIFFICULTY = 1.0
 MAX_DIFFICULTY = 2.0
 
+# Количество вариантов ответа на вопрос (на экране вопроса четыре кнопки)
+MIN_ANSWERS = 2
+MAX_ANSWERS = 4
+
+# Частота перерисовки таймера вопроса (кадров в секунду)
+TIMER_FPS = 30
+
+# Начисление очков: (BASE_POINTS + бонус за скорость до MAX_TIME_BONUS) * сложность
+BASE_POINTS = 100
+MAX_TIME_BONUS = 50
+
 # Настройки интерфейса
 APP_TITLE = "Интеллектуальная викторина"
 APP_WIDTH = 800
@@ -21,6 +71,9 @@ ERROR_COLOR = "#F44336"
 WARNING_COLOR = "#FF9800"
 INFO_COLOR = "#2196F3"
 
+# Количество вопросов, подгружаемых в список панели администратора за один запрос
+ADMIN_QUESTIONS_PAGE_SIZE = 200
+
 # Шрифты
 TITLE_FONT = ("Arial", 24, "bold")
 HEADER_FONT = ("Arial", 18, "bold")